@@ -0,0 +1,73 @@
+"""Cheap-first model cascade with escalation on failure.
+
+`CascadeModel` sends a node's request to a cheaper model first and escalates
+to the strong model only when the cheap output fails schema validation or a
+local check from `checks`. Per-node metrics: `cascade_calls`,
+`cascade_escalations`, and latency series `cheap_latency` / `strong_latency`.
+"""
+
+import time
+from typing import Any, Callable, Dict, List
+
+from langchain_core.exceptions import OutputParserException
+from pydantic import ValidationError
+
+from react_agent.checks import problems
+from react_agent.metrics import METRICS, Metrics
+
+# Failures of the cheap model's output that warrant asking the strong model.
+ESCALATE_ON = (OutputParserException, ValidationError, ValueError)
+
+
+class CascadeModel:
+    """Try `cheap`, and fall back to `strong` when its output is unusable."""
+
+    def __init__(
+        self,
+        cheap: Any,
+        strong: Any,
+        node: str,
+        check: Callable[[Any], List[str]] = problems,
+        metrics: Metrics = METRICS,
+    ) -> None:
+        """Cascade from `cheap` to `strong` for `node`, judging output with `check`."""
+        self.cheap = cheap
+        self.strong = strong
+        self.node = node
+        self.check = check
+        self.metrics = metrics
+
+    def invoke(self, input: Any, config: Any = None) -> Any:
+        """Return the cheap model's output if it passes, else the strong model's."""
+        self.metrics.increment(self.node, "cascade_calls")
+        start = time.perf_counter()
+        try:
+            output = self.cheap.invoke(input, config)
+            passed = not self.check(output)
+        except ESCALATE_ON:
+            passed = False
+        finally:
+            self.metrics.observe(
+                self.node, "cheap_latency", time.perf_counter() - start
+            )
+        if passed:
+            return output
+
+        self.metrics.increment(self.node, "cascade_escalations")
+        start = time.perf_counter()
+        try:
+            return self.strong.invoke(input, config)
+        finally:
+            self.metrics.observe(
+                self.node, "strong_latency", time.perf_counter() - start
+            )
+
+
+def escalation_rates(metrics: Metrics = METRICS) -> Dict[str, float]:
+    """Return the share of cascaded calls that escalated, per node."""
+    rates = {}
+    for node, values in metrics.snapshot().items():
+        calls = values.get("cascade_calls", 0)
+        if calls:
+            rates[node] = values.get("cascade_escalations", 0) / calls
+    return rates
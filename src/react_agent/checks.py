@@ -0,0 +1,79 @@
+"""Local quality checks on structured model output.
+
+These catch outputs that validate against their schema but would break a
+later stage, such as a code organization without an endpoint file, and
+report generated code that does not line up with its organization.
+"""
+
+from typing import Any, Iterable, List, Set, Tuple
+
+from react_agent.regenerate import iter_files
+from react_agent.schemas import (
+    CodeGeneration,
+    CodeOrganization,
+    GeneratedCode,
+    GenerationReport,
+)
+
+
+def endpoint_files(organization: CodeOrganization) -> List[Any]:
+    """Return the endpoint files declared across the organization's folders."""
+    return [
+        folder.endpoint_file for folder in organization.folders if folder.endpoint_file
+    ]
+
+
+def problems(output: Any) -> List[str]:
+    """Return what is wrong with a node's structured output; empty when it passes."""
+    if output is None:
+        return ["The model returned no structured output."]
+    found: List[str] = []
+    if isinstance(output, CodeOrganization):
+        if not output.folders:
+            found.append("The organization has no folders.")
+        endpoints = endpoint_files(output)
+        if not endpoints:
+            found.append("No endpoint file found in the organization.")
+        elif len(endpoints) > 1:
+            found.append(
+                f"The organization has {len(endpoints)} endpoint files instead of one."
+            )
+        # An endpoint file may also appear in its folder's file list
+        found += _duplicates(
+            key for key, _, endpoint in iter_files(output) if not endpoint
+        )
+    elif isinstance(output, GeneratedCode):
+        found += _duplicates(
+            (entry.folder_name, entry.file_name) for entry in output.files
+        )
+    return found
+
+
+def _duplicates(keys: Iterable[Tuple[str, str]]) -> List[str]:
+    seen: Set[Tuple[str, str]] = set()
+    repeated: List[str] = []
+    for key in keys:
+        if key in seen and f"{key[0]}/{key[1]}" not in repeated:
+            repeated.append(f"{key[0]}/{key[1]}")
+        seen.add(key)
+    return [f"Duplicate file {path}." for path in repeated]
+
+
+def coverage(
+    organization: CodeOrganization, generated: List[CodeGeneration]
+) -> GenerationReport:
+    """Compare generated code records with the files of the organization they fill in."""
+    expected = [key for key, _, _ in iter_files(organization)]
+    returned = [(entry.folder_name, entry.file_name) for entry in generated]
+    return GenerationReport(
+        missing_files=[
+            f"{folder}/{name}"
+            for folder, name in expected
+            if (folder, name) not in returned
+        ],
+        extra_files=[
+            f"{folder}/{name}"
+            for folder, name in returned
+            if (folder, name) not in expected
+        ],
+    )
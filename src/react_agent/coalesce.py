@@ -0,0 +1,101 @@
+"""Single-flight coalescing of identical in-flight model calls.
+
+Batch evaluations often send byte-identical prompts at the same moment, for
+example the same topic submitted by several users, or retried jobs. A cache
+only helps once the first call has returned. `CoalescedModel` also covers the
+calls made while it is still running: the first caller of a request (same
+model, schema, messages and call settings) makes the upstream call, and
+callers that arrive before it returns wait for it and share its result or
+exception. It is off unless `coalesce_requests` is set.
+
+The result object is shared between the runs, so treat it as immutable, as
+the nodes already do. Coalescing is per process; runner workers do not share
+calls with each other.
+
+Per-node metrics: `coalesce_leaders` (upstream calls made) and `coalesced`
+(calls that joined one already in flight).
+"""
+
+import hashlib
+import json
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+from langchain_core.messages import BaseMessage
+
+from react_agent.metrics import METRICS, Metrics
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; concurrent callers share it."""
+
+    def __init__(self) -> None:
+        """Start with no calls in flight."""
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, Future[Any]] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Return `fn()` (or the result of the identical call in flight) and whether it was shared."""
+        with self._lock:
+            existing = self._calls.get(key)
+            if existing is None:
+                call: Future[Any] = Future()
+                self._calls[key] = call
+        if existing is not None:
+            return existing.result(), True
+
+        try:
+            call.set_result(fn())
+        except BaseException as e:
+            call.set_exception(e)
+        finally:
+            with self._lock:
+                del self._calls[key]
+        return call.result(), False
+
+    def in_flight(self) -> int:
+        """Return the number of distinct calls currently running."""
+        with self._lock:
+            return len(self._calls)
+
+
+SINGLE_FLIGHT = SingleFlight()
+
+
+def request_key(prefix: str, input: Any) -> str:
+    """Return the coalescing key of a model request: `prefix` plus a digest of the messages."""
+    if isinstance(input, list) and all(isinstance(m, BaseMessage) for m in input):
+        payload = json.dumps(
+            [(m.type, m.content) for m in input], sort_keys=True, default=str
+        )
+    else:
+        payload = repr(input)
+    return f"{prefix}:{hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()}"
+
+
+class CoalescedModel:
+    """Wrap a runnable so identical concurrent `invoke` calls share one upstream call."""
+
+    def __init__(
+        self,
+        runnable: Any,
+        node: str,
+        prefix: str,
+        single_flight: SingleFlight = SINGLE_FLIGHT,
+        metrics: Metrics = METRICS,
+    ) -> None:
+        """Coalesce on `prefix` (model, schema and call settings) plus the request messages."""
+        self.runnable = runnable
+        self.node = node
+        self.prefix = prefix
+        self.single_flight = single_flight
+        self.metrics = metrics
+
+    def invoke(self, input: Any, config: Any = None) -> Any:
+        """Invoke the wrapped runnable, or join the identical call already in flight."""
+        result, shared = self.single_flight.do(
+            request_key(self.prefix, input), lambda: self.runnable.invoke(input, config)
+        )
+        self.metrics.increment(self.node, "coalesced" if shared else "coalesce_leaders")
+        return result
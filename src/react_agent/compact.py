@@ -0,0 +1,114 @@
+"""Compact structured-output schemas derived from the state models.
+
+Every `with_structured_output` call sends the full JSON schema of its model,
+including the long docstrings and `Field(description=...)` strings in
+`schemas`. `compact_model` builds a structurally identical model with the
+same field names and types and only short descriptions, so a response parsed
+with it maps back losslessly to the original model via `expand`.
+
+`schema_tokens` estimates what a schema costs per call. Nodes record the
+difference under the `schema_tokens_saved` metric.
+"""
+
+import json
+import re
+from functools import cache
+from typing import Any, Dict, List, Optional, Tuple, Type, Union, get_args, get_origin
+
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import BaseModel, Field, create_model
+
+MAX_WORDS = 8
+
+_FILLER = {
+    "a",
+    "an",
+    "the",
+    "of",
+    "in",
+    "to",
+    "for",
+    "and",
+    "or",
+    "its",
+    "this",
+    "represents",
+}
+
+# Instructions the model needs even in the compact schema.
+KEEP: Dict[Tuple[str, str], str] = {
+    ("Folder", "endpoint_file"): "The API endpoint file; exactly one folder has it.",
+    ("File", "code"): "Full file code, if requested.",
+}
+
+
+def short_description(
+    text: Optional[str], max_words: int = MAX_WORDS, names: Tuple[str, ...] = ()
+) -> Optional[str]:
+    """Return the first sentence of `text`, cut to `max_words` words.
+
+    Returns None when the sentence only restates `names` (the field and
+    model names), as in "The name of the folder".
+    """
+    if not text:
+        return None
+    first = re.split(r"(?<=[.!?])\s|\n", text.strip(), maxsplit=1)[0]
+    words = [word for word in first.rstrip(".").split() if word.lower() != "represents"]
+    known = {
+        part.lower().rstrip("s")
+        for name in names
+        for part in re.findall(r"[A-Z]?[a-z]+", name)
+    }
+    content = {word.lower().strip("',").rstrip("s") for word in words} - _FILLER
+    if not words or (names and content <= known):
+        return None
+    short = " ".join(words[:max_words])
+    return short[0].upper() + short[1:]
+
+
+def _compact_annotation(annotation: Any) -> Any:
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        return compact_model(annotation)
+    origin = get_origin(annotation)
+    if origin is None:
+        return annotation
+    args = tuple(_compact_annotation(arg) for arg in get_args(annotation))
+    if origin is Union or origin is list:
+        return origin[args]
+    return annotation
+
+
+@cache
+def compact_model(model: Type[BaseModel]) -> Type[BaseModel]:
+    """Return `model` with nested models compacted and descriptions shortened."""
+    fields: Dict[str, Any] = {}
+    for name, info in model.model_fields.items():
+        description = KEEP.get((model.__name__, name)) or short_description(
+            info.description, names=(name, model.__name__)
+        )
+        default: Any = (
+            ... if info.is_required() else info.get_default(call_default_factory=True)
+        )
+        fields[name] = (
+            _compact_annotation(info.annotation),
+            Field(default, description=description),
+        )
+    compact = create_model(model.__name__, __base__=BaseModel, **fields)
+    compact.__doc__ = short_description(model.__doc__)
+    return compact
+
+
+def expand(value: BaseModel, model: Type[BaseModel]) -> BaseModel:
+    """Map an instance of `compact_model(model)` back to `model`."""
+    return model.model_validate(value.model_dump())
+
+
+def schema_tokens(model: Type[BaseModel]) -> int:
+    """Estimate the prompt tokens the tool schema of `model` costs (about 4 chars each)."""
+    return len(json.dumps(convert_to_openai_tool(model))) // 4
+
+
+@cache
+def tokens_saved(model: Type[BaseModel]) -> int:
+    """Return the estimated schema tokens `compact_model` saves per call."""
+    return schema_tokens(model) - schema_tokens(compact_model(model))
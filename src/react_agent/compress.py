@@ -0,0 +1,63 @@
+"""Local, model-free compaction of requirement lists.
+
+Requirements accumulate near-duplicates over feedback rounds. These helpers
+drop entries whose character shingles overlap an earlier entry above a
+threshold and render the survivors as a compact numbered list for prompts.
+"""
+
+import re
+from typing import Iterable, List, Set
+
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+
+
+def normalize(text: str) -> str:
+    """Lowercase `text` and collapse punctuation and whitespace to single spaces."""
+    return _NON_WORD.sub(" ", text.lower()).strip()
+
+
+def shingles(text: str, size: int = 4) -> Set[str]:
+    """Return the set of character `size`-grams of the normalized text."""
+    text = normalize(text)
+    if len(text) <= size:
+        return {text} if text else set()
+    return {text[i : i + size] for i in range(len(text) - size + 1)}
+
+
+def similarity(a: str, b: str) -> float:
+    """Return the Jaccard similarity of the shingle sets of `a` and `b`."""
+    left, right = shingles(a), shingles(b)
+    if not left and not right:
+        return 1.0
+    return len(left & right) / len(left | right)
+
+
+def dedupe(texts: Iterable[str], threshold: float = 0.7) -> List[str]:
+    """Drop near-duplicates, keeping first-seen order and the longer wording.
+
+    Args:
+        texts: Candidate entries, in order.
+        threshold: Similarity at or above which two entries are the same.
+    """
+    kept: List[str] = []
+    kept_shingles: List[Set[str]] = []
+    for text in texts:
+        text = " ".join(text.split())
+        if not text:
+            continue
+        current = shingles(text)
+        for i, other in enumerate(kept_shingles):
+            union = current | other
+            if union and len(current & other) / len(union) >= threshold:
+                if len(text) > len(kept[i]):
+                    kept[i], kept_shingles[i] = text, current
+                break
+        else:
+            kept.append(text)
+            kept_shingles.append(current)
+    return kept
+
+
+def numbered(texts: Iterable[str]) -> str:
+    """Render `texts` as a numbered list, one entry per line."""
+    return "\n".join(f"{i}. {text}" for i, text in enumerate(texts, start=1))
@@ -3,30 +3,227 @@
 from __future__ import annotations
 
 from dataclasses import dataclass, field, fields
-from typing import Annotated, Optional
+from typing import Annotated, Dict, List, Optional
 
 from langchain_core.runnables import RunnableConfig, ensure_config
 
-from react_agent import prompts
-
 
 @dataclass(kw_only=True)
 class Configuration:
     """The configuration for the agent."""
 
-    system_prompt: str = field(
-        default=prompts.SYSTEM_PROMPT,
+    model: Annotated[str, {"__template_metadata__": {"kind": "llm"}}] = field(
+        default="openai/gpt-4o",
         metadata={
-            "description": "The system prompt to use for the agent's interactions. "
-            "This prompt sets the context and behavior for the agent."
+            "description": "The name of the language model to use for the agent's main interactions. "
+            "Should be in the form: provider/model-name. Use stub/<name> for the offline stub model."
         },
     )
 
-    model: Annotated[str, {"__template_metadata__": {"kind": "llm"}}] = field(
-        default="anthropic/claude-3-5-sonnet-20240620",
+    compact_schemas: bool = field(
+        default=False,
         metadata={
-            "description": "The name of the language model to use for the agent's main interactions. "
-            "Should be in the form: provider/model-name."
+            "description": "Send compact output schemas (short descriptions) to the model and map "
+            "responses back to the full state models."
+        },
+    )
+
+    cascade_model: str | None = field(
+        default=None,
+        metadata={
+            "description": "A cheaper model (provider/model-name) each node tries first. The node "
+            "escalates to `model` when the output fails validation or local checks. None disables the cascade."
+        },
+    )
+
+    cascade_nodes: List[str] = field(
+        default_factory=list,
+        metadata={
+            "description": "Nodes that use the cascade. Empty means every node."
+        },
+    )
+
+    requirement_similarity_threshold: float = field(
+        default=0.7,
+        metadata={
+            "description": "Shingle similarity (0-1) at or above which two approved requirements "
+            "are treated as duplicates when building the requirements digest, or as unchanged "
+            "when the edit graph compares old and revised requirements."
+        },
+    )
+
+    digest_max_chars: int = field(
+        default=1500,
+        metadata={
+            "description": "Character budget of each spec digest used by the organization prompts."
+        },
+    )
+
+    parallel_design: bool = field(
+        default=False,
+        metadata={
+            "description": "Draft the front-end and back-end requirements at the same time, then "
+            "align the back-end API with the front end's API design where they disagree."
+        },
+    )
+
+    reuse_index_path: str | None = field(
+        default=None,
+        metadata={
+            "description": "JSON-lines file indexing past runs for design reuse. "
+            "Reuse is disabled when unset."
+        },
+    )
+
+    package_metadata_path: str | None = field(
+        default=None,
+        metadata={
+            "description": "JSON file extending the built-in package table used to resolve "
+            "frameworks to packages. Packages the model resolves are added to it."
+        },
+    )
+
+    reuse_similarity_threshold: float = field(
+        default=0.6,
+        metadata={
+            "description": "Similarity (0-1) of topic and approved requirements at or above which "
+            "a past run's design is offered to the design stages as a draft to revise."
+        },
+    )
+
+    reuse_skip_threshold: float = field(
+        default=0.95,
+        metadata={
+            "description": "Similarity (0-1) at or above which the design stages take the past "
+            "run's artifacts as-is and skip their model calls."
+        },
+    )
+
+    regeneration_min_overlap: int = field(
+        default=2,
+        metadata={
+            "description": "Keywords a file must share with a changed requirement to be regenerated "
+            "by the edit graph."
+        },
+    )
+
+    fix_contract_mismatches: bool = field(
+        default=True,
+        metadata={
+            "description": "Rewrite only the files named by the API contract check when the "
+            "generated front end and back end disagree."
+        },
+    )
+
+    default_node_timeout: float | None = field(
+        default=None,
+        metadata={
+            "description": "Seconds a node waits for its model response before raising TimeoutError. "
+            "None waits forever."
+        },
+    )
+
+    node_timeouts: Dict[str, float] = field(
+        default_factory=dict,
+        metadata={
+            "description": "Per-node overrides of default_node_timeout, keyed by node name."
+        },
+    )
+
+    hedge_percentile: float | None = field(
+        default=None,
+        metadata={
+            "description": "Latency percentile (0-100), learned per node, after which a duplicate "
+            "model request is sent and the first valid response wins. None disables hedging."
+        },
+    )
+
+    hedge_min_samples: int = field(
+        default=20,
+        metadata={
+            "description": "Completed calls a node needs before its latency percentile is used for hedging."
+        },
+    )
+
+    best_of_n: Dict[str, int] = field(
+        default_factory=dict,
+        metadata={
+            "description": "Samples to request in parallel per node name; the first one passing "
+            "validation and the local checks is used. Nodes not listed make a single request."
+        },
+    )
+
+    best_of_n_stagger: float = field(
+        default=0.0,
+        metadata={
+            "description": "Seconds to wait for a valid sample before sending each extra one. "
+            "0 sends all samples at once (lowest latency, highest cost): requests in flight "
+            "cannot be aborted, so all N responses are paid for."
+        },
+    )
+
+    best_of_n_temperature: float = field(
+        default=0.7,
+        metadata={
+            "description": "Sampling temperature of the extra best-of-N samples; the first "
+            "sample uses temperature 0."
+        },
+    )
+
+    model_call_slots: int | None = field(
+        default=None,
+        metadata={
+            "description": "Maximum model requests in flight per process, granted to interactive "
+            "runs before batch runs and fairly across tenants. None disables scheduling."
+        },
+    )
+
+    interactive_reserved_slots: int = field(
+        default=0,
+        metadata={
+            "description": "Model-call slots that only interactive runs may use, so a new "
+            "interactive request rarely waits for running batch calls."
+        },
+    )
+
+    priority: str = field(
+        default="interactive",
+        metadata={
+            "description": "Scheduling class of this run: 'interactive' for users waiting on "
+            "the result, 'batch' for bulk evaluation jobs."
+        },
+    )
+
+    tenant: str = field(
+        default="",
+        metadata={
+            "description": "Who the run belongs to; queued model calls of one class are "
+            "shared fairly between tenants."
+        },
+    )
+
+    coalesce_requests: bool = field(
+        default=False,
+        metadata={
+            "description": "Share one upstream call between identical model requests "
+            "(same model, schema, messages, timeout, hedging and best-of-N settings) "
+            "that are in flight at the same time."
+        },
+    )
+
+    memoize_stages: bool = field(
+        default=False,
+        metadata={
+            "description": "Reuse the result of a stage (requirements, design, codegen) when "
+            "an earlier run had the same stage inputs and settings."
+        },
+    )
+
+    stage_cache_path: str | None = field(
+        default=None,
+        metadata={
+            "description": "Directory where stage results are also stored, so they are "
+            "reused across processes and restarts. Unset keeps them in memory only."
         },
     )
 
@@ -39,7 +236,7 @@ class Configuration:
 
     @classmethod
     def from_runnable_config(
-        cls, config: Optional[RunnableConfig] = None
+        cls, config: RunnableConfig | None = None
     ) -> Configuration:
         """Create a Configuration instance from a RunnableConfig object."""
         config = ensure_config(config)
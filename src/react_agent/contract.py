@@ -0,0 +1,684 @@
+"""Local consistency check of the API contract between the generated sides.
+
+The back end is read with `ast`: FastAPI route decorators
+(``@app.post("/tasks")``, ``@router.get(...)``, ``@app.api_route(...)``),
+`APIRouter` and `include_router` prefixes, and the fields of the Pydantic
+request models. The front end is scanned for ``fetch`` calls and ``axios``
+calls (``axios.post``, or instances made with ``axios.create``). URL
+constants, template literals and concatenations are resolved where they are
+plain strings; other expressions become path parameters.
+
+`check` matches every front-end call to a back-end route by method and path
+and compares the payload keys. Each `ContractMismatch` names the one file
+that should change. Calls are fixed to follow the back-end routes, and the
+back-end endpoint file gains routes that are missing entirely.
+"""
+
+import ast
+import os
+import re
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Tuple, Union
+
+from react_agent.compress import similarity
+from react_agent.regenerate import iter_files
+from react_agent.schemas import CodeOrganization, ContractMismatch
+
+HTTP_METHODS = ("get", "post", "put", "patch", "delete")
+PARAM = "{}"
+SIMILAR_PATH = 0.6
+
+_PATH_PARAM = re.compile(r"\{[^}]*\}")
+
+
+@dataclass(frozen=True)
+class Route:
+    """A back-end route. `body_keys` is None when the payload shape is unknown."""
+
+    method: str
+    path: str
+    file: str
+    function: str
+    body_keys: Optional[FrozenSet[str]] = None
+    required_keys: FrozenSet[str] = frozenset()
+
+
+@dataclass(frozen=True)
+class Call:
+    """A front-end API call. `body_keys` is None when the payload shape is unknown."""
+
+    method: str
+    path: str
+    file: str
+    line: int
+    body_keys: Optional[FrozenSet[str]] = None
+
+
+@dataclass
+class _Model:
+    fields: Dict[str, bool] = field(default_factory=dict)  # name -> required
+    bases: List[str] = field(default_factory=list)
+
+
+def segments(path: str) -> List[str]:
+    """Split a path into segments, with every path parameter as ``{}``."""
+    return [
+        PARAM if _PATH_PARAM.fullmatch(s) else s
+        for s in path.strip("/").split("/")
+        if s
+    ]
+
+
+def paths_match(a: str, b: str) -> bool:
+    """Return whether two paths address the same route (parameters match any segment)."""
+    left, right = segments(a), segments(b)
+    return len(left) == len(right) and all(
+        x == y or PARAM in (x, y) for x, y in zip(left, right)
+    )
+
+
+def path_similarity(a: str, b: str) -> float:
+    """Return how alike two paths are, as shingle similarity of their segments."""
+    return similarity(" ".join(segments(a)), " ".join(segments(b)))
+
+
+_DESCRIBED_ENDPOINT = re.compile(
+    r"\b(GET|POST|PUT|PATCH|DELETE)\b[\s`'\"*:]*(/[\w\-./{}:<>]*)", re.IGNORECASE
+)
+
+
+def described_endpoints(text: str) -> List[Tuple[str, str]]:
+    """Return the ``METHOD /path`` pairs named in a prose API description, in order."""
+    found: List[Tuple[str, str]] = []
+    for method, path in _DESCRIBED_ENDPOINT.findall(text or ""):
+        path = re.sub(r"[<:](\w+)>?", r"{\1}", path.rstrip(".:,)`'\""))
+        endpoint = (method.lower(), path)
+        if endpoint not in found:
+            found.append(endpoint)
+    return found
+
+
+def missing_endpoints(expected: str, described: str) -> List[Tuple[str, str]]:
+    """Return the endpoints named in `expected` that `described` does not provide."""
+    provided = described_endpoints(described)
+    return [
+        (method, path)
+        for method, path in described_endpoints(expected)
+        if not any(m == method and paths_match(p, path) for m, p in provided)
+    ]
+
+
+# Braces not part of a path parameter (``/{id}``) or a template (``${id}``)
+_DESCRIBED_FIELDS = re.compile(r"(?<![/$\w]){([^{}]*)}")
+
+
+def described_fields(text: str) -> List[str]:
+    """Return the field names listed in braces (``{id, title: str}``) in a prose API description."""
+    found: List[str] = []
+    for body in _DESCRIBED_FIELDS.findall(text or ""):
+        for entry in body.split(","):
+            match = re.match(r"""\s*['"]?([A-Za-z_]\w*)""", entry)
+            if match and match.group(1) not in found:
+                found.append(match.group(1))
+    return found
+
+
+def missing_fields(expected: str, described: str) -> List[str]:
+    """Return the fields named in `expected` that `described` never mentions."""
+    return [
+        name
+        for name in described_fields(expected)
+        if not re.search(rf"\b{name}\b", described or "")
+    ]
+
+
+# Back end
+
+
+def _name(node: ast.AST) -> Optional[str]:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _keyword(call: ast.Call, name: str) -> Optional[ast.AST]:
+    return next((kw.value for kw in call.keywords if kw.arg == name), None)
+
+
+def _string(node: Optional[ast.AST]) -> Optional[str]:
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return node.value
+    return None
+
+
+def _required(value: Optional[ast.AST]) -> bool:
+    if value is None:
+        return True
+    if isinstance(value, ast.Call) and _name(value.func) == "Field":
+        if value.args:
+            return (
+                isinstance(value.args[0], ast.Constant)
+                and value.args[0].value is Ellipsis
+            )
+        return (
+            _keyword(value, "default") is None
+            and _keyword(value, "default_factory") is None
+        )
+    return False
+
+
+def _models(trees: Dict[str, ast.Module]) -> Dict[str, Dict[str, bool]]:
+    found: Dict[str, _Model] = {}
+    for tree in trees.values():
+        for node in ast.walk(tree):
+            if isinstance(node, ast.ClassDef):
+                model = _Model(bases=[b for b in map(_name, node.bases) if b])
+                for item in node.body:
+                    if isinstance(item, ast.AnnAssign) and isinstance(
+                        item.target, ast.Name
+                    ):
+                        model.fields[item.target.id] = _required(item.value)
+                found[node.name] = model
+
+    resolved: Dict[str, Dict[str, bool]] = {}
+
+    def fields(name: str, seen: Tuple[str, ...] = ()) -> Optional[Dict[str, bool]]:
+        if name == "BaseModel":
+            return {}
+        if name in resolved:
+            return resolved[name]
+        model = found.get(name)
+        if model is None or not model.bases or name in seen:
+            return None
+        merged: Dict[str, bool] = {}
+        for base in model.bases:
+            inherited = fields(base, seen + (name,))
+            if inherited is None:
+                return None
+            merged.update(inherited)
+        merged.update(model.fields)
+        resolved[name] = merged
+        return merged
+
+    return {name: result for name in found if (result := fields(name)) is not None}
+
+
+def _dotted(node: ast.AST) -> Optional[str]:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        owner = _dotted(node.value)
+        return f"{owner}.{node.attr}" if owner else None
+    return None
+
+
+def _imports(tree: ast.Module, path: str) -> Dict[str, str]:
+    """Return the dotted name each imported name in the file at `path` stands for."""
+    package = path.split("/")[:-1]
+    names: Dict[str, str] = {}
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            for alias in node.names:
+                root = alias.name.split(".")[0]
+                names[alias.asname or root] = alias.name if alias.asname else root
+        elif isinstance(node, ast.ImportFrom):
+            base = node.module or ""
+            if node.level:
+                parts = package[: len(package) - node.level + 1]
+                base = ".".join(parts + ([node.module] if node.module else []))
+            for alias in node.names:
+                names[alias.asname or alias.name] = (
+                    f"{base}.{alias.name}" if base else alias.name
+                )
+    return names
+
+
+def _module_files(dotted: str, paths: List[str]) -> List[str]:
+    """Return the files that module `dotted` can name, matching trailing path segments."""
+    found = []
+    for path in paths:
+        module = path[: -len(".py")].replace("/", ".")
+        if module.endswith(".__init__") or module == "__init__":
+            module = module[: -len("__init__")].rstrip(".")
+        if module == dotted or module.endswith("." + dotted):
+            found.append(path)
+    return found
+
+
+def _prefixes(trees: Dict[str, ast.Module]) -> Dict[Tuple[str, str], str]:
+    """Return the path prefix of each router, keyed by (file path, variable)."""
+    routers: Dict[Tuple[str, str], str] = {}
+    references: List[Tuple[str, str, str]] = []  # (including file, reference, prefix)
+    for path, tree in trees.items():
+        for node in ast.walk(tree):
+            if (
+                isinstance(node, ast.Assign)
+                and isinstance(node.value, ast.Call)
+                and _name(node.value.func) == "APIRouter"
+            ):
+                prefix = _string(_keyword(node.value, "prefix")) or ""
+                for target in node.targets:
+                    if isinstance(target, ast.Name):
+                        routers[(path, target.id)] = prefix
+            elif (
+                isinstance(node, ast.Call)
+                and _name(node.func) == "include_router"
+                and node.args
+            ):
+                reference = _dotted(node.args[0])
+                if reference is not None:
+                    references.append(
+                        (path, reference, _string(_keyword(node, "prefix")) or "")
+                    )
+
+    # Resolve `tasks.router` through the including file's imports, so that
+    # routers/tasks.py and models/tasks.py are told apart by module path
+    paths = list(trees)
+    included: Dict[Tuple[str, str], str] = {}
+    for path, reference, prefix in references:
+        imports = _imports(trees[path], path)
+        first, _, rest = reference.partition(".")
+        dotted = imports.get(first, first) + (f".{rest}" if rest else "")
+        if "." not in dotted:
+            included[(path, dotted)] = prefix
+            continue
+        module, variable = dotted.rsplit(".", 1)
+        candidates = [
+            file for file in _module_files(module, paths) if (file, variable) in routers
+        ]
+        if len(candidates) > 1:
+            # Prefer the module nearest to the file that includes it
+            common = [len(os.path.commonprefix([file, path])) for file in candidates]
+            candidates = [candidates[common.index(max(common))]]
+        if candidates:
+            included[(candidates[0], variable)] = prefix
+    return {key: included.get(key, "") + prefix for key, prefix in routers.items()}
+
+
+def _body(
+    function: Union[ast.FunctionDef, ast.AsyncFunctionDef],
+    path: str,
+    models: Dict[str, Dict[str, bool]],
+) -> Tuple[Optional[FrozenSet[str]], FrozenSet[str]]:
+    path_params = {p.strip("{}").split(":")[0] for p in _PATH_PARAM.findall(path)}
+    arguments = function.args.args + function.args.kwonlyargs
+    bodies = [
+        (arg.arg, models[name])
+        for arg in arguments
+        if arg.annotation is not None
+        and (name := _name(arg.annotation)) is not None
+        and name in models
+    ]
+    if len(bodies) == 1:
+        keys = bodies[0][1]
+        return frozenset(keys), frozenset(k for k, required in keys.items() if required)
+    if len(bodies) > 1:
+        names = frozenset(name for name, _ in bodies)
+        return names, names
+    others = [
+        arg
+        for arg in arguments
+        if arg.arg not in path_params and arg.arg not in ("self", "request")
+    ]
+    return (frozenset(), frozenset()) if not others else (None, frozenset())
+
+
+def backend_routes(files: Dict[str, str]) -> Tuple[List[Route], List[str]]:
+    """Return the routes declared in the back-end files (path -> code) and parse errors."""
+    trees: Dict[str, ast.Module] = {}
+    errors: List[str] = []
+    for path, code in files.items():
+        if not path.endswith(".py") or not code:
+            continue
+        try:
+            tree = ast.parse(code)
+        except SyntaxError as e:
+            errors.append(f"{path}: cannot parse ({e.msg}, line {e.lineno})")
+            continue
+        trees[path] = tree
+
+    models = _models(trees)
+    prefixes = _prefixes(trees)
+    routes: List[Route] = []
+    for file, tree in trees.items():
+        for node in ast.walk(tree):
+            if not isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                continue
+            for decorator in node.decorator_list:
+                if not (
+                    isinstance(decorator, ast.Call)
+                    and isinstance(decorator.func, ast.Attribute)
+                ):
+                    continue
+                verb = decorator.func.attr
+                owner = _name(decorator.func.value) or ""
+                route = (
+                    _string(decorator.args[0])
+                    if decorator.args
+                    else _string(_keyword(decorator, "path"))
+                )
+                if route is None:
+                    continue
+                if verb in HTTP_METHODS:
+                    methods = [verb]
+                elif verb == "api_route":
+                    listed = _keyword(decorator, "methods")
+                    methods = [
+                        m.lower()
+                        for m in (_string(e) for e in getattr(listed, "elts", []))
+                        if m
+                    ] or ["get"]
+                else:
+                    continue
+                full_path = prefixes.get((file, owner), "") + route
+                body_keys, required_keys = _body(node, full_path, models)
+                routes += [
+                    Route(method, full_path, file, node.name, body_keys, required_keys)
+                    for method in methods
+                ]
+    return routes, errors
+
+
+# Front end
+
+_JS_STRING = r"'(?:[^'\\\n]|\\.)*'|\"(?:[^\"\\\n]|\\.)*\"|`(?:[^`\\]|\\.)*`"
+_CONSTANT = re.compile(
+    rf"\b(?:const|let|var)\s+([\w$]+)\s*=\s*(?:[^;\n]*?\|\|\s*)?({_JS_STRING})"
+)
+_AXIOS_INSTANCE = re.compile(
+    r"\b(?:const|let|var)\s+([\w$]+)\s*=\s*axios\s*\.\s*create\s*\("
+)
+_CLOSING = {"(": ")", "[": "]", "{": "}"}
+
+
+def _enclosed(code: str, start: int) -> Tuple[str, int]:
+    """Return the text inside the bracket at `start` and the index after its closing bracket."""
+    depth = 0
+    i = start
+    while i < len(code):
+        char = code[i]
+        if char in "'\"`":
+            i += 1
+            while i < len(code) and code[i] != char:
+                i += 2 if code[i] == "\\" else 1
+        elif char in _CLOSING:
+            depth += 1
+        elif char in _CLOSING.values():
+            depth -= 1
+            if depth == 0:
+                return code[start + 1 : i], i + 1
+        i += 1
+    return code[start + 1 :], len(code)
+
+
+def _split(text: str, separator: str = ",") -> List[str]:
+    """Split `text` at top-level separators, ignoring those inside brackets and strings."""
+    parts, depth, current, i = [], 0, [], 0
+    while i < len(text):
+        char = text[i]
+        if char in "'\"`":
+            end = i + 1
+            while end < len(text) and text[end] != char:
+                end += 2 if text[end] == "\\" else 1
+            current.append(text[i : end + 1])
+            i = end + 1
+            continue
+        if char in _CLOSING:
+            depth += 1
+        elif char in _CLOSING.values():
+            depth -= 1
+        if char == separator and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+        else:
+            current.append(char)
+        i += 1
+    if "".join(current).strip():
+        parts.append("".join(current).strip())
+    return parts
+
+
+def _literal(expr: str) -> Optional[str]:
+    expr = expr.strip()
+    if len(expr) >= 2 and expr[0] == expr[-1] and expr[0] in "'\"`":
+        return expr[1:-1]
+    return None
+
+
+def _resolve(expr: str, constants: Dict[str, str]) -> Optional[str]:
+    """Evaluate a URL expression as far as it is made of strings and constants."""
+    expr = expr.strip()
+    if expr.startswith("`") and expr.endswith("`"):
+        return re.sub(
+            r"\$\{\s*([^}]*?)\s*\}",
+            lambda m: constants.get(m.group(1), PARAM),
+            expr[1:-1],
+        )
+    parts = _split(expr, "+")
+    if len(parts) > 1:
+        resolved = [_resolve(part, constants) for part in parts]
+        return "".join(part if part is not None else PARAM for part in resolved)
+    literal = _literal(expr)
+    if literal is not None:
+        return literal
+    return constants.get(expr)
+
+
+def _path(url: Optional[str]) -> Optional[str]:
+    if url is None:
+        return None
+    url = re.sub(r"^https?://[^/]*", "", url).split("?")[0].split("#")[0]
+    url = re.sub(r"^\{\}", "", url)
+    if "/" not in url:
+        return None
+    return "/" + "/".join(s for s in url.split("/") if s)
+
+
+def _object_keys(expr: Optional[str]) -> Optional[FrozenSet[str]]:
+    if expr is None:
+        return None
+    expr = expr.strip()
+    if not (expr.startswith("{") and expr.endswith("}")):
+        return None
+    keys = set()
+    for entry in _split(expr[1:-1]):
+        if entry.startswith("..."):
+            return None
+        match = re.match(r"""^['"]?([\w$]+)['"]?\s*(?::|\(|$)""", entry)
+        if match is None:
+            return None
+        keys.add(match.group(1))
+    return frozenset(keys)
+
+
+def _option(options: str, name: str) -> Optional[str]:
+    """Return the expression of property `name` in an object literal."""
+    body = options.strip()
+    if not (body.startswith("{") and body.endswith("}")):
+        return None
+    for entry in _split(body[1:-1]):
+        key, _, value = entry.partition(":")
+        if key.strip().strip("'\"") == name and value:
+            return value.strip()
+    return None
+
+
+def frontend_calls(path: str, code: str) -> List[Call]:
+    """Return the ``fetch`` and ``axios`` calls in one front-end file."""
+    constants: Dict[str, str] = {}
+    for name, value in _CONSTANT.findall(code):
+        resolved = _resolve(value, constants)
+        if resolved is not None:
+            constants[name] = resolved
+    bases: Dict[str, str] = {"axios": ""}
+    for match in _AXIOS_INSTANCE.finditer(code):
+        inner, _ = _enclosed(code, match.end() - 1)
+        base = _option(inner.strip(), "baseURL")
+        bases[match.group(1)] = (_resolve(base, constants) if base else None) or ""
+
+    calls: List[Call] = []
+    pattern = re.compile(
+        r"\bfetch\s*\(|\b("
+        + "|".join(map(re.escape, bases))
+        + r")\s*\.\s*("
+        + "|".join(HTTP_METHODS)
+        + r")\s*\("
+    )
+    for match in pattern.finditer(code):
+        inner, _ = _enclosed(code, match.end() - 1)
+        args = _split(inner)
+        if not args:
+            continue
+        line = code.count("\n", 0, match.start()) + 1
+        if match.group(1) is None:
+            options = args[1] if len(args) > 1 else "{}"
+            method = _literal(_option(options, "method") or "'GET'") or "GET"
+            body = _option(options, "body")
+            if body and body.startswith("JSON.stringify"):
+                body = _enclosed(body, body.index("("))[0]
+            url = _resolve(args[0], constants)
+        else:
+            method = match.group(2)
+            body = (
+                args[1]
+                if method in ("post", "put", "patch") and len(args) > 1
+                else None
+            )
+            url = _resolve(args[0], constants)
+            if url is not None and not re.match(r"^https?://", url):
+                url = bases[match.group(1)] + url
+        request_path = _path(url)
+        if request_path is None:
+            continue
+        calls.append(
+            Call(
+                method.lower(),
+                request_path,
+                path,
+                line,
+                _object_keys(body) if body else frozenset(),
+            )
+        )
+    return calls
+
+
+# Comparison
+
+
+def _code_files(organization: CodeOrganization) -> Dict[str, str]:
+    return {
+        f"{folder}/{name}": file.code or ""
+        for (folder, name), file, _ in iter_files(organization)
+    }
+
+
+def _endpoint_path(organization: CodeOrganization) -> Optional[str]:
+    return next(
+        (
+            f"{folder}/{name}"
+            for (folder, name), _, is_endpoint in iter_files(organization)
+            if is_endpoint
+        ),
+        None,
+    )
+
+
+def check(
+    front_end: CodeOrganization, back_end: CodeOrganization
+) -> List[ContractMismatch]:
+    """Compare the front-end calls with the back-end routes and report every mismatch."""
+    routes, errors = backend_routes(_code_files(back_end))
+    mismatches = [
+        ContractMismatch(
+            kind="unparsable",
+            method="",
+            path="",
+            file=error.split(":")[0],
+            detail=error,
+        )
+        for error in errors
+    ]
+    back_end_file = _endpoint_path(back_end) or (routes[0].file if routes else "")
+    calls = [
+        call
+        for path, code in _code_files(front_end).items()
+        if code and not path.endswith((".css", ".html", ".json"))
+        for call in frontend_calls(path, code)
+    ]
+
+    for call in calls:
+        where = f"{call.file}:{call.line}"
+        label = f"{call.method.upper()} {call.path}"
+        matched = [r for r in routes if paths_match(r.path, call.path)]
+        route = next((r for r in matched if r.method == call.method), None)
+        if route is None and matched:
+            served = ", ".join(sorted({r.method.upper() for r in matched}))
+            mismatches.append(
+                ContractMismatch(
+                    kind="method",
+                    method=call.method,
+                    path=call.path,
+                    file=call.file,
+                    detail=f"{label} at {where}: the back end serves {call.path} only with {served} "
+                    f"({matched[0].file}).",
+                )
+            )
+            continue
+        if route is None:
+            similar = sorted(
+                (
+                    r
+                    for r in routes
+                    if r.method == call.method
+                    and path_similarity(r.path, call.path) >= SIMILAR_PATH
+                ),
+                key=lambda r: -path_similarity(r.path, call.path),
+            )
+            if similar:
+                mismatches.append(
+                    ContractMismatch(
+                        kind="path",
+                        method=call.method,
+                        path=call.path,
+                        file=call.file,
+                        detail=f"{label} at {where}: no such route; the back end has "
+                        f"{call.method.upper()} {similar[0].path} ({similar[0].file}, {similar[0].function}).",
+                    )
+                )
+            else:
+                mismatches.append(
+                    ContractMismatch(
+                        kind="missing_route",
+                        method=call.method,
+                        path=call.path,
+                        file=back_end_file,
+                        detail=f"{label} is called at {where} but no back-end route serves it.",
+                    )
+                )
+            continue
+        if call.body_keys is None or route.body_keys is None:
+            continue
+        unexpected = sorted(call.body_keys - route.body_keys)
+        missing = sorted(route.required_keys - call.body_keys)
+        if unexpected or missing:
+            problems = []
+            if unexpected:
+                problems.append(
+                    f"sends {', '.join(unexpected)} which {route.function} does not accept"
+                )
+            if missing:
+                problems.append(f"omits required {', '.join(missing)}")
+            expected = ", ".join(sorted(route.body_keys)) or "no body"
+            mismatches.append(
+                ContractMismatch(
+                    kind="payload",
+                    method=call.method,
+                    path=call.path,
+                    file=call.file,
+                    detail=f"{label} at {where} {' and '.join(problems)} "
+                    f"({route.file} expects {expected}).",
+                )
+            )
+    return mismatches
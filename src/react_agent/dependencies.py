@@ -0,0 +1,416 @@
+"""Deterministic project setup from the front-end and back-end framework lists.
+
+`required_software` used to ask the model to turn the code organizations
+into setup instructions. Almost all of that is mechanical. Each
+`RequiredFramework` is looked up in a package-metadata table. Failing that,
+the package is read from its `installation_instructions` (``npm install x``,
+``pip install x``). `project_setup` and `dependency_files` then build
+`ProjectSetup`, ``package.json`` and ``requirements.txt`` locally.
+
+Only frameworks that neither resolves are sent to the model. Its answers can
+be written back to a JSON table (`save_packages`) so later runs resolve them
+locally too.
+"""
+
+import json
+import os
+import re
+from dataclasses import asdict, dataclass
+from functools import cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from react_agent.regenerate import iter_files
+from react_agent.schemas import (
+    CodeOrganization,
+    ProjectSetup,
+    RequiredFramework,
+    ResolvedPackage,
+)
+
+NPM = "npm"
+PYPI = "pypi"
+
+
+@dataclass(frozen=True)
+class Package:
+    """An installable package. An empty `name` marks a framework that needs no install."""
+
+    ecosystem: str
+    name: str
+    version: str = ""
+    dev: bool = False
+
+
+def _npm(name: str, version: str, dev: bool = False) -> Package:
+    return Package(NPM, name, version, dev)
+
+
+def _pypi(name: str, version: str = "") -> Package:
+    return Package(PYPI, name, version)
+
+
+BUILT_IN = Package("", "")
+
+# Always installed: the app skeleton the generation prompts target.
+FRONT_END_BASE = [
+    _npm("react", "^18.3.1"),
+    _npm("react-dom", "^18.3.1"),
+    _npm("vite", "^5.4.0", dev=True),
+    _npm("@vitejs/plugin-react", "^4.3.1", dev=True),
+]
+BACK_END_BASE = [_pypi("fastapi", ">=0.110"), _pypi("uvicorn[standard]", ">=0.29")]
+
+# Framework names as the model tends to spell them, keyed by `key()`.
+PACKAGES: Dict[str, Package] = {
+    # Front end
+    "react": FRONT_END_BASE[0],
+    "reactdom": FRONT_END_BASE[1],
+    "vite": FRONT_END_BASE[2],
+    "reactrouter": _npm("react-router-dom", "^6.26.0"),
+    "reactrouterdom": _npm("react-router-dom", "^6.26.0"),
+    "axios": _npm("axios", "^1.7.0"),
+    "redux": _npm("redux", "^5.0.1"),
+    "reactredux": _npm("react-redux", "^9.1.0"),
+    "reduxtoolkit": _npm("@reduxjs/toolkit", "^2.2.0"),
+    "materialui": _npm("@mui/material", "^5.16.0"),
+    "mui": _npm("@mui/material", "^5.16.0"),
+    "tailwind": _npm("tailwindcss", "^3.4.0", dev=True),
+    "tailwindcss": _npm("tailwindcss", "^3.4.0", dev=True),
+    "bootstrap": _npm("bootstrap", "^5.3.0"),
+    "reactbootstrap": _npm("react-bootstrap", "^2.10.0"),
+    "styledcomponents": _npm("styled-components", "^6.1.0"),
+    "formik": _npm("formik", "^2.4.6"),
+    "yup": _npm("yup", "^1.4.0"),
+    "reacthookform": _npm("react-hook-form", "^7.52.0"),
+    "reactquery": _npm("@tanstack/react-query", "^5.51.0"),
+    "tanstackquery": _npm("@tanstack/react-query", "^5.51.0"),
+    "zustand": _npm("zustand", "^4.5.0"),
+    "datefns": _npm("date-fns", "^3.6.0"),
+    "dayjs": _npm("dayjs", "^1.11.0"),
+    "momentjs": _npm("moment", "^2.30.0"),
+    "moment": _npm("moment", "^2.30.0"),
+    "chartjs": _npm("chart.js", "^4.4.0"),
+    "reactchartjs2": _npm("react-chartjs-2", "^5.2.0"),
+    "recharts": _npm("recharts", "^2.12.0"),
+    "socketioclient": _npm("socket.io-client", "^4.7.0"),
+    "uuid": _npm("uuid", "^10.0.0"),
+    "lodash": _npm("lodash", "^4.17.21"),
+    "typescript": _npm("typescript", "^5.5.0", dev=True),
+    "jest": _npm("jest", "^29.7.0", dev=True),
+    "reacttestinglibrary": _npm("@testing-library/react", "^16.0.0", dev=True),
+    "testinglibrary": _npm("@testing-library/react", "^16.0.0", dev=True),
+    "html": BUILT_IN,
+    "html5": BUILT_IN,
+    "css": BUILT_IN,
+    "css3": BUILT_IN,
+    "javascript": BUILT_IN,
+    "es6": BUILT_IN,
+    "jsx": BUILT_IN,
+    "fetch": BUILT_IN,
+    "fetchapi": BUILT_IN,
+    "localstorage": BUILT_IN,
+    "reacthooks": BUILT_IN,
+    "hooks": BUILT_IN,
+    "contextapi": BUILT_IN,
+    "reactcontext": BUILT_IN,
+    "reactcontextapi": BUILT_IN,
+    "npm": BUILT_IN,
+    "nodejs": BUILT_IN,
+    "node": BUILT_IN,
+    # Back end
+    "fastapi": BACK_END_BASE[0],
+    "uvicorn": BACK_END_BASE[1],
+    "pydantic": _pypi("pydantic", ">=2.7"),
+    "sqlalchemy": _pypi("SQLAlchemy", ">=2.0"),
+    "sqlmodel": _pypi("sqlmodel", ">=0.0.21"),
+    "alembic": _pypi("alembic", ">=1.13"),
+    "databases": _pypi("databases", ">=0.9"),
+    "pymongo": _pypi("pymongo", ">=4.8"),
+    "motor": _pypi("motor", ">=3.5"),
+    "redis": _pypi("redis", ">=5.0"),
+    "celery": _pypi("celery", ">=5.4"),
+    "pyjwt": _pypi("PyJWT", ">=2.8"),
+    "jwt": _pypi("PyJWT", ">=2.8"),
+    "pythonjose": _pypi("python-jose[cryptography]", ">=3.3"),
+    "passlib": _pypi("passlib[bcrypt]", ">=1.7"),
+    "bcrypt": _pypi("bcrypt", ">=4.1"),
+    "pythonmultipart": _pypi("python-multipart", ">=0.0.9"),
+    "pythondotenv": _pypi("python-dotenv", ">=1.0"),
+    "dotenv": _pypi("python-dotenv", ">=1.0"),
+    "httpx": _pypi("httpx", ">=0.27"),
+    "requests": _pypi("requests", ">=2.32"),
+    "jinja2": _pypi("Jinja2", ">=3.1"),
+    "websockets": _pypi("websockets", ">=12.0"),
+    "emailvalidator": _pypi("email-validator", ">=2.2"),
+    "aiofiles": _pypi("aiofiles", ">=24.1"),
+    "pandas": _pypi("pandas", ">=2.2"),
+    "numpy": _pypi("numpy", ">=1.26"),
+    "pytest": _pypi("pytest", ">=8.2"),
+    "starlette": BUILT_IN,
+    "cors": BUILT_IN,
+    "corsmiddleware": BUILT_IN,
+    "python": BUILT_IN,
+    "python3": BUILT_IN,
+    "asyncio": BUILT_IN,
+    "typing": BUILT_IN,
+    "uuid4": BUILT_IN,
+    "datetime": BUILT_IN,
+    "json": BUILT_IN,
+    "logging": BUILT_IN,
+    "rest": BUILT_IN,
+    "restapi": BUILT_IN,
+    "restfulapi": BUILT_IN,
+    "inmemorystorage": BUILT_IN,
+    "pip": BUILT_IN,
+    "poetry": BUILT_IN,
+}
+
+_VALID_NAME = {
+    NPM: re.compile(r"^(@[a-z0-9][\w.-]*/)?[a-z0-9][\w.-]*$"),
+    PYPI: re.compile(r"^[A-Za-z0-9][\w.-]*(\[[\w,.-]+\])?$"),
+}
+
+_INSTALL_COMMAND = {
+    NPM: re.compile(
+        r"\b(?:npm\s+(?:install|i|add)|yarn\s+add|pnpm\s+add)\s+((?:-{1,2}[\w-]+\s+)*)([^\s`'\"]+)"
+    ),
+    PYPI: re.compile(
+        r"\b(?:pip3?\s+install|poetry\s+add)\s+((?:-{1,2}[\w-]+\s+)*)([^\s`'\"]+)"
+    ),
+}
+# Flags whose argument is a file, a path or a global install rather than a project package
+_NO_PACKAGE_FLAGS = re.compile(
+    r"(?:^|\s)(?:-r|--requirement|-e|--editable|-g|--global)\s"
+)
+# Installers upgrading themselves ("pip install --upgrade pip")
+_INSTALLERS = {"pip", "npm", "yarn", "pnpm", "poetry", "setuptools", "wheel"}
+
+
+def key(name: str) -> str:
+    """Return the lookup key of a framework name ("React Router" -> "reactrouter")."""
+    return re.sub(r"[^a-z0-9]", "", name.lower())
+
+
+def lookup(table: Dict[str, Package], name: str) -> Optional[Package]:
+    """Find a framework in `table`, also without a ".js" suffix ("React.js" -> "react")."""
+    name = key(name)
+    package = table.get(name)
+    if package is None and name.endswith("js"):
+        package = table.get(name[: -len("js")])
+    return package
+
+
+def valid_name(ecosystem: str, name: str) -> bool:
+    """Return whether `name` looks like an installable package of `ecosystem`."""
+    return bool(_VALID_NAME[ecosystem].match(name))
+
+
+@cache
+def load_packages(path: Optional[str] = None) -> Dict[str, Package]:
+    """Return the built-in table extended with the JSON table at `path`, if any."""
+    table = dict(PACKAGES)
+    if path and os.path.exists(path):
+        with open(path) as f:
+            table.update(
+                {name: Package(**entry) for name, entry in json.load(f).items()}
+            )
+    return table
+
+
+def save_packages(path: str, packages: Dict[str, Package]) -> None:
+    """Add `packages` to the JSON table at `path`."""
+    table: Dict[str, Dict[str, Any]] = {}
+    if os.path.exists(path):
+        with open(path) as f:
+            table = json.load(f)
+    table.update({name: asdict(package) for name, package in packages.items()})
+    with open(path, "w") as f:
+        json.dump(table, f, indent=2, sort_keys=True)
+    load_packages.cache_clear()
+
+
+def from_instructions(instructions: Optional[str], ecosystem: str) -> Optional[Package]:
+    """Read the package from the first install command in `instructions` that names one."""
+    for match in _INSTALL_COMMAND[ecosystem].finditer(instructions or ""):
+        flags, spec = match.groups()
+        if _NO_PACKAGE_FLAGS.search(flags):
+            continue
+        dev = ecosystem == NPM and bool(re.search(r"--save-dev|-D\b|--dev", flags))
+        if ecosystem == NPM:
+            name, _, version = (
+                spec.rpartition("@") if spec.rfind("@") > 0 else (spec, "", "")
+            )
+        else:
+            parts = re.match(r"^([^<>=!~]+)(.*)$", spec)
+            if parts is None:
+                continue
+            name, version = parts.groups()
+        if valid_name(ecosystem, name) and name.lower() not in _INSTALLERS:
+            return Package(ecosystem, name, version, dev)
+    return None
+
+
+def resolve(
+    frameworks: Iterable[RequiredFramework], ecosystem: str, table: Dict[str, Package]
+) -> Tuple[List[Package], List[RequiredFramework]]:
+    """Return the packages the frameworks need and the frameworks that could not be resolved."""
+    packages: List[Package] = []
+    unknown: List[RequiredFramework] = []
+    for framework in frameworks:
+        package = lookup(table, framework.name)
+        if package is None or (package.name and package.ecosystem != ecosystem):
+            package = from_instructions(framework.installation_instructions, ecosystem)
+        if package is None:
+            unknown.append(framework)
+        elif package.name:
+            packages.append(package)
+    return packages, unknown
+
+
+def learned(resolved: Iterable[ResolvedPackage]) -> Dict[str, Package]:
+    """Turn the model's answers into table entries, dropping invalid package names."""
+    table: Dict[str, Package] = {}
+    for entry in resolved:
+        if entry.ecosystem not in (NPM, PYPI):
+            continue
+        if not entry.package:
+            table[key(entry.framework)] = BUILT_IN
+        elif valid_name(entry.ecosystem, entry.package):
+            table[key(entry.framework)] = Package(
+                entry.ecosystem, entry.package, entry.version or "", entry.dev
+            )
+    return table
+
+
+def _unique(packages: Iterable[Package]) -> List[Package]:
+    seen: Dict[str, Package] = {}
+    for package in packages:
+        seen.setdefault(package.name.lower(), package)
+    return list(seen.values())
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", text.lower()).strip("-")[:50].strip("-") or "app"
+
+
+def package_json(topic: str, packages: Iterable[Package]) -> str:
+    """Return the front end's ``package.json``."""
+    packages = _unique([*FRONT_END_BASE, *packages])
+    manifest = {
+        "name": _slug(topic),
+        "private": True,
+        "version": "0.1.0",
+        "type": "module",
+        "scripts": {"dev": "vite", "build": "vite build", "preview": "vite preview"},
+        "dependencies": {p.name: p.version or "latest" for p in packages if not p.dev},
+        "devDependencies": {p.name: p.version or "latest" for p in packages if p.dev},
+    }
+    return json.dumps(manifest, indent=2) + "\n"
+
+
+def requirements_txt(packages: Iterable[Package]) -> str:
+    """Return the back end's ``requirements.txt``."""
+    return "".join(
+        f"{p.name}{p.version}\n" for p in _unique([*BACK_END_BASE, *packages])
+    )
+
+
+def dependency_files(
+    topic: str, front_end: Iterable[Package], back_end: Iterable[Package]
+) -> Dict[str, str]:
+    """Return the dependency files keyed by their path in the project."""
+    return {
+        "front_end/package.json": package_json(topic, front_end),
+        "back_end/requirements.txt": requirements_txt(back_end),
+    }
+
+
+def entry_point(
+    organization: Optional[CodeOrganization], names: Tuple[str, ...]
+) -> Optional[str]:
+    """Return the path of the first file named like one of `names` (in order of preference)."""
+    if organization is None:
+        return None
+    paths = {
+        name: f"{folder}/{name}" for (folder, name), _, _ in iter_files(organization)
+    }
+    endpoint = next(
+        (
+            f"{folder}/{name}"
+            for (folder, name), _, is_endpoint in iter_files(organization)
+            if is_endpoint
+        ),
+        None,
+    )
+    return next((paths[name] for name in names if name in paths), endpoint)
+
+
+def _manual(unresolved: List[RequiredFramework]) -> str:
+    if not unresolved:
+        return ""
+    lines = "\n".join(
+        f"   - {f.name}: {f.installation_instructions or f.description}"
+        for f in unresolved
+    )
+    return f"\nInstall these manually, no package was found for them:\n{lines}\n"
+
+
+def project_setup(
+    front_end: List[Package],
+    back_end: List[Package],
+    front_end_organization: Optional[CodeOrganization] = None,
+    back_end_organization: Optional[CodeOrganization] = None,
+    unresolved: Optional[Dict[str, List[RequiredFramework]]] = None,
+) -> ProjectSetup:
+    """Build the setup instructions for the resolved packages."""
+    unresolved = unresolved or {}
+    front_entry = (
+        entry_point(
+            front_end_organization,
+            (
+                "main.jsx",
+                "main.tsx",
+                "main.js",
+                "index.jsx",
+                "index.js",
+                "App.jsx",
+                "App.js",
+            ),
+        )
+        or "src/main.jsx"
+    )
+    back_entry = entry_point(back_end_organization, ("main.py", "app.py")) or "main.py"
+    module = re.sub(r"^back_end/", "", back_entry)[: -len(".py")].replace("/", ".")
+    poetry_add = " ".join(
+        f'"{p.name}{p.version}"' for p in _unique([*BACK_END_BASE, *back_end])
+    )
+
+    front_end_setup = f"""1. Create the `front_end` directory and save the generated `package.json` in it.
+2. Install the dependencies:
+   ```bash
+   cd front_end
+   npm install
+   ```
+3. Make sure `index.html` loads the entry point `{front_entry}` (`<script type="module" src="/{front_entry}"></script>`).
+4. Start the development server:
+   ```bash
+   npm run dev
+   ```
+{_manual(unresolved.get(NPM, []))}"""
+
+    back_end_setup = f"""1. Create the `back_end` directory and save the generated `requirements.txt` in it.
+2. Create the virtual environment and install the dependencies with Poetry:
+   ```bash
+   cd back_end
+   poetry init --no-interaction
+   poetry add {poetry_add}
+   ```
+   (Without Poetry: `python -m venv .venv`, activate it and run `pip install -r requirements.txt`.)
+3. In Visual Studio Code, run `poetry env info --path` and pick that environment with "Python: Select Interpreter".
+4. Start the API from the `back_end` directory (entry point `{back_entry}`):
+   ```bash
+   poetry run uvicorn {module}:app --reload
+   ```
+{_manual(unresolved.get(PYPI, []))}"""
+
+    return ProjectSetup(front_end_setup=front_end_setup, back_end_setup=back_end_setup)
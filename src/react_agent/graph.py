@@ -2,75 +2,171 @@
 
 import operator
 from pydantic import BaseModel, Field
-from typing import Annotated, List
+from typing import Annotated, Any, List
 from typing_extensions import TypedDict
 
 from langchain_community.document_loaders import WikipediaLoader
 from langchain_community.tools.tavily_search import TavilySearchResults
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, get_buffer_string
 from langchain_openai import ChatOpenAI
-import sys
-import os
 
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from langgraph.constants import Send
 
 from langgraph.graph import END, MessagesState, START, StateGraph
-from schemas import DeveloperState
-from node import (
+from react_agent.schemas import DeveloperState
+from react_agent.stages import memoized
+from react_agent.node import (
     human_feedback_requirements,
     initiate_all_interviews,
     process_requirements,
+    compress_requirements,
+    find_similar_run,
+    index_run,
     front_end_process,
     back_end_process,
+    route_design,
+    route_after_front_end,
+    reconcile_back_end,
     organize_front_end_code,
     organize_back_end_code , # Added this import
     generate_front_end_code,
     generate_back_end_code,
     required_software,
+    summarize_specs,
+    regenerate_code,
+    check_contract,
+    route_contract,
+    fix_contract,
 )
 
-### Build Interview Graph
+### Build Requirements Graph
 
-builder = StateGraph(DeveloperState)
-builder.add_node("process_requirements", process_requirements)
+requirements_builder = StateGraph(DeveloperState)
+requirements_builder.add_node("process_requirements", process_requirements)
 
 # Rename the node from 'human_feedback' to 'get_human_feedback'
-builder.add_node("human_feedback_requirements", human_feedback_requirements)
+requirements_builder.add_node("human_feedback_requirements", human_feedback_requirements)
+requirements_builder.add_node("compress_requirements", compress_requirements)
 
-builder.add_node("front_end_process", front_end_process)
-builder.add_node("back_end_process", back_end_process)
-
-builder.add_node("organize_front_end_code", organize_front_end_code)
-builder.add_node("organize_back_end_code", organize_back_end_code)  # Added this node
-builder.add_node("generate_front_end_code", generate_front_end_code)
-builder.add_node("generate_back_end_code", generate_back_end_code)  # Added this node
-builder.add_node("required_software", required_software)  # Added this node
-
-builder.add_edge(START, "process_requirements")
-
-
-
-
-
-builder.add_edge("process_requirements", "human_feedback_requirements")
+requirements_builder.add_edge(START, "process_requirements")
+requirements_builder.add_edge("process_requirements", "human_feedback_requirements")
 
 # Update the node name in conditional edges
-builder.add_conditional_edges(
+requirements_builder.add_conditional_edges(
     "human_feedback_requirements",
     initiate_all_interviews,
-    ["process_requirements", "front_end_process"]
+    ["process_requirements", "compress_requirements"]
+)
+requirements_builder.add_edge("compress_requirements", END)
+
+requirements_graph = requirements_builder.compile()
+
+# Pauses before `human_feedback_requirements` so a person can set
+# `human_feedback`; used by `interactive_graph`
+interactive_requirements_graph = requirements_builder.compile(
+    interrupt_before=["human_feedback_requirements"]
 )
 
-builder.add_edge("front_end_process", "back_end_process")
-builder.add_edge("back_end_process", "organize_front_end_code")
-builder.add_edge("organize_front_end_code", "organize_back_end_code")  # Added this edge
-builder.add_edge("organize_back_end_code", "generate_front_end_code")  # Connect to END
-builder.add_edge("generate_front_end_code", "generate_back_end_code")  # Connect to END
-builder.add_edge("generate_back_end_code", "required_software")  # Connect to END
-builder.add_edge("required_software", END)  # Connect to END
 
+### Build Design Graph
+
+design_builder = StateGraph(DeveloperState)
+design_builder.add_node("front_end_process", front_end_process)
+design_builder.add_node("back_end_process", back_end_process)
+design_builder.add_node("reconcile_back_end", reconcile_back_end)
+design_builder.add_node("summarize_specs", summarize_specs)
+design_builder.add_node("organize_front_end_code", organize_front_end_code)
+design_builder.add_node("organize_back_end_code", organize_back_end_code)  # Added this node
+
+# Sequential by default; with `parallel_design` both drafts start together
+design_builder.add_conditional_edges(START, route_design, ["front_end_process", "back_end_process"])
+design_builder.add_conditional_edges("front_end_process", route_after_front_end, ["back_end_process"])
+design_builder.add_edge(["front_end_process", "back_end_process"], "reconcile_back_end")
+design_builder.add_edge("reconcile_back_end", "summarize_specs")
+design_builder.add_edge("summarize_specs", "organize_front_end_code")
+design_builder.add_edge("organize_front_end_code", "organize_back_end_code")  # Added this edge
+design_builder.add_edge("organize_back_end_code", END)
+
+design_graph = design_builder.compile()
+
+
+### Build Codegen Graph
+
+codegen_builder = StateGraph(DeveloperState)
+codegen_builder.add_node("generate_front_end_code", generate_front_end_code)
+codegen_builder.add_node("generate_back_end_code", generate_back_end_code)  # Added this node
+codegen_builder.add_node("check_contract", check_contract)
+codegen_builder.add_node("fix_contract", fix_contract)
+codegen_builder.add_node("required_software", required_software)  # Added this node
+
+codegen_builder.add_edge(START, "generate_front_end_code")
+codegen_builder.add_edge("generate_front_end_code", "generate_back_end_code")
+codegen_builder.add_edge("generate_back_end_code", "check_contract")
+codegen_builder.add_conditional_edges(
+    "check_contract",
+    route_contract,
+    {"fix_contract": "fix_contract", "done": "required_software"},
+)
+codegen_builder.add_edge("fix_contract", "required_software")
+codegen_builder.add_edge("required_software", END)
+
+codegen_graph = codegen_builder.compile()
+
+
+### Build Full Graph
+
+def build_graph(requirements: Any = requirements_graph) -> StateGraph[DeveloperState]:
+    """Return the full graph builder, with `requirements` as the requirements stage."""
+    # Each stage is one node; a stage whose inputs match an earlier run is skipped.
+    # The reuse lookup reads the run index, which changes between runs, so it
+    # stays outside the memoized stages and its match is a design input.
+    builder = StateGraph(DeveloperState)
+    builder.add_node("requirements", memoized("requirements", requirements))
+    builder.add_node("find_similar_run", find_similar_run)
+    builder.add_node("design", memoized("design", design_graph))
+    builder.add_node("codegen", memoized("codegen", codegen_graph))
+    builder.add_node("index_run", index_run)
+
+    builder.add_edge(START, "requirements")
+    builder.add_edge("requirements", "find_similar_run")
+    builder.add_edge("find_similar_run", "design")
+    builder.add_edge("design", "codegen")
+    builder.add_edge("codegen", "index_run")
+    builder.add_edge("index_run", END)  # Connect to END
+    return builder
+
+
+builder = build_graph()
+graph = builder.compile()
+
+# The feedback node lives in the requirements subgraph, so the interrupt is
+# compiled into that subgraph rather than passed to `builder.compile`. Runs
+# need a checkpointer (LangGraph Studio supplies one) and stop inside the
+# `requirements` node. To resume, find the paused subgraph with
+# `interactive_graph.get_state(config, subgraphs=True).tasks[0].state`, call
+# `update_state(that_state.config, {"human_feedback": ...})`, then invoke
+# with None. Anything but "approve" sends the requirements round again.
+interactive_graph = build_graph(interactive_requirements_graph).compile()
+
+
+### Build Edit Graph
+
+# Rewrites only the generated files affected by `changed_requirements` (or by
+# the difference between `global_requirements` and `revised_requirements`),
+# then re-checks the API contract between the two sides. Both inputs are
+# cleared and `global_requirements` becomes the revised list, so the next
+# edit on the same thread diffs against this one
+edit_builder = StateGraph(DeveloperState)
+edit_builder.add_node("regenerate_code", regenerate_code)
+edit_builder.add_node("check_contract", check_contract)
+edit_builder.add_node("fix_contract", fix_contract)
+edit_builder.add_edge(START, "regenerate_code")
+edit_builder.add_edge("regenerate_code", "check_contract")
+edit_builder.add_conditional_edges(
+    "check_contract",
+    route_contract,
+    {"fix_contract": "fix_contract", "done": END},
+)
+edit_builder.add_edge("fix_contract", END)
 
-# Update the interrupt_before list
-#graph = builder.compile(interrupt_before=['human_feedback_requirements'])
-graph = builder.compile()
\ No newline at end of file
+edit_graph = edit_builder.compile()
@@ -0,0 +1,166 @@
+"""Per-node deadlines and hedged model calls.
+
+The node timeout is passed to the model client (see `node._load_model`), so
+a stalled request is aborted by the client itself and does not hold a thread
+for longer than the deadline. `HedgedModel` checks the same deadline: a call
+that fails or returns after it raises `TimeoutError`.
+
+Without hedging the call runs on the caller's thread. With hedging it runs
+on its own thread, and if it outlives the latency percentile learned for its
+node, a duplicate is sent on another thread and the first successful
+response wins. Threads are started per call rather than taken from a fixed
+pool, so stalled calls never delay healthy ones.
+
+Metrics are recorded per node under `calls`, `latency`, `hedge_fired`,
+`hedge_won` and `timeouts`.
+"""
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from contextvars import copy_context
+from typing import Any, Callable, List, Optional
+
+from react_agent.metrics import METRICS, Metrics
+
+
+def spawn(fn: Callable[[], Any]) -> "Future[Any]":
+    """Run `fn` on a new thread, keeping the caller's context.
+
+    The call never waits in a queue, so it is safe to start from code that
+    itself runs on such a thread. Cancelling the future only stops a call
+    whose thread has not started yet.
+    """
+    future: Future[Any] = Future()
+    context = copy_context()
+
+    def run() -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(context.run(fn))
+        except BaseException as e:
+            future.set_exception(e)
+
+    threading.Thread(target=run, name="model-call", daemon=True).start()
+    return future
+
+
+def _call_on_this_thread(
+    fn: Callable[[], Any], node: str, timeout: Optional[float], metrics: Metrics
+) -> Any:
+    start = time.perf_counter()
+    try:
+        result = fn()
+    except Exception as e:
+        if timeout is not None and time.perf_counter() - start >= timeout:
+            metrics.increment(node, "timeouts")
+            raise TimeoutError(
+                f"{node} did not get a model response within {timeout}s."
+            ) from e
+        raise
+    elapsed = time.perf_counter() - start
+    if timeout is not None and elapsed > timeout:
+        metrics.increment(node, "timeouts")
+        raise TimeoutError(f"{node} did not get a model response within {timeout}s.")
+    metrics.observe(node, "latency", elapsed)
+    return result
+
+
+def call_with_deadline(
+    fn: Callable[[], Any],
+    node: str,
+    timeout: Optional[float] = None,
+    hedge_delay: Optional[float] = None,
+    metrics: Metrics = METRICS,
+) -> Any:
+    """Call `fn`, hedging after `hedge_delay` seconds and giving up after `timeout`.
+
+    Args:
+        fn: The model call. It must be safe to run twice concurrently.
+        node: The node the call belongs to, for metrics.
+        timeout: Seconds before `TimeoutError`; `fn` should abort itself by
+            then, as the model client does. None waits forever.
+        hedge_delay: Seconds before a duplicate is sent; None disables hedging.
+        metrics: Where to record what happened.
+    """
+    start = time.perf_counter()
+    deadline = start + timeout if timeout is not None else None
+    metrics.increment(node, "calls")
+    if hedge_delay is None:
+        return _call_on_this_thread(fn, node, timeout, metrics)
+
+    futures: List[Future[Any]] = [spawn(fn)]
+    hedge: Optional[Future[Any]] = None
+    error: Optional[BaseException] = None
+
+    while futures:
+        remaining = None if deadline is None else deadline - time.perf_counter()
+        wait_for = remaining
+        if hedge is None and hedge_delay is not None:
+            until_hedge = start + hedge_delay - time.perf_counter()
+            wait_for = until_hedge if remaining is None else min(remaining, until_hedge)
+        if wait_for is not None:
+            wait_for = max(0.0, wait_for)
+        done, _ = wait(futures, timeout=wait_for, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            futures.remove(future)
+            if future.exception() is None:
+                for other in futures:
+                    other.cancel()
+                metrics.observe(node, "latency", time.perf_counter() - start)
+                if future is hedge:
+                    metrics.increment(node, "hedge_won")
+                return future.result()
+            error = future.exception()
+
+        if done:
+            continue
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        if hedge is None and hedge_delay is not None:
+            hedge = spawn(fn)
+            futures.append(hedge)
+            metrics.increment(node, "hedge_fired")
+
+    if error is not None and not futures:
+        raise error
+    for future in futures:
+        future.cancel()
+    metrics.increment(node, "timeouts")
+    raise TimeoutError(f"{node} did not get a model response within {timeout}s.")
+
+
+class HedgedModel:
+    """Wrap a runnable so `invoke` applies the node's deadline and hedging policy."""
+
+    def __init__(
+        self,
+        runnable: Any,
+        node: str,
+        timeout: Optional[float] = None,
+        hedge_percentile: Optional[float] = None,
+        hedge_min_samples: int = 20,
+        metrics: Metrics = METRICS,
+    ) -> None:
+        """Hedge at the node's learned `hedge_percentile` once enough calls were seen."""
+        self.runnable = runnable
+        self.node = node
+        self.timeout = timeout
+        self.metrics = metrics
+        self.hedge_delay = (
+            metrics.percentile(node, "latency", hedge_percentile, hedge_min_samples)
+            if hedge_percentile is not None
+            else None
+        )
+
+    def invoke(self, input: Any, config: Any = None) -> Any:
+        """Invoke the wrapped runnable under the deadline and hedging policy."""
+        return call_with_deadline(
+            lambda: self.runnable.invoke(input, config),
+            self.node,
+            self.timeout,
+            self.hedge_delay,
+            self.metrics,
+        )
@@ -0,0 +1,227 @@
+"""Concurrent load test of the graph against the stub model.
+
+Drives `graph.ainvoke` with many `DeveloperState` inputs at each requested
+concurrency level. It measures throughput, run latency percentiles, event
+loop lag (how late a 10 ms ticker wakes up) and memory per concurrent run:
+the peak of the resident set size sampled on each tick, minus a baseline
+taken just before the level starts. The report is written as JSON, stamped with the current git commit, so
+two runs can be compared with ``--compare``.
+
+Run with ``python -m react_agent.loadtest --concurrency 50,200,500`` (or
+``make loadtest``). Pick ``--model`` as a stub spec matching production, for
+example ``stub/samples=trace.json,items=3,chars=400``. With ``--slots 8
+--batch-share 0.8`` model calls are scheduled and most runs are sent as
+batch work, to check that interactive latency stays flat under batch load.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from react_agent.metrics import METRICS, percentile
+from react_agent.scheduler import BATCH, INTERACTIVE
+
+TICK = 0.01
+
+
+def git_commit() -> Optional[str]:
+    """Return the current git commit, if run inside a checkout."""
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _max_rss_bytes() -> int:
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return rss if sys.platform == "darwin" else rss * 1024
+
+
+def rss_bytes() -> int:
+    """Return the current resident set size of this process.
+
+    Read from /proc where there is one; elsewhere fall back to the peak so
+    far, which only grows, so levels after the first may read as zero.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return _max_rss_bytes()
+
+
+async def _watch_loop(lags: List[float], rss: List[int], stop: asyncio.Event) -> None:
+    """Record the loop lag and the resident set size on every tick until `stop` is set."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(TICK)
+        lags.append(max(0.0, time.perf_counter() - start - TICK))
+        rss.append(rss_bytes())
+
+
+def _is_batch(i: int, batch_share: float) -> bool:
+    """Spread batch runs evenly: run `i` is batch when the running share crosses a whole run."""
+    return int((i + 1) * batch_share) > int(i * batch_share)
+
+
+async def run_level(
+    graph: Any,
+    concurrency: int,
+    runs: int,
+    model: str,
+    slots: Optional[int] = None,
+    batch_share: float = 0.0,
+) -> Dict[str, Any]:
+    """Run `runs` graph invocations with at most `concurrency` in flight.
+
+    With `slots`, model calls go through the priority scheduler and
+    `batch_share` of the runs are sent as batch work; the report then
+    includes run latency and queue wait per priority class.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    class_latencies: Dict[str, List[float]] = {INTERACTIVE: [], BATCH: []}
+    errors: Dict[str, int] = {}
+    lags: List[float] = []
+    stop = asyncio.Event()
+    if slots is not None:
+        METRICS.reset()
+
+    async def one(i: int) -> None:
+        priority = BATCH if _is_batch(i, batch_share) else INTERACTIVE
+        config: Dict[str, Dict[str, Any]] = {
+            "configurable": {"model": model, "priority": priority, "tenant": priority}
+        }
+        if slots is not None:
+            config["configurable"]["model_call_slots"] = slots
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                await graph.ainvoke(
+                    {"topic": f"Load test app #{i}", "human_feedback": "approve"},
+                    config,
+                )
+            except Exception as e:
+                errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+            else:
+                latencies.append(time.perf_counter() - start)
+                class_latencies[priority].append(latencies[-1])
+
+    # Drop garbage left by earlier levels so it is not counted against this one
+    gc.collect()
+    baseline = rss_bytes()
+    rss = [baseline]
+    watcher = asyncio.create_task(_watch_loop(lags, rss, stop))
+    start = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(runs)))
+    elapsed = time.perf_counter() - start
+    rss.append(rss_bytes())
+    stop.set()
+    await watcher
+
+    report: Dict[str, Any] = {
+        "concurrency": concurrency,
+        "runs": runs,
+        "errors": errors,
+        "seconds": elapsed,
+        "throughput_rps": len(latencies) / elapsed if elapsed else 0.0,
+        "memory_per_run_bytes": (max(rss) - baseline) / concurrency,
+    }
+    if latencies:
+        for p in (50, 90, 99):
+            report[f"latency_p{p}"] = percentile(latencies, p)
+    if slots is not None:
+        snapshot = METRICS.snapshot()
+        for priority, series in class_latencies.items():
+            if series:
+                report[f"{priority}_latency_p50"] = percentile(series, 50)
+                report[f"{priority}_latency_p99"] = percentile(series, 99)
+            waits = snapshot.get(f"scheduler/{priority}", {})
+            for p in (50, 99):
+                if f"queue_wait_p{p}" in waits:
+                    report[f"{priority}_queue_wait_p{p}"] = waits[f"queue_wait_p{p}"]
+    if lags:
+        report["loop_lag_p50"] = percentile(lags, 50)
+        report["loop_lag_p99"] = percentile(lags, 99)
+        report["loop_lag_max"] = max(lags)
+    return report
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    """Return one line per metric and level showing the relative change."""
+    lines = []
+    old_levels = {level["concurrency"]: level for level in old["levels"]}
+    for level in new["levels"]:
+        before = old_levels.get(level["concurrency"])
+        if before is None:
+            continue
+        for key, value in level.items():
+            if key in ("concurrency", "runs", "errors") or key not in before:
+                continue
+            base = before[key]
+            change = (value - base) / base * 100 if base else 0.0
+            lines.append(
+                f"c={level['concurrency']:<4} {key:22s} {base:12.4f} -> {value:12.4f} ({change:+.1f}%)"
+            )
+    return lines
+
+
+def main() -> None:
+    """Run the load test and write (and optionally compare) the report."""
+    from react_agent import graph
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--concurrency", default="50,100,500")
+    parser.add_argument("--runs-per-level", type=int, default=None)
+    parser.add_argument("--model", default="stub/latency=0.5,sigma=0.5")
+    parser.add_argument("--output", default="loadtest.json")
+    parser.add_argument("--compare", default=None)
+    parser.add_argument(
+        "--slots",
+        type=int,
+        default=None,
+        help="schedule model calls on this many slots",
+    )
+    parser.add_argument(
+        "--batch-share", type=float, default=0.0, help="share of runs sent as batch"
+    )
+    args = parser.parse_args()
+
+    levels = []
+    for concurrency in (int(c) for c in args.concurrency.split(",")):
+        runs = args.runs_per_level or concurrency * 2
+        level = asyncio.run(
+            run_level(
+                graph, concurrency, runs, args.model, args.slots, args.batch_share
+            )
+        )
+        levels.append(level)
+        print(json.dumps(level))  # noqa: T201
+
+    report = {"commit": git_commit(), "model": args.model, "levels": levels}
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Report written to {args.output}")  # noqa: T201
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        print(f"Compared with {baseline.get('commit')}:")  # noqa: T201
+        for line in compare(baseline, report):
+            print(line)  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
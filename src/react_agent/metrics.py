@@ -0,0 +1,81 @@
+"""In-process counters and latency windows, keyed by node.
+
+Model-call policies (hedging, cascades, coalescing, scheduling) record what
+they did here so they can be tuned per stage. `METRICS.snapshot()` returns
+everything as plain data.
+"""
+
+import threading
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, Optional, Tuple
+
+WINDOW = 1000
+
+
+def percentile(values: Any, p: float) -> float:
+    """Return the `p`-th percentile (0-100) of `values` by nearest rank."""
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(p / 100 * len(ordered)) - 1))
+    return float(ordered[rank])
+
+
+class Metrics:
+    """Thread-safe counters and bounded latency windows."""
+
+    def __init__(self, window: int = WINDOW) -> None:
+        """Keep the last `window` observations of each latency series."""
+        self._window = window
+        self._lock = threading.Lock()
+        self._counters: Dict[Tuple[str, str], int] = defaultdict(int)
+        self._latencies: Dict[Tuple[str, str], Deque[float]] = {}
+
+    def increment(self, node: str, name: str, value: int = 1) -> None:
+        """Add `value` to the `name` counter of `node`."""
+        with self._lock:
+            self._counters[(node, name)] += value
+
+    def observe(self, node: str, name: str, seconds: float) -> None:
+        """Record one latency observation for `node`."""
+        with self._lock:
+            series = self._latencies.setdefault(
+                (node, name), deque(maxlen=self._window)
+            )
+            series.append(seconds)
+
+    def count(self, node: str, name: str) -> int:
+        """Return the current value of a counter."""
+        with self._lock:
+            return self._counters.get((node, name), 0)
+
+    def percentile(
+        self, node: str, name: str, p: float, min_samples: int = 1
+    ) -> Optional[float]:
+        """Return a latency percentile, or None with fewer than `min_samples`."""
+        with self._lock:
+            series = list(self._latencies.get((node, name), ()))
+        if len(series) < max(1, min_samples):
+            return None
+        return percentile(series, p)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Return counters and p50/p99 latencies grouped by node."""
+        with self._lock:
+            counters = dict(self._counters)
+            latencies = {key: list(series) for key, series in self._latencies.items()}
+        result: Dict[str, Dict[str, Any]] = defaultdict(dict)
+        for (node, name), value in counters.items():
+            result[node][name] = value
+        for (node, name), series in latencies.items():
+            if series:
+                result[node][f"{name}_p50"] = percentile(series, 50)
+                result[node][f"{name}_p99"] = percentile(series, 99)
+        return dict(result)
+
+    def reset(self) -> None:
+        """Drop every counter and observation."""
+        with self._lock:
+            self._counters.clear()
+            self._latencies.clear()
+
+
+METRICS = Metrics()
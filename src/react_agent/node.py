@@ -1,33 +1,62 @@
 # node.py
 
 import operator
+from functools import cache
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar, Union
 from typing_extensions import TypedDict
 
 from langchain_community.document_loaders import WikipediaLoader
 from langchain_community.tools.tavily_search import TavilySearchResults
+from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, get_buffer_string
-from langchain_openai import ChatOpenAI
-import sys
-import os
+from langchain_core.runnables import Runnable, RunnableConfig, RunnableLambda
 
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
-from prompts import (
+from react_agent.prompts import (
     process_instructions,
     front_end_instructions,
     back_end_instructions,
     back_end_organization_instructions,
+    back_end_reconcile_instructions,
+    front_end_pending,
     front_end_organization_instructions,
     front_end_generation_instructions,
     back_end_generation_instructions,
-    project_setup_instructions,
+    package_resolution_instructions,
+    code_regeneration_instructions,
+    contract_fix_instructions,
+    reuse_draft_instructions,
     
     
 )
 from langgraph.constants import Send
-from schemas import (
+from react_agent.cascade import CascadeModel
+from react_agent.coalesce import CoalescedModel
+from react_agent.checks import coverage
+from react_agent.compact import compact_model, expand, tokens_saved
+from react_agent.compress import dedupe, numbered
+from react_agent.configuration import Configuration
+from react_agent.contract import check, described_endpoints, missing_endpoints, missing_fields
+from react_agent.dependencies import (
+    NPM,
+    PYPI,
+    dependency_files,
+    learned,
+    load_packages,
+    project_setup,
+    resolve,
+    save_packages,
+)
+from react_agent.hedging import HedgedModel
+from react_agent.metrics import METRICS
+from react_agent.profiling import phase
+from react_agent.regenerate import changed_requirements, endpoint_keys, iter_files, merge, plan
+from react_agent.reuse import REUSABLE_STAGES, ReuseIndex
+from react_agent.sampling import BestOfNModel
+from react_agent.scheduler import ScheduledModel, shared_scheduler
+from react_agent.summarize import spec_digests
+from react_agent.utils import load_chat_model
+from react_agent.schemas import (
     FunctionalRequirements,
     DeveloperState,
     FrontEndRequirements,
@@ -35,41 +64,186 @@ from schemas import (
     FrontEndDependencies,
     BackEndDependencies,
     CodeOrganization,
-    ProjectSetup,
- 
+    GeneratedCode,
+    PackageResolution,
+    Requirement,
+    SpecDigests,
 )
 
 from langgraph.graph import END, MessagesState, START, StateGraph
 
-llm = ChatOpenAI(model="gpt-4o", temperature=0)
+T = TypeVar("T")
+
+
+def require(value: Optional[T], name: str) -> T:
+    """Return the state field `name`, which an earlier node must have filled in."""
+    if value is None:
+        raise ValueError(f"No {name} found in the state.")
+    return value
+
+
+@cache
+def _load_model(
+    fully_specified_name: str, temperature: float = 0, timeout: Optional[float] = None
+) -> BaseChatModel:
+    """Load (once) the chat model named in the configuration.
+
+    With a `timeout` the client aborts requests that outlive it, without
+    retrying, so a stalled call never runs past the node's deadline.
+    """
+    if timeout is None:
+        return load_chat_model(fully_specified_name, temperature=temperature)
+    return load_chat_model(
+        fully_specified_name, temperature=temperature, timeout=timeout, max_retries=0
+    )
+
+
+def _with_schema(
+    model_name: str,
+    schema: Type[BaseModel],
+    compact: bool,
+    temperature: float = 0,
+    timeout: Optional[float] = None,
+) -> Runnable[Any, Any]:
+    """Bind `schema` as the structured output of the named model."""
+    model = _load_model(model_name, temperature, timeout)
+    if not compact:
+        structured: Runnable[Any, Any] = model.with_structured_output(schema)
+        return structured
+
+    def expand_output(output: Any) -> BaseModel:
+        return expand(output, schema)
+
+    return model.with_structured_output(compact_model(schema)) | RunnableLambda(
+        expand_output, name="expand_compact_output"
+    )
+
+
+def structured_model(schema: Type[BaseModel], config: RunnableConfig) -> Any:
+    """Return the configured chat model enforcing `schema` as output.
+
+    With `compact_schemas` the model sees a compact version of `schema` and
+    its output is mapped back to `schema`. With `cascade_model` set, the node
+    tries the cheaper model first (`CascadeModel`). Nodes listed in
+    `best_of_n` sample several responses in parallel and keep the first valid
+    one (`BestOfNModel`). When a timeout or hedging is configured, calls go
+    through `HedgedModel`. With `model_call_slots`, each request waits for a
+    slot by the run's priority class and tenant (`ScheduledModel`). With
+    `coalesce_requests`, identical requests in flight at the same time share
+    one call (`CoalescedModel`).
+    """
+    configuration = Configuration.from_runnable_config(config)
+    compact = configuration.compact_schemas
+    node = (config.get("metadata") or {}).get("langgraph_node", "")
+    if compact:
+        METRICS.increment(node, "schema_tokens_saved", tokens_saved(schema))
+
+    models = [configuration.model]
+    cascade_model = configuration.cascade_model
+    if configuration.cascade_nodes and node not in configuration.cascade_nodes:
+        cascade_model = None
+    if cascade_model:
+        models.append(cascade_model)
+
+    timeout = configuration.node_timeouts.get(node, configuration.default_node_timeout)
+
+    def build(temperature: float = 0) -> Any:
+        model: Any = _with_schema(configuration.model, schema, compact, temperature, timeout)
+        if cascade_model:
+            cheap = _with_schema(cascade_model, schema, compact, temperature, timeout)
+            model = CascadeModel(cheap, model, node)
+        return model
+
+    model: Any = build()
+    samples = configuration.best_of_n.get(node, 1)
+    if samples > 1:
+        extra = build(configuration.best_of_n_temperature)
+        model = BestOfNModel(
+            [model] + [extra] * (samples - 1),
+            node,
+            stagger=configuration.best_of_n_stagger,
+            timeout=timeout,
+        )
+    # Best-of-N already sends duplicates and applies the timeout itself
+    elif timeout is not None or configuration.hedge_percentile is not None:
+        model = HedgedModel(
+            model,
+            node,
+            timeout=timeout,
+            hedge_percentile=configuration.hedge_percentile,
+            hedge_min_samples=configuration.hedge_min_samples,
+        )
+
+    if configuration.model_call_slots is not None:
+        scheduler = shared_scheduler(
+            configuration.model_call_slots, configuration.interactive_reserved_slots
+        )
+        model = ScheduledModel(model, scheduler, configuration.priority, configuration.tenant)
+
+    if configuration.coalesce_requests:
+        parts = [*models, f"{schema.__module__}.{schema.__qualname__}", str(compact)]
+        # A request only joins one made under the same deadline, hedging and
+        # sampling, so it never waits past its own timeout or gets an unchecked sample
+        parts += [
+            f"timeout={timeout}",
+            f"hedge={configuration.hedge_percentile}/{configuration.hedge_min_samples}",
+            f"samples={samples}",
+        ]
+        if samples > 1:
+            parts.append(
+                f"sampling={configuration.best_of_n_temperature}/{configuration.best_of_n_stagger}"
+            )
+        if configuration.model_call_slots is not None:
+            # An interactive request must not wait behind an identical queued batch one
+            parts.append(configuration.priority)
+        model = CoalescedModel(model, node, "|".join(parts))
+    return model
+
+
+def reused_artifact(state: DeveloperState, stage: str) -> Optional[BaseModel]:
+    """Return the stored artifact for `stage` when the reuse match skips it."""
+    if state.reuse and stage in state.reuse.skipped_stages:
+        artifact: BaseModel = getattr(state.reuse, REUSABLE_STAGES[stage])
+        return artifact
+    return None
+
+
+def reuse_draft(state: DeveloperState, stage: str) -> str:
+    """Return the prompt section offering the stored artifact for `stage` as a draft."""
+    if not state.reuse or stage not in state.reuse.revised_stages:
+        return ""
+    draft = getattr(state.reuse, REUSABLE_STAGES[stage])
+    return reuse_draft_instructions.format(draft=draft.model_dump_json(indent=1))
 
 ### Function Definitions
 
-def process_requirements(state: DeveloperState):
+def process_requirements(state: DeveloperState, config: RunnableConfig) -> Dict[str, Any]:
     """Process requirements"""
     topic = state.topic
     human_developer_feedback = state.human_feedback or ''
 
     # Enforce structured output
-    structured_llm = llm.with_structured_output(FunctionalRequirements)
+    structured_llm = structured_model(FunctionalRequirements, config)
 
     # System message
-    system_message = process_instructions.format(
-        topic=topic,
-        human_developer_feedback=human_developer_feedback,
-    )
+    with phase(config, "format_prompt"):
+        system_message = process_instructions.format(
+            topic=topic,
+            human_developer_feedback=human_developer_feedback,
+        )
 
     # Generate requirements
-    requirements = structured_llm.invoke([
-        SystemMessage(content=system_message),
-        HumanMessage(content="Process the requirements.")
-    ])
+    with phase(config, "invoke_model"):
+        requirements = structured_llm.invoke([
+            SystemMessage(content=system_message),
+            HumanMessage(content="Process the requirements.")
+        ])
 
-    # Update the state
-    return {"global_requirements": requirements}
+    # Update the state; a stale digest is rebuilt after the next approval
+    return {"global_requirements": requirements, "requirements_digest": None}
 
 
-def human_feedback_requirements(state: DeveloperState):
+def human_feedback_requirements(state: DeveloperState) -> Dict[str, Any]:
     """No-op node that should be interrupted on"""
     human_developer_feedback = state.human_feedback or ''
 
@@ -77,108 +251,272 @@ def human_feedback_requirements(state: DeveloperState):
  
 
 
-def initiate_all_interviews(state: DeveloperState):
+def initiate_all_interviews(state: DeveloperState) -> str:
     """Conditional edge to initiate all interviews via Send() API or return to process_requirements"""
     human_developer_feedback = state.human_feedback or ''
     if human_developer_feedback != 'approve':
         return "process_requirements"
     else:
-        return "front_end_process"
+        return "compress_requirements"
+
+
+def requirements_digest(state: DeveloperState, config: Optional[RunnableConfig] = None) -> str:
+    """Deduplicate the approved requirements and render them as a numbered list."""
+    configuration = Configuration.from_runnable_config(config)
+    global_requirements = require(state.global_requirements, "global requirements")
+    descriptions = [req.description for req in global_requirements.requirements]
+    return numbered(dedupe(descriptions, configuration.requirement_similarity_threshold))
+
+
+def compress_requirements(state: DeveloperState, config: RunnableConfig) -> Dict[str, Any]:
+    """Build the requirements digest once, right after approval."""
+    return {"requirements_digest": requirements_digest(state, config)}
+
+
+def digests(state: DeveloperState, config: Optional[RunnableConfig] = None) -> SpecDigests:
+    """Return the spec digests for the current state, reusing the stored ones when current."""
+    configuration = Configuration.from_runnable_config(config)
+    requirements = state.requirements_digest or (
+        requirements_digest(state, config) if state.global_requirements else ""
+    )
+    return spec_digests(state, requirements, configuration.digest_max_chars)
+
 
+def summarize_specs(state: DeveloperState, config: RunnableConfig) -> Dict[str, Any]:
+    """Build the spec digests once both specs are approved."""
+    summary = digests(state, config)
+    if summary is state.spec_digests:
+        return {}
+    return {"spec_digests": summary}
 
-def front_end_process(state: DeveloperState):
+
+def find_similar_run(state: DeveloperState, config: RunnableConfig) -> Dict[str, Any]:
+    """Look up a past run similar enough to reuse its design."""
+    configuration = Configuration.from_runnable_config(config)
+    if not configuration.reuse_index_path:
+        return {"reuse": None}
+
+    match = ReuseIndex(configuration.reuse_index_path).lookup(
+        state.topic,
+        state.requirements_digest or requirements_digest(state, config),
+        configuration.reuse_similarity_threshold,
+        configuration.reuse_skip_threshold,
+    )
+    return {"reuse": match}
+
+
+def index_run(state: DeveloperState, config: RunnableConfig) -> Dict[str, Any]:
+    """Add the finished run to the reuse index."""
+    configuration = Configuration.from_runnable_config(config)
+    # A design taken as-is from the index is already in it
+    if state.reuse is not None and state.reuse.skipped_stages:
+        return {}
+    if configuration.reuse_index_path:
+        ReuseIndex(configuration.reuse_index_path).add(state)
+    return {}
+
+
+def front_end_process(state: DeveloperState, config: RunnableConfig) -> Dict[str, Any]:
     """Define front-end requirements"""
-    global_requirements = [req.description for req in state.global_requirements.requirements]
+    # Take the design of a near-identical past run as-is
+    reused = reused_artifact(state, "front_end_process")
+    if reused is not None:
+        return {"front_end": reused}
+
+    global_requirements = state.requirements_digest or requirements_digest(state, config)
     topic = state.topic
 
-    structured_llm = llm.with_structured_output(FrontEndDependencies)
+    structured_llm = structured_model(FrontEndDependencies, config)
 
-    system_message = front_end_instructions.format(
-        global_requirements=global_requirements,
-        topic=topic,
-    )
+    with phase(config, "format_prompt"):
+        system_message = front_end_instructions.format(
+            global_requirements=global_requirements,
+            topic=topic,
+        )
+        system_message += reuse_draft(state, "front_end_process")
 
-    requirements = structured_llm.invoke([
-        SystemMessage(content=system_message),
-        HumanMessage(content="Define the front-end requirements using React.js and any other necessary libraries.")
-    ])
+    with phase(config, "invoke_model"):
+        requirements = structured_llm.invoke([
+            SystemMessage(content=system_message),
+            HumanMessage(content="Define the front-end requirements using React.js and any other necessary libraries.")
+        ])
 
     # Update the state
     return {"front_end": requirements}
 
 
-def back_end_process(state: DeveloperState):
+def back_end_process(state: DeveloperState, config: RunnableConfig) -> Dict[str, Any]:
     """Define back-end requirements using Python and FastAPI"""
+    # Take the design of a near-identical past run as-is
+    reused = reused_artifact(state, "back_end_process")
+    if reused is not None:
+        return {"back_end": reused}
+
     # Extract necessary information from the state
+    configuration = Configuration.from_runnable_config(config)
     topic = state.topic
-    global_requirements = [req.description for req in state.global_requirements.requirements]
-    front_end_requirements = state.front_end.requirements.description
-    api_design_and_data_structure = state.front_end.requirements.api_design
+    global_requirements = state.requirements_digest or requirements_digest(state, config)
+    if configuration.parallel_design or state.front_end is None:
+        # The front end is drafted at the same time; reconcile_back_end aligns the two
+        front_end_requirements = api_design_and_data_structure = front_end_pending
+    else:
+        front_end_requirements = state.front_end.requirements.description
+        api_design_and_data_structure = state.front_end.requirements.api_design
 
     # Enforce structured output
-    structured_llm = llm.with_structured_output(BackEndDependencies)
+    structured_llm = structured_model(BackEndDependencies, config)
 
     # Format the prompt with the current state information
-    system_message = back_end_instructions.format(
-        topic=topic,
-        global_requirements=global_requirements,
-        front_end_requirements=front_end_requirements,
-        api_design_and_data_structure=api_design_and_data_structure,
-    )
+    with phase(config, "format_prompt"):
+        system_message = back_end_instructions.format(
+            topic=topic,
+            global_requirements=global_requirements,
+            front_end_requirements=front_end_requirements,
+            api_design_and_data_structure=api_design_and_data_structure,
+        )
+        system_message += reuse_draft(state, "back_end_process")
 
     # Invoke the LLM to generate the back-end requirements
-    back_end_requirements = structured_llm.invoke([
-        SystemMessage(content=system_message),
-        HumanMessage(content="Define the back-end requirements using Python and FastAPI.")
-    ])
+    with phase(config, "invoke_model"):
+        back_end_requirements = structured_llm.invoke([
+            SystemMessage(content=system_message),
+            HumanMessage(content="Define the back-end requirements using Python and FastAPI.")
+        ])
 
     # Update the state with the generated requirements
     return {"back_end": back_end_requirements}
 
 
-def organize_front_end_code(state: DeveloperState):
+def route_design(state: DeveloperState, config: RunnableConfig) -> Union[str, List[str]]:
+    """Start the back-end draft with the front end in parallel mode, after it otherwise."""
+    configuration = Configuration.from_runnable_config(config)
+    if configuration.parallel_design:
+        return ["front_end_process", "back_end_process"]
+    return "front_end_process"
+
+
+def route_after_front_end(state: DeveloperState, config: RunnableConfig) -> Union[str, List[str]]:
+    """Continue with the back end in sequential mode; it is already running in parallel mode."""
+    configuration = Configuration.from_runnable_config(config)
+    if configuration.parallel_design:
+        return []
+    return "back_end_process"
+
+
+def api_differences(
+    expected: List[Tuple[str, str]], missing: List[Tuple[str, str]], fields: List[str]
+) -> str:
+    """List what the back end lacks for the reconcile prompt, one bullet per line."""
+    lines = [f"     - {method.upper()} {path} is not served" for method, path in missing]
+    if fields:
+        lines.append(f"     - The back end never mentions these data fields: {', '.join(fields)}")
+    if not expected:
+        lines.append(
+            "     - The front-end API design names no `METHOD /path` endpoints; "
+            "work out the endpoints it needs from its description"
+        )
+    return "\n".join(lines)
+
+
+def reconcile_back_end(state: DeveloperState, config: RunnableConfig) -> Dict[str, Any]:
+    """Align a back end drafted in parallel with the front end's API design."""
+    configuration = Configuration.from_runnable_config(config)
+    if not configuration.parallel_design:
+        return {}
+
+    front_end = require(state.front_end, "front-end requirements")
+    back_end = require(state.back_end, "back-end requirements")
+    api_design = front_end.requirements.api_design
+    api_endpoints = back_end.requirements.api_endpoints
+    expected = described_endpoints(api_design)
+    missing = missing_endpoints(api_design, api_endpoints)
+    fields = missing_fields(api_design, api_endpoints)
+    # Skip only when the front end's API could be read and all of it is served
+    if expected and not missing and not fields:
+        METRICS.increment("reconcile_back_end", "reconcile_skipped")
+        return {}
+    METRICS.increment("reconcile_back_end", "reconciled")
+
+    structured_llm = structured_model(BackEndRequirements, config)
+
+    with phase(config, "format_prompt"):
+        system_message = back_end_reconcile_instructions.format(
+            topic=state.topic,
+            front_end_requirements=front_end.requirements.description,
+            api_design_and_data_structure=api_design,
+            back_end_requirements=back_end.requirements.description,
+            api_endpoints_and_logic=api_endpoints,
+            differences=api_differences(expected, missing, fields),
+        )
+
+    with phase(config, "invoke_model"):
+        requirements = structured_llm.invoke([
+            SystemMessage(content=system_message),
+            HumanMessage(content="Align the back-end requirements with the front end."),
+        ])
+
+    # The frameworks were chosen for the same features and stay as drafted
+    return {"back_end": back_end.model_copy(update={"requirements": requirements})}
+
+
+def organize_front_end_code(state: DeveloperState, config: RunnableConfig) -> Dict[str, Any]:
     """Organize front-end code based on the requirements."""
+    # Take the design of a near-identical past run as-is
+    reused = reused_artifact(state, "organize_front_end_code")
+    if reused is not None:
+        return {"front_end_organization": reused}
+
     # Extract necessary information from the state
     topic = state.topic
-    front_end_requirements = state.front_end.requirements.description
-    api_design_and_data_structure_front_end = state.front_end.requirements.api_design
-    back_end_requirement_description = state.back_end.requirements.description
-    back_end_requirement_end_points = state.back_end.requirements.api_endpoints
+    summary = digests(state, config)
+    front_end_requirements = summary.front_end
+    api_design_and_data_structure_front_end = summary.front_end_api
+    back_end_requirement_description = summary.back_end
+    back_end_requirement_end_points = summary.back_end_api
 
 
     # Prepare the LLM to generate code organization
-    structured_llm = llm.with_structured_output(CodeOrganization)
-
-    system_message = front_end_organization_instructions.format(
-        topic=topic,
-        front_end_requirements=front_end_requirements,
-        api_design_and_data_structure_front_end=api_design_and_data_structure_front_end,
-        back_end_requirements=back_end_requirement_description,
-        back_end_api_endpoints_and_logic=back_end_requirement_end_points,
-    )
+    structured_llm = structured_model(CodeOrganization, config)
+
+    with phase(config, "format_prompt"):
+        system_message = front_end_organization_instructions.format(
+            topic=topic,
+            front_end_requirements=front_end_requirements,
+            api_design_and_data_structure_front_end=api_design_and_data_structure_front_end,
+            back_end_requirements=back_end_requirement_description,
+            back_end_api_endpoints_and_logic=back_end_requirement_end_points,
+        )
+        system_message += reuse_draft(state, "organize_front_end_code")
 
     # Invoke the LLM to generate code organization
-    organized_code = structured_llm.invoke([
-        SystemMessage(content=system_message),
-        HumanMessage(content="Process the front-end requirements.")
-    ])
+    with phase(config, "invoke_model"):
+        organized_code = structured_llm.invoke([
+            SystemMessage(content=system_message),
+            HumanMessage(content="Process the front-end requirements.")
+        ])
 
     # Return the organized code
     return {"front_end_organization": organized_code}
 
 
-def organize_back_end_code(state: DeveloperState):
+def organize_back_end_code(state: DeveloperState, config: RunnableConfig) -> Dict[str, Any]:
     """Organize back-end code based on the requirements."""
+    # Take the design of a near-identical past run as-is
+    reused = reused_artifact(state, "organize_back_end_code")
+    if reused is not None:
+        return {"back_end_organization": reused}
+
     # Extract necessary information from the state
     topic = state.topic
-    back_end_requirements = state.back_end.requirements.description
-    back_end_api_endpoints_and_logic = state.back_end.requirements.api_endpoints
-    front_end_requirements = state.front_end.requirements.description
-    api_design_and_data_structure_front_end = state.front_end.requirements.api_design
+    summary = digests(state, config)
+    back_end_requirements = summary.back_end
+    back_end_api_endpoints_and_logic = summary.back_end_api
+    front_end_requirements = summary.front_end
+    api_design_and_data_structure_front_end = summary.front_end_api
 
     # Locate the endpoint file dynamically
     front_end_endpoint_file = None
-    for folder in state.front_end_organization.folders:
+    for folder in require(state.front_end_organization, "front-end organization").folders:
         if folder.endpoint_file:
             front_end_endpoint_file = folder.endpoint_file
             break
@@ -187,34 +525,37 @@ def organize_back_end_code(state: DeveloperState):
         raise ValueError("No endpoint file found in front-end organization.")
 
     # Prepare the LLM to generate code organization
-    structured_llm = llm.with_structured_output(CodeOrganization)
+    structured_llm = structured_model(CodeOrganization, config)
 
     # Prepare the system message using back-end instructions
-    system_message = back_end_organization_instructions.format(
-        topic=topic,
-        front_end_requirements=front_end_requirements,
-        api_design_and_data_structure_front_end=api_design_and_data_structure_front_end,
-        back_end_requirements=back_end_requirements,
-        api_endpoints_and_logic=back_end_api_endpoints_and_logic,
-        front_end_endpoint_file=front_end_endpoint_file,  # Use description or relevant info
-    )
+    with phase(config, "format_prompt"):
+        system_message = back_end_organization_instructions.format(
+            topic=topic,
+            front_end_requirements=front_end_requirements,
+            api_design_and_data_structure_front_end=api_design_and_data_structure_front_end,
+            back_end_requirements=back_end_requirements,
+            api_endpoints_and_logic=back_end_api_endpoints_and_logic,
+            front_end_endpoint_file=front_end_endpoint_file,  # Use description or relevant info
+        )
+        system_message += reuse_draft(state, "organize_back_end_code")
 
     # Invoke the LLM to generate the organized back-end code
-    organized_code = structured_llm.invoke([
-        SystemMessage(content=system_message),
-        HumanMessage(content="Organize the back-end code."),
-    ])
+    with phase(config, "invoke_model"):
+        organized_code = structured_llm.invoke([
+            SystemMessage(content=system_message),
+            HumanMessage(content="Organize the back-end code."),
+        ])
 
     return {"back_end_organization": organized_code}
 
-def generate_front_end_code(state: DeveloperState):
+def generate_front_end_code(state: DeveloperState, config: RunnableConfig) -> Dict[str, Any]:
     """Generate front-end code based on the code organization."""
     topic = state.topic
-    front_end_organization = state.front_end_organization
+    front_end_organization = require(state.front_end_organization, "front-end organization")
     back_end_endpoint_file = None
 
     # Find the back-end endpoint file
-    for folder in state.back_end_organization.folders:
+    for folder in require(state.back_end_organization, "back-end organization").folders:
         if folder.endpoint_file:
             back_end_endpoint_file = folder.endpoint_file
             break
@@ -222,33 +563,43 @@ def generate_front_end_code(state: DeveloperState):
     if not back_end_endpoint_file:
         raise ValueError("No endpoint file found in back-end organization.")
 
-    # Prepare the LLM to generate code
-    structured_llm = llm.with_structured_output(CodeOrganization)
+    # Ask only for the code; the organization is merged in locally
+    structured_llm = structured_model(GeneratedCode, config)
     # Prepare the system message
-    system_message = front_end_generation_instructions.format(
-        topic=topic,
-        front_end_organization=front_end_organization.folders,
-        back_end_endpoint_file=back_end_endpoint_file# Use description or relevant content
-    )
+    with phase(config, "format_prompt"):
+        system_message = front_end_generation_instructions.format(
+            topic=topic,
+            front_end_organization=front_end_organization.folders,
+            back_end_endpoint_file=back_end_endpoint_file# Use description or relevant content
+        )
 
     # Invoke the LLM to generate the code
-    code_generation = structured_llm.invoke([
-        SystemMessage(content=system_message),
-        HumanMessage(content="Please generate the front-end code."),
-    ])
+    with phase(config, "invoke_model"):
+        code_generation = structured_llm.invoke([
+            SystemMessage(content=system_message),
+            HumanMessage(content="Please generate the front-end code."),
+        ])
+
+    # Fill the generated code into the organization and report mismatches
+    organization = front_end_organization
+    all_files = {key for key, _, _ in iter_files(organization)}
+    generated_code, _ = merge(organization, code_generation.files, all_files)
+    report = coverage(organization, code_generation.files)
+    METRICS.increment("generate_front_end_code", "missing_files", len(report.missing_files))
+    METRICS.increment("generate_front_end_code", "extra_files", len(report.extra_files))
 
     # Update the state with the generated code
-    return {"generate_frontend_code": code_generation}
+    return {"generate_frontend_code": generated_code, "front_end_generation_report": report}
 
 
-def generate_back_end_code(state: DeveloperState):
+def generate_back_end_code(state: DeveloperState, config: RunnableConfig) -> Dict[str, Any]:
     """Generate back-end code based on the code organization."""
     topic = state.topic
-    back_end_organization = state.back_end_organization
+    back_end_organization = require(state.back_end_organization, "back-end organization")
     front_end_endpoint_file = None
 
     # Find the front-end endpoint file
-    for folder in state.front_end_organization.folders:
+    for folder in require(state.front_end_organization, "front-end organization").folders:
         if folder.endpoint_file:
             front_end_endpoint_file = folder.endpoint_file
             break
@@ -256,40 +607,227 @@ def generate_back_end_code(state: DeveloperState):
     if not front_end_endpoint_file:
         raise ValueError("No endpoint file found in front-end organization.")
 
-    # Prepare the LLM to generate code
-    structured_llm = llm.with_structured_output(CodeOrganization)
+    # Ask only for the code; the organization is merged in locally
+    structured_llm = structured_model(GeneratedCode, config)
 
     # Prepare the system message
-    system_message = back_end_generation_instructions.format(
-        topic=topic,
-        back_end_organization=back_end_organization.folders,
-        front_end_endpoint_file=front_end_endpoint_file # Use description or relevant content
-    )
+    with phase(config, "format_prompt"):
+        system_message = back_end_generation_instructions.format(
+            topic=topic,
+            back_end_organization=back_end_organization.folders,
+            front_end_endpoint_file=front_end_endpoint_file # Use description or relevant content
+        )
 
     # Invoke the LLM to generate the code
-    code_generation = structured_llm.invoke([
-        SystemMessage(content=system_message),
-        HumanMessage(content="Please generate the back-end code."),
-    ])
+    with phase(config, "invoke_model"):
+        code_generation = structured_llm.invoke([
+            SystemMessage(content=system_message),
+            HumanMessage(content="Please generate the back-end code."),
+        ])
+
+    # Fill the generated code into the organization and report mismatches
+    organization = back_end_organization
+    all_files = {key for key, _, _ in iter_files(organization)}
+    generated_code, _ = merge(organization, code_generation.files, all_files)
+    report = coverage(organization, code_generation.files)
+    METRICS.increment("generate_back_end_code", "missing_files", len(report.missing_files))
+    METRICS.increment("generate_back_end_code", "extra_files", len(report.extra_files))
 
     # Update the state with the generated code
-    return {"generate_backend_code": code_generation}
-
+    return {"generate_backend_code": generated_code, "back_end_generation_report": report}
+
+
+
+
+def required_software(state: DeveloperState, config: RunnableConfig) -> Dict[str, Any]:
+    """Build the setup instructions and dependency files from the framework lists."""
+    configuration = Configuration.from_runnable_config(config)
+    front_end_frameworks = state.front_end.frameworks if state.front_end else []
+    back_end_frameworks = state.back_end.frameworks if state.back_end else []
+
+    # Resolve the frameworks locally first
+    table = load_packages(configuration.package_metadata_path)
+    front_end_packages, front_end_unknown = resolve(front_end_frameworks, NPM, table)
+    back_end_packages, back_end_unknown = resolve(back_end_frameworks, PYPI, table)
+    METRICS.increment("required_software", "unknown_packages", len(front_end_unknown) + len(back_end_unknown))
+
+    # Ask the model only about the frameworks the table does not know
+    if front_end_unknown or back_end_unknown:
+        structured_llm = structured_model(PackageResolution, config)
+        with phase(config, "format_prompt"):
+            system_message = package_resolution_instructions.format(
+                front_end_frameworks="\n".join(f"- {f.name}: {f.description}" for f in front_end_unknown) or "None",
+                back_end_frameworks="\n".join(f"- {f.name}: {f.description}" for f in back_end_unknown) or "None",
+            )
+        with phase(config, "invoke_model"):
+            resolution = structured_llm.invoke([
+                SystemMessage(content=system_message),
+                HumanMessage(content="Please resolve the packages."),
+            ])
+
+        resolved = learned(resolution.packages)
+        if configuration.package_metadata_path and resolved:
+            save_packages(configuration.package_metadata_path, resolved)
+        table = {**table, **resolved}
+        more_front_end, front_end_unknown = resolve(front_end_unknown, NPM, table)
+        more_back_end, back_end_unknown = resolve(back_end_unknown, PYPI, table)
+        front_end_packages += more_front_end
+        back_end_packages += more_back_end
+
+    setup_instructions = project_setup(
+        front_end_packages,
+        back_end_packages,
+        state.front_end_organization,
+        state.back_end_organization,
+        unresolved={NPM: front_end_unknown, PYPI: back_end_unknown},
+    )
+    return {
+        "project_setup_instructions": setup_instructions,
+        "dependency_files": dependency_files(state.topic, front_end_packages, back_end_packages),
+    }
+
+
+def check_contract(state: DeveloperState, config: RunnableConfig) -> Dict[str, Any]:
+    """Compare the generated front-end API calls with the back-end routes."""
+    if not state.generate_frontend_code or not state.generate_backend_code:
+        return {"contract_report": []}
+    report = check(state.generate_frontend_code, state.generate_backend_code)
+    METRICS.increment("check_contract", "contract_mismatches", len(report))
+    return {"contract_report": report}
+
+
+def route_contract(state: DeveloperState, config: RunnableConfig) -> str:
+    """Fix the contract only when the check found mismatches."""
+    configuration = Configuration.from_runnable_config(config)
+    if state.contract_report and configuration.fix_contract_mismatches:
+        return "fix_contract"
+    return "done"
+
+
+def fix_contract(state: DeveloperState, config: RunnableConfig) -> Dict[str, Any]:
+    """Rewrite only the files named in the contract report."""
+    front_end_code = require(state.generate_frontend_code, "generated front-end code")
+    back_end_code = require(state.generate_backend_code, "generated back-end code")
+    mismatches = state.contract_report or []
+    to_fix = {mismatch.file for mismatch in mismatches}
+    sides = [
+        (organization, {key for key, _, _ in iter_files(organization) if f"{key[0]}/{key[1]}" in to_fix})
+        for organization in (front_end_code, back_end_code)
+    ]
+
+    structured_llm = structured_model(GeneratedCode, config)
+
+    with phase(config, "format_prompt"):
+        system_message = contract_fix_instructions.format(
+            topic=state.topic,
+            mismatches=numbered(mismatch.detail for mismatch in mismatches),
+            files_to_fix="\n".join(
+                f"Folder `{key[0]}`: {file.model_dump_json(indent=1)}"
+                for organization, files in sides
+                for key, file, _ in iter_files(organization)
+                if key in files
+            ),
+            endpoint_files="\n".join(
+                file.model_dump_json(indent=1)
+                for organization, _ in sides
+                for key, file, is_endpoint in iter_files(organization)
+                if is_endpoint
+            ),
+        )
+
+    with phase(config, "invoke_model"):
+        generated = structured_llm.invoke([
+            SystemMessage(content=system_message),
+            HumanMessage(content="Please fix the listed files."),
+        ])
+
+    # Files the report does not name keep their code byte-for-byte
+    front_end_code, front_end_keys = merge(front_end_code, generated.files, sides[0][1])
+    back_end_code, back_end_keys = merge(back_end_code, generated.files, sides[1][1])
+    report = check(front_end_code, back_end_code)
+    METRICS.increment("fix_contract", "contract_mismatches_left", len(report))
+    return {
+        "generate_frontend_code": front_end_code,
+        "generate_backend_code": back_end_code,
+        "contract_report": report,
+        "contract_fixed_files": [f"{folder}/{name}" for folder, name in front_end_keys + back_end_keys],
+    }
+
+
+def regenerate_code(state: DeveloperState, config: RunnableConfig) -> Dict[str, Any]:
+    """Regenerate only the generated files touched by the changed requirements."""
+    configuration = Configuration.from_runnable_config(config)
+    previous: List[Requirement] = []
+    if state.global_requirements is not None:
+        previous = state.global_requirements.requirements
+    if state.revised_requirements is not None:
+        # Diff the new list against the requirements the code was generated from
+        changes = changed_requirements(
+            [req.description for req in previous],
+            state.revised_requirements,
+            configuration.requirement_similarity_threshold,
+        )
+    else:
+        changes = state.changed_requirements or []
+    front_end_code = require(state.generate_frontend_code, "generated front-end code")
+    back_end_code = require(state.generate_backend_code, "generated back-end code")
 
+    # Work out which files the changes reach, including the API contract
+    front_end_files, back_end_files = plan(
+        front_end_code, back_end_code, changes, configuration.regeneration_min_overlap
+    )
 
+    updates: Dict[str, Any] = {}
+    regenerated_files = []
+    for side, organization, files, other, field in (
+        ("front-end", front_end_code, front_end_files, back_end_code, "generate_frontend_code"),
+        ("back-end", back_end_code, back_end_files, front_end_code, "generate_backend_code"),
+    ):
+        if not files:
+            continue
+
+        structured_llm = structured_model(GeneratedCode, config)
+
+        with phase(config, "format_prompt"):
+            other_endpoints = endpoint_keys(other)
+            system_message = code_regeneration_instructions.format(
+                side=side,
+                topic=state.topic,
+                changed_requirements=numbered(changes),
+                files_to_update="\n".join(
+                    f"Folder `{key[0]}`: {file.model_dump_json(indent=1)}"
+                    for key, file, _ in iter_files(organization)
+                    if key in files
+                ),
+                other_endpoint_file="\n".join(
+                    file.model_dump_json(indent=1)
+                    for key, file, _ in iter_files(other)
+                    if key in other_endpoints
+                ),
+            )
+
+        with phase(config, "invoke_model"):
+            generated = structured_llm.invoke([
+                SystemMessage(content=system_message),
+                HumanMessage(content=f"Please update the {side} files."),
+            ])
+
+        # Untouched files keep their previous code byte-for-byte
+        updates[field], keys = merge(organization, generated.files, files)
+        regenerated_files += [f"{folder}/{name}" for folder, name in keys]
+
+    # Both inputs are used up, so the next edit on a persisted thread starts
+    # from the revised requirements instead of repeating this one
+    updates.update(changed_requirements=None, revised_requirements=None)
+    if state.revised_requirements is not None:
+        kept = {req.description: req for req in previous}
+        updates["global_requirements"] = FunctionalRequirements(
+            requirements=[
+                kept.get(description)
+                or Requirement(description=description, suggestions="", presumptions="", questions=[])
+                for description in state.revised_requirements
+            ]
+        )
+        updates["requirements_digest"] = None
+    return {**updates, "regenerated_files": regenerated_files}
 
-def required_software(state: DeveloperState):
-    """Check for required software"""
-    back_end_organization = state.back_end_organization
-    front_end_organization = state.front_end_organization
-    
-    structured_llm = llm.with_structured_output(ProjectSetup)
-    system_message = project_setup_instructions.format(
-        front_end_organization=front_end_organization,
-        back_end_organization=back_end_organization # Use description or relevant content
-    )
-    setup_instructions = structured_llm.invoke([
-        SystemMessage(content=system_message),
-        HumanMessage(content="Please check for required software."),
-    ])
-    return    {"project_setup_instructions": setup_instructions}
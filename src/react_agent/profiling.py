@@ -0,0 +1,198 @@
+"""Timed spans for graph runs, exported in Chrome trace format.
+
+Attach a `Tracer` as a callback when invoking the graph. It records one span
+per node, per chat-model round trip and per output parser, plus the gap
+between consecutive nodes (LangGraph scheduling and `DeveloperState`
+validation). Nodes add finer-grained spans with `phase`. The exported file
+opens in chrome://tracing, Perfetto or speedscope as a flame graph.
+
+Run `python -m react_agent.profiling` (or `make profile`) to trace the whole
+graph against the offline stub model.
+"""
+
+import argparse
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler, BaseCallbackManager
+from langchain_core.runnables import RunnableConfig
+
+from react_agent.schemas import DeveloperState
+
+
+class Tracer(BaseCallbackHandler):
+    """Callback handler that collects timed spans for a graph run."""
+
+    run_inline = True
+
+    def __init__(self) -> None:
+        """Start an empty trace; timestamps are relative to its creation."""
+        self.spans: List[Dict[str, Any]] = []
+        self._origin = time.perf_counter()
+        self._open: Dict[UUID, Tuple[str, str, float, int]] = {}
+        self._last_node_end: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def record_span(
+        self, name: str, category: str, start: float, end: float, **args: Any
+    ) -> None:
+        """Record a completed span; `start` and `end` come from `time.perf_counter`."""
+        span = {
+            "name": name,
+            "cat": category,
+            "ph": "X",
+            "ts": (start - self._origin) * 1e6,
+            "dur": (end - start) * 1e6,
+            "pid": os.getpid(),
+            "tid": args.pop("tid", threading.get_ident()),
+            "args": args,
+        }
+        with self._lock:
+            self.spans.append(span)
+
+    def _start(self, run_id: UUID, name: str, category: str) -> None:
+        now = time.perf_counter()
+        if category == "node" and self._last_node_end is not None:
+            self.record_span("scheduling", "scheduling", self._last_node_end, now)
+        self._open[run_id] = (name, category, now, threading.get_ident())
+
+    def _end(self, run_id: UUID, error: Optional[BaseException] = None) -> None:
+        opened = self._open.pop(run_id, None)
+        if opened is None:
+            return
+        name, category, start, tid = opened
+        now = time.perf_counter()
+        args: Dict[str, Any] = {"tid": tid}
+        if error is not None:
+            args["error"] = repr(error)
+        self.record_span(name, category, start, now, **args)
+        if category == "node":
+            self._last_node_end = now
+
+    def on_chain_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        inputs: Any,
+        *,
+        run_id: UUID,
+        metadata: Optional[Dict[str, Any]] = None,
+        **kwargs: Any,
+    ) -> None:
+        """Open a span for graph nodes and output parsers."""
+        name = kwargs.get("name") or ""
+        if name and name == (metadata or {}).get("langgraph_node"):
+            self._start(run_id, name, "node")
+        elif name.endswith("Parser"):
+            self._start(run_id, name, "parse")
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        """Close the span opened for this run, if any."""
+        self._end(run_id)
+
+    def on_chain_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        """Close the span opened for this run and keep the error."""
+        self._end(run_id, error)
+
+    def on_chat_model_start(
+        self,
+        serialized: Optional[Dict[str, Any]],
+        messages: Any,
+        *,
+        run_id: UUID,
+        **kwargs: Any,
+    ) -> None:
+        """Open a span covering the model round trip."""
+        metadata = kwargs.get("metadata") or {}
+        name = kwargs.get("name") or metadata.get("ls_model_name") or "chat_model"
+        self._start(run_id, name, "llm")
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        """Close the model round-trip span."""
+        self._end(run_id)
+
+    def on_llm_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        """Close the model round-trip span and keep the error."""
+        self._end(run_id, error)
+
+    def summary(self) -> Dict[str, float]:
+        """Return total seconds spent per span name."""
+        totals: Dict[str, float] = {}
+        for span in self.spans:
+            totals[span["name"]] = totals.get(span["name"], 0.0) + span["dur"] / 1e6
+        return totals
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """Return the spans as a Chrome trace event document."""
+        return {"traceEvents": list(self.spans), "displayTimeUnit": "ms"}
+
+    def export(self, path: str) -> None:
+        """Write the trace to `path` as Chrome trace JSON."""
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f)
+
+
+def find_tracer(config: Optional[RunnableConfig]) -> Optional[Any]:
+    """Return the tracer attached to `config`'s callbacks, if any.
+
+    Handlers are matched by their `record_span` method rather than by class so
+    that a tracer created under `python -m` is still found.
+    """
+    callbacks = (config or {}).get("callbacks")
+    handlers: List[Any] = (
+        callbacks.handlers
+        if isinstance(callbacks, BaseCallbackManager)
+        else list(callbacks or [])
+    )
+    for handler in handlers:
+        if hasattr(handler, "record_span"):
+            return handler
+    return None
+
+
+@contextmanager
+def phase(config: Optional[RunnableConfig], name: str) -> Iterator[None]:
+    """Record a span for a phase inside a node; a no-op when not tracing."""
+    tracer = find_tracer(config)
+    if tracer is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        tracer.record_span(name, "phase", start, time.perf_counter())
+
+
+def main() -> None:
+    """Trace a full graph run against the stub model and write the trace."""
+    from react_agent import graph
+
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--topic", default="Todo app with tags")
+    parser.add_argument("--model", default="stub/default")
+    parser.add_argument("--output", default="trace.json")
+    args = parser.parse_args()
+
+    tracer = Tracer()
+    config: RunnableConfig = {
+        "callbacks": [tracer],
+        "configurable": {"model": args.model},
+    }
+    graph.invoke(DeveloperState(topic=args.topic, human_feedback="approve"), config)
+    tracer.export(args.output)
+    for name, seconds in sorted(tracer.summary().items(), key=lambda kv: -kv[1]):
+        print(f"{name:40s} {seconds * 1000:10.2f} ms")  # noqa: T201
+    print(f"Trace written to {args.output}")  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -28,7 +28,8 @@ Follow these steps carefully:
 
 1. **Review the app idea and global requirements**:
    - **App Idea**: {topic}
-   - **Global Requirements**: {global_requirements}
+   - **Global Requirements**:
+{global_requirements}
 
 2. **Define the Front-End Requirements**:
    - Provide a detailed description of the front-end requirements necessary to implement the application's functionalities.
@@ -55,7 +56,8 @@ Please follow these steps:
 
 1. **Review the app idea, global requirements, and front-end requirements**:
    - **App Idea**: {topic}
-   - **Global Requirements**: {global_requirements}
+   - **Global Requirements**:
+{global_requirements}
 
    - **Front-End Requirements descpription **: {front_end_requirements}
    - **API Design and Data Structure from Front End**: {api_design_and_data_structure}
@@ -82,6 +84,29 @@ Please follow these steps:
 After presenting the back-end requirements, be prepared to refine them based on any further feedback.
 """
 
+front_end_pending = "Being defined in parallel. Design the API from the app idea and the global requirements."
+
+back_end_reconcile_instructions = """
+You are a back-end developer aligning the back-end design of the application (**Python and FastAPI**) with the front end, which was designed at the same time.
+
+Please follow these steps:
+
+1. **Review the app idea and the front-end requirements**:
+   - **App Idea**: {topic}
+   - **Front-End Requirements Description**: {front_end_requirements}
+   - **Front-End API Design and Data Structure**: {api_design_and_data_structure}
+
+2. **Review the current back-end requirements**:
+   - **Description**: {back_end_requirements}
+   - **API Endpoints and Logic**: {api_endpoints_and_logic}
+
+3. **Align the API**:
+   - The front end's API design differs from the back end here:
+{differences}
+   - Add or rename back-end endpoints so that every endpoint the front end expects is served with the same method, path and data fields.
+   - Keep everything else in the back-end requirements unchanged.
+"""
+
 front_end_organization_instructions = """
 You are a front-end developer tasked with organizing the code structure for the application using **React**.
 
@@ -209,8 +234,9 @@ Please follow these steps:
 
 4. **Provide the Code**:
    - For each file in the code organization, generate the code as per the specifications.
-   - Provide the output as a JSON array of objects.
-   - Also remember the will be one file which would the end point logic do not forget to include the full code for it, you will be able to provide it under endpoint_file key in the JSON object.
+   - Return one entry per file with its folder name, file name and full code, using the names exactly as given in the code organization.
+   - Include the endpoint file of the code organization as well; do not forget its full code.
+   - Do not repeat file descriptions or methods, and do not add files that are not in the code organization.
 
 
 
@@ -237,56 +263,77 @@ Please follow these steps:
    
 4. **Provide the Code**:
    - For each file in the code organization, generate the code as per the specifications.
-   - Provide the output as a JSON array of objects.
-   - Also remember the will be one file which would the end point logic do not forget to include the full code for it, you will be able to provide it under endpoint_file key in the JSON object.
+   - Return one entry per file with its folder name, file name and full code, using the names exactly as given in the code organization.
+   - Include the endpoint file of the code organization as well; do not forget its full code.
+   - Do not repeat file descriptions or methods, and do not add files that are not in the code organization.
+
+"""
+
+code_regeneration_instructions = """
+You are a {side} developer updating an existing application after some of its requirements changed.
 
+Please follow these steps:
+
+1. **Review the app idea and the changed requirements**:
+   - **App Idea**: {topic}
+   - **Changed Requirements**:
+{changed_requirements}
+
+2. **Review the files to update**, with their current code:
+{files_to_update}
+
+3. **Keep the API contract aligned** with the other side's endpoint file:
+{other_endpoint_file}
+
+4. **Provide the Code**:
+   - Return the full updated code for each file listed above, and only those files.
+   - Keep each file's folder name and file name exactly as given.
+   - Change only what the changed requirements call for; keep existing behavior, names and signatures otherwise.
 """
 
-project_setup_instructions = """
-You are a system design engineer tasked with setting up the project structure and environment for a small application.
+contract_fix_instructions = """
+You are a full-stack developer fixing mismatches between the front end (**React**) and the back end (**Python and FastAPI**) of an application.
 
-Please follow these steps carefully:
+Please follow these steps:
 
-1. **Review the Project Structure**:
-   - The project consists of two main directories:
-     - **Front End**: Contains the React application.
-     - **Back End**: Contains the Python FastAPI application.
+1. **Review the app idea and the mismatches found by the API contract check**:
+   - **App Idea**: {topic}
+   - **Mismatches**:
+{mismatches}
 
-2. **Front-End Organization**:
-{front_end_organization}
+2. **Review the files to fix**, with their current code:
+{files_to_fix}
 
-3. **Back-End Organization**:
-{back_end_organization}
+3. **Use the endpoint files as the reference for the API contract**:
+{endpoint_files}
 
-4. **Setup Instructions**:
+4. **Provide the Code**:
+   - Return the full updated code for each file listed in step 2, and only those files.
+   - Keep each file's folder name and file name exactly as given.
+   - Front-end calls must use the back end's paths, methods and payload fields; add a back-end route only where one is missing.
+   - Change only what the mismatches call for; keep everything else unchanged.
+"""
 
-   **Front End**:
-   - Navigate to the `front_end` directory (create it if it doesn't exist).
-   - Install the required frameworks and dependencies. Include commands for installing each dependency.
-   - Provide instructions on how to run the front-end application, specifying the entry point file.
+reuse_draft_instructions = """
 
-   **Back End**:
-   - Navigate to the `back_end` directory (create it if it doesn't exist).
-   - Explain how to set up the virtual environment for Python.
-   - use poetry to install the required dependencies.
-   - Install the required frameworks and dependencies. Include commands for installing each dependency.
-   - make sure to go step by step since the software will be using visual studio code and need to put the interpreter in the right place.
-   - Provide instructions on how to run the back-end application, specifying the entry point file.
+**Starting Draft**:
+A previous project with a very similar app idea produced the draft below. Start from it and revise only what the app idea and requirements above call for; keep everything else unchanged.
+{draft}
+"""
 
-5. **Assumptions and Environment Setup**:
-   - Assume the user npm installed for the front end.
-   - Assume the user has Python 3.7+ installed for the back end.
-   - Mention any environment variables or configurations that need to be set.
+package_resolution_instructions = """
+You are a system design engineer preparing the dependency files of a small application with a **React** front end (npm) and a **Python FastAPI** back end (pypi).
 
-6. **Provide the Instructions in a Clear and Organized Manner**:
-   - Use bullet points or numbered lists where appropriate.
-   - Ensure that the instructions are easy to follow for someone with basic knowledge of software development.
+The following frameworks are not in our package table:
 
-**Example**:
+**Front End (npm)**:
+{front_end_frameworks}
 
-**Front End Setup**:
+**Back End (pypi)**:
+{back_end_frameworks}
 
-- **Install Dependencies**:
-  ```bash
-  npm install
+For each framework, return the package that installs it:
+   - Keep the framework name exactly as given and set the ecosystem listed above.
+   - Use the exact package name from the npm or PyPI registry and a version specifier for a current stable release.
+   - Leave the package empty when the framework is part of the language, the browser, React or FastAPI and needs no install.
 """
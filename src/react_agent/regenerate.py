@@ -0,0 +1,189 @@
+"""Targeted regeneration of previously generated code.
+
+When requirements change after code generation, only the files they touch
+need rewriting. A file is affected when its name, description or methods
+share enough keywords with a changed requirement. Files linked to an
+affected file by a method call, in either direction, are affected too, and
+so are both endpoint files once either side of the API contract changes. Every other file is kept
+byte-for-byte.
+"""
+
+import re
+from typing import Dict, Iterable, Iterator, List, Set, Tuple
+
+from react_agent.compress import normalize, similarity
+from react_agent.schemas import CodeGeneration, CodeOrganization, File
+
+FileKey = Tuple[str, str]
+
+_STOPWORDS = {
+    "able",
+    "about",
+    "after",
+    "also",
+    "been",
+    "before",
+    "being",
+    "both",
+    "data",
+    "each",
+    "from",
+    "have",
+    "into",
+    "more",
+    "must",
+    "only",
+    "other",
+    "should",
+    "such",
+    "than",
+    "that",
+    "their",
+    "them",
+    "then",
+    "there",
+    "these",
+    "they",
+    "this",
+    "user",
+    "users",
+    "when",
+    "which",
+    "will",
+    "with",
+    "within",
+    "would",
+}
+
+
+def keywords(text: str) -> Set[str]:
+    """Return the significant words of `text` (three letters or more, no stopwords).
+
+    camelCase and snake_case identifiers are split, and plural words are
+    reduced to their singular, so `fetchTags` and "tag" share `tag`.
+    """
+    text = re.sub(r"([a-z0-9])([A-Z])", r"\1 \2", text).replace("_", " ")
+    words = set()
+    for word in normalize(text).split():
+        if word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        if len(word) >= 3 and word not in _STOPWORDS:
+            words.add(word)
+    return words
+
+
+def changed_requirements(
+    old: List[str], new: List[str], threshold: float = 0.7
+) -> List[str]:
+    """Return requirements added or removed between `old` and `new`.
+
+    Entries whose wording changed only slightly (similarity at or above
+    `threshold`) are treated as unchanged.
+    """
+    added = [
+        req for req in new if all(similarity(req, other) < threshold for other in old)
+    ]
+    removed = [
+        req for req in old if all(similarity(req, other) < threshold for other in new)
+    ]
+    return added + removed
+
+
+def iter_files(organization: CodeOrganization) -> Iterator[Tuple[FileKey, File, bool]]:
+    """Yield `((folder, name), file, is_endpoint)` for every file, endpoint files included."""
+    for folder in organization.folders:
+        for file in folder.files:
+            yield (folder.name, file.name), file, False
+        if folder.endpoint_file:
+            yield (folder.name, folder.endpoint_file.name), folder.endpoint_file, True
+
+
+def file_terms(file: File) -> Set[str]:
+    """Return the keywords of a file's name, description and method signatures."""
+    parts = [file.name, file.description]
+    for method in file.methods:
+        parts += [method.name, method.signature, method.description]
+    return keywords(" ".join(parts))
+
+
+def _calls(code: str, names: Iterable[str]) -> bool:
+    return any(re.search(rf"\b{re.escape(name)}\b", code) for name in names if name)
+
+
+def affected_files(
+    organization: CodeOrganization, changes: List[str], min_overlap: int = 2
+) -> Set[FileKey]:
+    """Return the files of `organization` that the changed requirements touch.
+
+    A file matches when it shares at least `min_overlap` keywords with a
+    changed requirement. Files whose code calls a method of a matched file,
+    and files whose methods a matched file calls, are added as well since
+    their signatures may have to change together.
+    """
+    change_terms = [keywords(change) for change in changes]
+    files = list(iter_files(organization))
+    affected = {
+        key
+        for key, file, _ in files
+        if any(len(file_terms(file) & terms) >= min_overlap for terms in change_terms)
+    }
+    matched = [file for key, file, _ in files if key in affected]
+    matched_methods = {method.name for file in matched for method in file.methods}
+    for key, file, _ in files:
+        if key in affected:
+            continue
+        calls_matched = _calls(file.code or "", matched_methods)
+        called_by_matched = any(
+            file_.code and _calls(file_.code, [method.name for method in file.methods])
+            for file_ in matched
+        )
+        if calls_matched or called_by_matched:
+            affected.add(key)
+    return affected
+
+
+def endpoint_keys(organization: CodeOrganization) -> Set[FileKey]:
+    """Return the keys of the organization's endpoint files."""
+    return {key for key, _, is_endpoint in iter_files(organization) if is_endpoint}
+
+
+def plan(
+    front_end: CodeOrganization,
+    back_end: CodeOrganization,
+    changes: List[str],
+    min_overlap: int = 2,
+) -> Tuple[Set[FileKey], Set[FileKey]]:
+    """Return the front-end and back-end files to regenerate for `changes`.
+
+    When an endpoint file changes on either side, both endpoint files are
+    regenerated so the API contract stays aligned.
+    """
+    front = affected_files(front_end, changes, min_overlap)
+    back = affected_files(back_end, changes, min_overlap)
+    front_endpoints, back_endpoints = endpoint_keys(front_end), endpoint_keys(back_end)
+    if front & front_endpoints or back & back_endpoints:
+        front |= front_endpoints
+        back |= back_endpoints
+    return front, back
+
+
+def merge(
+    organization: CodeOrganization,
+    generated: List[CodeGeneration],
+    allowed: Set[FileKey],
+) -> Tuple[CodeOrganization, List[FileKey]]:
+    """Return a copy of `organization` with regenerated code for `allowed` files.
+
+    Generated entries outside `allowed` are ignored, so untouched files keep
+    their previous code exactly.
+    """
+    code: Dict[FileKey, str] = {
+        (entry.folder_name, entry.file_name): entry.code
+        for entry in generated
+        if (entry.folder_name, entry.file_name) in allowed
+    }
+    merged = organization.model_copy(deep=True)
+    for key, file, _ in iter_files(merged):
+        if key in code:
+            file.code = code[key]
+    return merged, sorted(code)
@@ -0,0 +1,130 @@
+"""Local similarity index over past runs.
+
+Each completed run appends its topic, requirements digest and design artifacts
+to a JSON-lines file. A new run whose topic and approved requirements are close
+enough to a stored one gets those artifacts back as a `ReuseMatch`, which the
+design stages revise (or, above the skip threshold, take as-is).
+
+Runners on the same host share the file: writers append under an exclusive
+lock and readers take a shared one, and lines that do not parse (say, left
+half-written by a killed process) are logged and skipped.
+"""
+
+import fcntl
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional, Tuple
+
+from react_agent.compress import similarity
+from react_agent.schemas import DeveloperState, ReuseMatch
+
+logger = logging.getLogger(__name__)
+
+# Design stages that can start from a stored artifact, and the state field each fills.
+REUSABLE_STAGES = {
+    "front_end_process": "front_end",
+    "back_end_process": "back_end",
+    "organize_front_end_code": "front_end_organization",
+    "organize_back_end_code": "back_end_organization",
+}
+
+
+def run_similarity(topic: str, digest: str, entry: Dict[str, Any]) -> float:
+    """Score a stored run against a topic and requirements digest, in [0, 1]."""
+    return (
+        similarity(topic, entry["topic"]) + similarity(digest, entry["requirements"])
+    ) / 2
+
+
+class ReuseIndex:
+    """Append-only JSON-lines index of completed runs."""
+
+    def __init__(self, path: str) -> None:
+        """Use the index stored at `path`; the file is created on first write."""
+        self.path = path
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Return every stored run, oldest first."""
+        if not os.path.exists(self.path):
+            return []
+        entries = []
+        with open(self.path) as f:
+            fcntl.flock(f, fcntl.LOCK_SH)
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError as e:
+                    logger.warning(
+                        "Skipping unreadable line %d of %s: %s", number, self.path, e
+                    )
+                    continue
+                if (
+                    not isinstance(entry, dict)
+                    or not {"topic", "requirements"} <= entry.keys()
+                ):
+                    logger.warning(
+                        "Skipping malformed line %d of %s", number, self.path
+                    )
+                    continue
+                entries.append(entry)
+        return entries
+
+    def add(self, state: DeveloperState) -> None:
+        """Store the topic, requirements digest and design artifacts of `state`."""
+        entry: Dict[str, Any] = {
+            "topic": state.topic,
+            "requirements": state.requirements_digest or "",
+        }
+        for field in REUSABLE_STAGES.values():
+            value = getattr(state, field)
+            entry[field] = value.model_dump(mode="json") if value is not None else None
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "ab+") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            # Start a new line if a killed writer left a partial one
+            f.seek(0, os.SEEK_END)
+            prefix = b""
+            if f.tell() > 0:
+                f.seek(-1, os.SEEK_END)
+                prefix = b"" if f.read(1) == b"\n" else b"\n"
+            f.write(prefix + json.dumps(entry).encode() + b"\n")
+
+    def best_match(
+        self, topic: str, digest: str
+    ) -> Optional[Tuple[Dict[str, Any], float]]:
+        """Return the most similar stored run and its score, if any."""
+        best: Optional[Tuple[Dict[str, Any], float]] = None
+        for entry in self.entries():
+            score = run_similarity(topic, digest, entry)
+            if best is None or score > best[1]:
+                best = (entry, score)
+        return best
+
+    def lookup(
+        self,
+        topic: str,
+        digest: str,
+        threshold: float,
+        skip_threshold: float,
+    ) -> Optional[ReuseMatch]:
+        """Return a `ReuseMatch` when a stored run scores at least `threshold`.
+
+        Stages whose artifact was stored are revised from it, or skipped
+        outright when the score also reaches `skip_threshold`.
+        """
+        best = self.best_match(topic, digest)
+        if best is None or best[1] < threshold:
+            return None
+        entry, score = best
+        stages = [stage for stage, field in REUSABLE_STAGES.items() if entry.get(field)]
+        skip = score >= skip_threshold
+        return ReuseMatch(
+            topic=entry["topic"],
+            similarity=score,
+            **{field: entry.get(field) for field in REUSABLE_STAGES.values()},
+            revised_stages=[] if skip else stages,
+            skipped_stages=stages if skip else [],
+        )
@@ -0,0 +1,474 @@
+"""Self-hosted job runner for the compiled graph.
+
+Jobs are queued in a SQLite database. A pool of worker processes claims and
+runs them. The graph is imported and compiled once in the parent, before
+forking, so every worker starts warm. Each node update is written to the
+database as a progress event, and a small HTTP server exposes the events:
+
+- ``POST /jobs`` with ``{"input": {...}, "config": {...}}`` queues a job.
+- ``GET /jobs/<id>`` returns its status and final state.
+- ``GET /jobs/<id>/events`` streams its progress as server-sent events.
+
+A claimed job is leased to its worker, which renews the lease while the job
+runs. If a worker dies, its job is queued again once the lease expires (up
+to three attempts), so it never stays ``running`` forever. On Ctrl-C or
+SIGTERM, workers finish their current job before exiting.
+
+The queue runs in SQLite's WAL mode, which needs shared memory between the
+processes using the database, so every runner must be on the same host, with
+the database on a local disk (not a network filesystem). To add workers to
+a running queue, start another runner on that host with ``--port 0``.
+The runner scales across the cores of one host only. Spreading workers over
+several nodes needs a queue and checkpoint store in a networked database,
+which this runner does not provide. With
+``--checkpoint-db`` (requires ``langgraph-checkpoint-sqlite``) each job is
+also checkpointed under thread id ``job-<id>``, using `StateSerializer`.
+
+Run with ``python -m react_agent.runner --db jobs.sqlite --workers 4``.
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import re
+import signal
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from react_agent.serialization import StateSerializer, to_json_bytes
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    status TEXT NOT NULL DEFAULT 'queued',
+    input TEXT NOT NULL,
+    config TEXT NOT NULL,
+    result TEXT,
+    error TEXT,
+    worker TEXT,
+    created REAL NOT NULL,
+    started REAL,
+    finished REAL,
+    lease_until REAL,
+    attempts INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS jobs_status ON jobs (status, id);
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    job_id INTEGER NOT NULL,
+    ts REAL NOT NULL,
+    node TEXT NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_job ON events (job_id, id);
+"""
+
+FINISHED = ("done", "failed")
+# Columns added after the first release, for queues created before them
+_MIGRATIONS = {
+    "lease_until": "ALTER TABLE jobs ADD COLUMN lease_until REAL",
+    "attempts": "ALTER TABLE jobs ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0",
+}
+LEASE_SECONDS = 60.0
+MAX_ATTEMPTS = 3
+
+
+def to_json(value: Any) -> str:
+    """Serialize graph inputs, updates and states, including Pydantic models."""
+    return to_json_bytes(value).decode()
+
+
+class JobQueue:
+    """SQLite-backed job queue and progress-event log."""
+
+    def __init__(
+        self, path: str, lease: float = LEASE_SECONDS, max_attempts: int = MAX_ATTEMPTS
+    ) -> None:
+        """Open (and create if needed) the queue database at `path`.
+
+        A claimed job is leased to its worker for `lease` seconds and the
+        worker renews the lease while it runs. A job whose lease expired
+        (its worker died or was killed) is queued again, up to
+        `max_attempts` claims; after that it fails.
+        """
+        self.path = path
+        self.lease = lease
+        self.max_attempts = max_attempts
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(jobs)")}
+            for column, statement in _MIGRATIONS.items():
+                if column not in columns:
+                    conn.execute(statement)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlite3.Connection]:
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.row_factory = sqlite3.Row
+            yield conn
+        finally:
+            conn.close()
+
+    def submit(
+        self, input: Dict[str, Any], config: Optional[Dict[str, Any]] = None
+    ) -> int:
+        """Queue a graph run and return its job id."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT INTO jobs (input, config, created) VALUES (?, ?, ?)",
+                (to_json(input), to_json(config or {}), time.time()),
+            )
+            return int(cursor.lastrowid or 0)
+
+    def claim(
+        self, worker: str
+    ) -> Optional[Tuple[int, Dict[str, Any], Dict[str, Any]]]:
+        """Atomically take the oldest queued or abandoned job, or return None if there is none."""
+        now = time.time()
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                # Abandoned jobs that used up their attempts fail instead of looping
+                conn.execute(
+                    "UPDATE jobs SET status = 'failed', error = ?, finished = ? "
+                    "WHERE status = 'running' AND lease_until < ? AND attempts >= ?",
+                    (
+                        f"Worker lease expired {self.max_attempts} times.",
+                        now,
+                        now,
+                        self.max_attempts,
+                    ),
+                )
+                row = conn.execute(
+                    "SELECT id, input, config FROM jobs WHERE status = 'queued' "
+                    "OR (status = 'running' AND lease_until < ?) ORDER BY id LIMIT 1",
+                    (now,),
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE jobs SET status = 'running', worker = ?, started = ?, "
+                        "lease_until = ?, attempts = attempts + 1 WHERE id = ?",
+                        (worker, now, now + self.lease, row["id"]),
+                    )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        if row is None:
+            return None
+        return row["id"], json.loads(row["input"]), json.loads(row["config"])
+
+    def renew(self, job_id: int, worker: str) -> bool:
+        """Extend `worker`'s lease on `job_id`; return False if it no longer holds the job."""
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND status = 'running'",
+                (time.time() + self.lease, job_id, worker),
+            )
+            return cursor.rowcount > 0
+
+    def add_event(self, job_id: int, node: str, payload: Any) -> None:
+        """Append a progress event for `job_id`."""
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO events (job_id, ts, node, payload) VALUES (?, ?, ?, ?)",
+                (job_id, time.time(), node, to_json(payload)),
+            )
+
+    def finish(
+        self,
+        job_id: int,
+        result: Any = None,
+        error: Optional[str] = None,
+        worker: Optional[str] = None,
+    ) -> None:
+        """Mark `job_id` done with its final state, or failed with `error`.
+
+        With `worker`, nothing changes unless that worker still holds the job,
+        so a worker whose lease expired cannot overwrite the next attempt.
+        """
+        query = "UPDATE jobs SET status = ?, result = ?, error = ?, finished = ? WHERE id = ?"
+        params: List[Any] = [
+            "failed" if error else "done",
+            None if error else to_json(result),
+            error,
+            time.time(),
+            job_id,
+        ]
+        if worker is not None:
+            query += " AND worker = ? AND status = 'running'"
+            params.append(worker)
+        with self._connect() as conn:
+            conn.execute(query, params)
+
+    def job(self, job_id: int) -> Optional[Dict[str, Any]]:
+        """Return the status, timing and final state of `job_id`."""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        for key in ("input", "config", "result"):
+            job[key] = json.loads(job[key]) if job[key] else None
+        return job
+
+    def events(self, job_id: int, after: int = 0) -> List[Dict[str, Any]]:
+        """Return the events of `job_id` with an id greater than `after`."""
+        with self._connect() as conn:
+            rows = conn.execute(
+                "SELECT id, ts, node, payload FROM events WHERE job_id = ? AND id > ? ORDER BY id",
+                (job_id, after),
+            ).fetchall()
+        return [
+            {
+                "id": row["id"],
+                "ts": row["ts"],
+                "node": row["node"],
+                "payload": json.loads(row["payload"]),
+            }
+            for row in rows
+        ]
+
+
+@contextmanager
+def _heartbeat(queue: JobQueue, job_id: int, worker: str) -> Iterator[None]:
+    """Renew the lease on `job_id` in the background while the block runs."""
+    done = threading.Event()
+
+    def renew() -> None:
+        while not done.wait(queue.lease / 3) and queue.renew(job_id, worker):
+            pass
+
+    thread = threading.Thread(target=renew, name=f"lease-{job_id}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        done.set()
+        thread.join()
+
+
+def run_job(queue: JobQueue, graph: Any, worker: str) -> bool:
+    """Claim and run one job; return False when the queue is empty."""
+    claimed = queue.claim(worker)
+    if claimed is None:
+        return False
+    job_id, input, config = claimed
+    config.setdefault("configurable", {}).setdefault("thread_id", f"job-{job_id}")
+    with _heartbeat(queue, job_id, worker):
+        _run(queue, graph, worker, job_id, input, config)
+    return True
+
+
+def _run(
+    queue: JobQueue,
+    graph: Any,
+    worker: str,
+    job_id: int,
+    input: Dict[str, Any],
+    config: Dict[str, Any],
+) -> None:
+    state = None
+    try:
+        # With subgraphs, node updates inside each stage are recorded as they happen
+        for namespace, mode, chunk in graph.stream(
+            input, config, stream_mode=["updates", "values"], subgraphs=True
+        ):
+            if mode == "values":
+                if not namespace:
+                    state = chunk
+                continue
+            for node, update in chunk.items():
+                queue.add_event(job_id, node, update)
+    except Exception as e:
+        queue.finish(job_id, error=repr(e), worker=worker)
+    else:
+        queue.finish(job_id, result=state, worker=worker)
+
+
+def compile_graph(checkpoint_db: Optional[str] = None) -> Any:
+    """Return the compiled graph, with a SQLite checkpointer when requested."""
+    if checkpoint_db is None:
+        from react_agent import graph
+
+        return graph
+
+    try:
+        from langgraph.checkpoint.sqlite import (  # type: ignore[import-not-found]
+            SqliteSaver,
+        )
+    except ImportError as e:
+        raise ImportError(
+            "--checkpoint-db requires the langgraph-checkpoint-sqlite package."
+        ) from e
+    from react_agent.graph import builder
+
+    conn = sqlite3.connect(checkpoint_db, check_same_thread=False)
+    return builder.compile(checkpointer=SqliteSaver(conn, serde=StateSerializer()))
+
+
+def worker_main(
+    db_path: str,
+    checkpoint_db: Optional[str],
+    poll_interval: float,
+    graph: Any = None,
+    stop: Any = None,
+) -> None:
+    """Run jobs from the queue, polling when it is empty, until `stop` is set.
+
+    The current job is always finished before stopping. Ctrl-C reaches the
+    whole process group, so workers ignore SIGINT and leave shutdown to the
+    parent, which sets `stop`.
+    """
+    if stop is not None:
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+    graph = graph or compile_graph(checkpoint_db)
+    queue = JobQueue(db_path)
+    worker = f"{os.uname().nodename}:{os.getpid()}"
+    while stop is None or not stop.is_set():
+        if not run_job(queue, graph, worker):
+            if stop is None:
+                time.sleep(poll_interval)
+            else:
+                stop.wait(poll_interval)
+
+
+def stream_events(
+    queue: JobQueue, job_id: int, after: int = 0, poll_interval: float = 0.2
+) -> Iterator[str]:
+    """Yield server-sent-event frames for `job_id` until it finishes."""
+    while True:
+        job = queue.job(job_id)
+        for event in queue.events(job_id, after):
+            after = event["id"]
+            yield f"id: {after}\nevent: update\ndata: {json.dumps(event)}\n\n"
+        if job is None or job["status"] in FINISHED:
+            status = job["status"] if job else "unknown"
+            yield f"event: end\ndata: {json.dumps({'status': status})}\n\n"
+            return
+        time.sleep(poll_interval)
+
+
+def make_handler(queue: JobQueue) -> type:
+    """Build the HTTP request handler class bound to `queue`."""
+
+    class Handler(BaseHTTPRequestHandler):
+        def _send_json(self, status: int, body: Any) -> None:
+            data = to_json(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_POST(self) -> None:
+            if self.path.rstrip("/") != "/jobs":
+                return self._send_json(404, {"error": "not found"})
+            length = int(self.headers.get("Content-Length") or 0)
+            try:
+                body = json.loads(self.rfile.read(length) or b"{}")
+                job_id = queue.submit(body["input"], body.get("config"))
+            except (ValueError, KeyError) as e:
+                return self._send_json(400, {"error": repr(e)})
+            self._send_json(202, {"id": job_id})
+
+        def do_GET(self) -> None:
+            match = re.fullmatch(r"/jobs/(\d+)(/events)?/?", self.path)
+            if match is None:
+                return self._send_json(404, {"error": "not found"})
+            job_id = int(match.group(1))
+            if match.group(2) is None:
+                job = queue.job(job_id)
+                return self._send_json(
+                    200 if job else 404, job or {"error": "not found"}
+                )
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            after = int(self.headers.get("Last-Event-ID") or 0)
+            for frame in stream_events(queue, job_id, after):
+                self.wfile.write(frame.encode())
+                self.wfile.flush()
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return Handler
+
+
+def main() -> None:
+    """Start the worker pool and, unless --port is 0, the HTTP server."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--db", default="jobs.sqlite")
+    parser.add_argument("--checkpoint-db", default=None)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8123)
+    parser.add_argument("--poll-interval", type=float, default=0.2)
+    parser.add_argument(
+        "--shutdown-timeout",
+        type=float,
+        default=60.0,
+        help="seconds to let running jobs finish on shutdown; unfinished ones are requeued",
+    )
+    args = parser.parse_args()
+
+    queue = JobQueue(args.db)
+    methods = multiprocessing.get_all_start_methods()
+    context = (
+        multiprocessing.get_context("fork")
+        if "fork" in methods
+        else multiprocessing.get_context("spawn")
+    )
+    if context.get_start_method() == "fork" and args.checkpoint_db is None:
+        compile_graph()  # Import and compile once so forked workers start warm.
+    stop = context.Event()
+    workers = [
+        context.Process(
+            target=worker_main,
+            args=(args.db, args.checkpoint_db, args.poll_interval, None, stop),
+            daemon=True,
+        )
+        for _ in range(args.workers)
+    ]
+    for process in workers:
+        process.start()
+
+    def interrupt(signum: int, frame: Any) -> None:
+        raise KeyboardInterrupt
+
+    # Background jobs start with SIGINT ignored, so install both handlers
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        signal.signal(signum, interrupt)
+    try:
+        if args.port:
+            server = ThreadingHTTPServer((args.host, args.port), make_handler(queue))
+            print(f"Serving jobs on http://{args.host}:{args.port}")  # noqa: T201
+            server.serve_forever()
+        else:
+            for process in workers:
+                process.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Let running jobs finish; anything still running after the timeout is
+        # killed and requeued once its lease expires
+        stop.set()
+        deadline = time.time() + args.shutdown_timeout
+        for process in workers:
+            process.join(max(0.0, deadline - time.time()))
+        for process in workers:
+            if process.is_alive():
+                process.terminate()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""Parallel best-of-N sampling with first-valid acceptance.
+
+A node's output can validate against its schema and still be unusable, for
+example a code organization without exactly one endpoint file. Retrying
+serially puts a whole model round trip on the critical path for every
+failure. `BestOfNModel` sends N requests for the same input, each on its own
+thread, and returns the first response that passes schema validation and
+`checks.problems`. Samples are never queued on a shared pool, so a sampled
+call nested in a hedged one cannot wait on work queued behind itself.
+With a `timeout`, `TimeoutError` is raised once it passes without a valid
+sample.
+
+Requests already in flight cannot be aborted: once a sample wins, the others
+still run to completion and are paid for, and their results are dropped.
+Cost is bounded two ways: N per node, and a stagger delay before each extra
+sample is sent, so that a fast valid first answer never pays for the others.
+With the default stagger of 0 all N requests are sent at once, so every call
+pays for N full responses.
+
+Per-node metrics: `best_of_n_calls`, `samples_sent`, `samples_rejected`,
+`samples_not_sent` (never sent, thanks to the stagger), `samples_dropped`
+(sent, but still running when another sample won), `timeouts`, and the
+latency series `best_of_n_latency`.
+"""
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from typing import Any, Callable, List, Optional, Sequence
+
+from react_agent.checks import problems
+from react_agent.hedging import spawn
+from react_agent.metrics import METRICS, Metrics
+
+
+class NoValidSample(ValueError):
+    """Raised when none of the N samples passed validation and the local checks."""
+
+
+class BestOfNModel:
+    """Sample `runnables` in parallel and return the first output that passes `check`."""
+
+    def __init__(
+        self,
+        runnables: Sequence[Any],
+        node: str,
+        stagger: float = 0.0,
+        timeout: Optional[float] = None,
+        check: Callable[[Any], List[str]] = problems,
+        metrics: Metrics = METRICS,
+    ) -> None:
+        """Send one request per runnable, `stagger` seconds apart.
+
+        Args:
+            runnables: One runnable per sample; usually the same model, with
+                a higher temperature for all but the first.
+            node: The node the samples belong to, for metrics.
+            stagger: Seconds to wait for a valid answer before each extra sample.
+            timeout: Seconds before `TimeoutError`; None waits for the samples.
+            check: Returns the problems of an output; empty when it passes.
+            metrics: Where to record what happened.
+        """
+        self.runnables = list(runnables)
+        self.node = node
+        self.stagger = stagger
+        self.timeout = timeout
+        self.check = check
+        self.metrics = metrics
+
+    def _sample(self, runnable: Any, input: Any, config: Any) -> Any:
+        output = runnable.invoke(input, config)
+        found = self.check(output)
+        if found:
+            raise NoValidSample("; ".join(found))
+        return output
+
+    def invoke(self, input: Any, config: Any = None) -> Any:
+        """Return the first valid sample, or raise the last sample's error once all failed."""
+        start = time.perf_counter()
+        deadline = start + self.timeout if self.timeout is not None else None
+        self.metrics.increment(self.node, "best_of_n_calls")
+        waiting = list(self.runnables)
+        futures: List[Future[Any]] = []
+        error: Optional[BaseException] = None
+
+        def send() -> None:
+            runnable = waiting.pop(0)
+            futures.append(spawn(lambda: self._sample(runnable, input, config)))
+            self.metrics.increment(self.node, "samples_sent")
+
+        send()
+        while not self.stagger and waiting:
+            send()
+
+        while futures or waiting:
+            wait_for = self.stagger if waiting else None
+            if deadline is not None:
+                remaining = max(0.0, deadline - time.perf_counter())
+                wait_for = remaining if wait_for is None else min(wait_for, remaining)
+            done, _ = wait(futures, timeout=wait_for, return_when=FIRST_COMPLETED)
+            for future in done:
+                futures.remove(future)
+                if future.exception() is None:
+                    self.metrics.increment(self.node, "samples_not_sent", len(waiting))
+                    self.metrics.increment(self.node, "samples_dropped", len(futures))
+                    self.metrics.observe(
+                        self.node, "best_of_n_latency", time.perf_counter() - start
+                    )
+                    return future.result()
+                error = future.exception()
+                self.metrics.increment(self.node, "samples_rejected")
+            if deadline is not None and not done and time.perf_counter() >= deadline:
+                self.metrics.increment(self.node, "samples_not_sent", len(waiting))
+                self.metrics.increment(self.node, "samples_dropped", len(futures))
+                self.metrics.increment(self.node, "timeouts")
+                raise TimeoutError(
+                    f"{self.node} got no valid sample within {self.timeout}s."
+                )
+            # Send the next sample when the stagger elapsed or every sent one failed
+            if waiting and (not done or not futures):
+                send()
+
+        raise (
+            error
+            if error is not None
+            else NoValidSample(f"{self.node}: no samples were sent.")
+        )
@@ -0,0 +1,136 @@
+"""Priority scheduling of model calls between interactive and batch runs.
+
+Interactive users (waiting on `human_feedback_requirements`) and bulk
+evaluation jobs share the same model capacity. `Scheduler` limits the
+number of model calls in flight to a fixed number of slots and decides who
+gets the next free slot:
+
+- Interactive requests always go before queued batch requests, so a large
+  batch backlog never sits in front of a user. Calls already running are
+  not interrupted; `reserved` slots are kept free for interactive calls so
+  one is usually available right away.
+- Within a class, tenants are served fairly (start-time fair queueing): a
+  tenant with many queued calls does not starve one with a single call.
+
+A slot covers one logical model request, including its hedged duplicates or
+best-of-N samples, while calls joining an identical one in flight take
+none. Scheduling is per process; runner workers each have their own slots.
+
+Metrics are recorded under the node `scheduler/<class>`: `queued`,
+`preempted` (batch calls an interactive call was served before) and the
+latency series `queue_wait`.
+"""
+
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from functools import cache
+from typing import Any, Dict, Iterator, List, Tuple
+
+from react_agent.metrics import METRICS, Metrics
+
+INTERACTIVE = "interactive"
+BATCH = "batch"
+PRIORITIES = {INTERACTIVE: 0, BATCH: 1}
+
+
+class Scheduler:
+    """Grant model-call slots by priority class, then fairly across tenants."""
+
+    def __init__(
+        self, slots: int, reserved: int = 0, metrics: Metrics = METRICS
+    ) -> None:
+        """Allow `slots` concurrent calls, `reserved` of them for interactive calls only."""
+        if slots < 1 or not 0 <= reserved < slots:
+            raise ValueError(
+                f"Need slots >= 1 and 0 <= reserved < slots, got {slots} and {reserved}."
+            )
+        self.slots = slots
+        self.reserved = reserved
+        self.metrics = metrics
+        self._free = slots
+        self._cond = threading.Condition()
+        self._queue: List[Tuple[int, float, int]] = []
+        self._sequence = itertools.count()
+        self._virtual_time: Dict[str, float] = {}
+        self._finish_tags: Dict[Tuple[str, str], float] = {}
+
+    def _can_start(self, priority: str) -> bool:
+        return self._free > (self.reserved if priority == BATCH else 0)
+
+    @contextmanager
+    def slot(self, priority: str = INTERACTIVE, tenant: str = "") -> Iterator[None]:
+        """Hold one slot for the duration of the block, waiting for it in turn."""
+        if priority not in PRIORITIES:
+            raise ValueError(
+                f"Unknown priority {priority!r}; use one of {', '.join(PRIORITIES)}."
+            )
+        node = f"scheduler/{priority}"
+        start = time.perf_counter()
+        with self._cond:
+            tag = max(
+                self._virtual_time.get(priority, 0.0),
+                self._finish_tags.get((priority, tenant), 0.0),
+            )
+            self._finish_tags[(priority, tenant)] = tag + 1
+            entry = (PRIORITIES[priority], tag, next(self._sequence))
+            heapq.heappush(self._queue, entry)
+            self.metrics.increment(node, "queued")
+            overtaken = sum(1 for queued in self._queue if queued[0] > entry[0])
+            if overtaken:
+                self.metrics.increment(f"scheduler/{BATCH}", "preempted", overtaken)
+            try:
+                while self._queue[0] is not entry or not self._can_start(priority):
+                    self._cond.wait()
+            except BaseException:
+                self._queue.remove(entry)
+                heapq.heapify(self._queue)
+                self._cond.notify_all()
+                raise
+            heapq.heappop(self._queue)
+            self._virtual_time[priority] = tag
+            self._free -= 1
+            # The next entry may be able to take another free slot
+            self._cond.notify_all()
+        self.metrics.observe(node, "queue_wait", time.perf_counter() - start)
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._free += 1
+                self._cond.notify_all()
+
+    def queued(self) -> int:
+        """Return the number of calls waiting for a slot."""
+        with self._cond:
+            return len(self._queue)
+
+
+@cache
+def shared_scheduler(slots: int, reserved: int = 0) -> Scheduler:
+    """Return the process-wide scheduler for this capacity."""
+    return Scheduler(slots, reserved)
+
+
+class ScheduledModel:
+    """Wrap a runnable so each `invoke` waits for a scheduler slot first."""
+
+    def __init__(
+        self,
+        runnable: Any,
+        scheduler: Scheduler,
+        priority: str = INTERACTIVE,
+        tenant: str = "",
+    ) -> None:
+        """Schedule calls to `runnable` as `priority` work of `tenant`."""
+        self.runnable = runnable
+        self.scheduler = scheduler
+        self.priority = priority
+        self.tenant = tenant
+
+    def invoke(self, input: Any, config: Any = None) -> Any:
+        """Invoke the wrapped runnable once a slot is granted."""
+        with self.scheduler.slot(self.priority, self.tenant):
+            return self.runnable.invoke(input, config)
@@ -1,7 +1,7 @@
 # schemas.py
 
 from pydantic import BaseModel, Field
-from typing import List, Optional
+from typing import Dict, List, Optional
 from typing_extensions import TypedDict
 
 # Requirement Models
@@ -256,6 +256,16 @@ class CodeFolder(BaseModel):
         description="List of code files in the folder.",
     )
 
+class GeneratedCode(BaseModel):
+    """Represents generated code for a set of files, without their organization.
+
+    Attributes:
+        files (List[CodeGeneration]): The generated files.
+    """
+    files: List[CodeGeneration] = Field(
+        description="One entry per generated file with its folder name, file name and full code.",
+    )
+
 # Developer State
 
 
@@ -274,6 +284,112 @@ class ProjectSetup(BaseModel):
     back_end_setup: str = Field(
         description="Instructions on how to set up and run the back-end application."
     )
+
+class ContractMismatch(BaseModel):
+    """Represents a disagreement between a front-end API call and the back-end routes.
+
+    Attributes:
+        kind (str): "method", "path", "payload", "missing_route" or "unparsable".
+        method (str): The HTTP method of the front-end call.
+        path (str): The path of the front-end call.
+        file (str): The file (folder/name) that should change to fix it.
+        detail (str): What exactly disagrees, with the files and lines involved.
+    """
+    kind: str
+    method: str
+    path: str
+    file: str
+    detail: str
+
+class SpecDigests(BaseModel):
+    """Represents length-bounded digests of the approved specs, shared by the downstream prompts.
+
+    Attributes:
+        source_hash (str): Hash of the state content the digests were built from.
+        requirements (str): Digest of the global requirements.
+        front_end (str): Digest of the front-end requirements description.
+        front_end_api (str): Digest of the front-end API design.
+        back_end (str): Digest of the back-end requirements description.
+        back_end_api (str): Digest of the back-end API endpoints and logic.
+    """
+    source_hash: str
+    requirements: str = ""
+    front_end: str = ""
+    front_end_api: str = ""
+    back_end: str = ""
+    back_end_api: str = ""
+
+class ResolvedPackage(BaseModel):
+    """Represents the package that installs a framework.
+
+    Attributes:
+        framework (str): The framework name exactly as given.
+        ecosystem (str): "npm" for front-end packages, "pypi" for back-end packages.
+        package (Optional[str]): The package name to install, or None when the framework needs no install.
+        version (Optional[str]): The version specifier, such as "^1.7.0" or ">=2.0".
+        dev (bool): Whether it is an npm development dependency.
+    """
+    framework: str = Field(
+        description="The framework name exactly as given.",
+    )
+    ecosystem: str = Field(
+        description='"npm" for front-end packages, "pypi" for back-end packages.',
+    )
+    package: Optional[str] = Field(
+        default=None,
+        description="The package name to install, or null when the framework is built in and needs no install.",
+    )
+    version: Optional[str] = Field(
+        default=None,
+        description='The version specifier, such as "^1.7.0" for npm or ">=2.0" for pypi.',
+    )
+    dev: bool = Field(
+        default=False,
+        description="Whether it is only needed during development (npm devDependencies).",
+    )
+
+class PackageResolution(BaseModel):
+    """Represents the packages for frameworks the local package table does not know.
+
+    Attributes:
+        packages (List[ResolvedPackage]): One entry per framework.
+    """
+    packages: List[ResolvedPackage] = Field(
+        description="One entry per framework.",
+    )
+
+class GenerationReport(BaseModel):
+    """Represents how well generated code covered the files of its organization.
+
+    Attributes:
+        missing_files (List[str]): Files (folder/name) of the organization the model returned no code for.
+        extra_files (List[str]): Files (folder/name) the model returned that are not in the organization.
+    """
+    missing_files: List[str] = Field(default_factory=list)
+    extra_files: List[str] = Field(default_factory=list)
+
+class ReuseMatch(BaseModel):
+    """Represents a previous run whose design is reused as a starting draft.
+
+    Attributes:
+        topic (str): The topic of the matched run.
+        similarity (float): Similarity between the matched run and the current one.
+        front_end (Optional[FrontEndDependencies]): The matched run's front-end requirements.
+        back_end (Optional[BackEndDependencies]): The matched run's back-end requirements.
+        front_end_organization (Optional[CodeOrganization]): The matched run's front-end organization.
+        back_end_organization (Optional[CodeOrganization]): The matched run's back-end organization.
+        revised_stages (List[str]): Stages that revise the stored draft instead of starting from scratch.
+        skipped_stages (List[str]): Stages that take the stored artifact as-is, without a model call.
+    """
+    topic: str
+    similarity: float
+    front_end: Optional[FrontEndDependencies] = None
+    back_end: Optional[BackEndDependencies] = None
+    front_end_organization: Optional[CodeOrganization] = None
+    back_end_organization: Optional[CodeOrganization] = None
+    revised_stages: List[str] = Field(default_factory=list)
+    skipped_stages: List[str] = Field(default_factory=list)
+
 class DeveloperState(BaseModel):
     topic: str = Field(
         description="The project topic or app idea.",
@@ -282,6 +398,10 @@ class DeveloperState(BaseModel):
         default=None,
         description="The global functional requirements.",
     )
+    requirements_digest: Optional[str] = Field(
+        default=None,
+        description="Deduplicated, numbered requirement list shared by the downstream prompts.",
+    )
     front_end: Optional[FrontEndDependencies] = Field(
         default=None,
         description="The front-end requirements and dependencies.",
@@ -295,6 +415,10 @@ class DeveloperState(BaseModel):
 
         description="Any human developer feedback.",
     )
+    spec_digests: Optional[SpecDigests] = Field(
+        default=None,
+        description="Length-bounded digests of the requirements and specs, keyed by content hash.",
+    )
     front_end_organization: Optional[CodeOrganization] = Field(
         default=None,
         description="The organization of front-end code.",
@@ -311,6 +435,43 @@ class DeveloperState(BaseModel):
         default=None,
         description="Generated front-end code files organized by folders.",
     )
+    front_end_generation_report: Optional[GenerationReport] = Field(
+        default=None,
+        description="Missing and extra files in the generated front-end code.",
+    )
+    back_end_generation_report: Optional[GenerationReport] = Field(
+        default=None,
+        description="Missing and extra files in the generated back-end code.",
+    )
+    reuse: Optional[ReuseMatch] = Field(
+        default=None,
+        description="A similar previous run whose design is reused as a starting draft.",
+    )
+    changed_requirements: Optional[List[str]] = Field(
+        default=None,
+        description="Requirements changed since the code was generated; drives targeted regeneration.",
+    )
+    revised_requirements: Optional[List[str]] = Field(
+        default=None,
+        description="The new requirement list; compared with global_requirements to find the "
+        "changed requirements, and replaces them once the code is regenerated.",
+    )
+    regenerated_files: Optional[List[str]] = Field(
+        default=None,
+        description="Files (folder/name) rewritten by the last targeted regeneration.",
+    )
+    contract_report: Optional[List[ContractMismatch]] = Field(
+        default=None,
+        description="Mismatches between the generated front-end calls and back-end routes.",
+    )
+    contract_fixed_files: Optional[List[str]] = Field(
+        default=None,
+        description="Files (folder/name) rewritten to fix contract mismatches.",
+    )
+    dependency_files: Optional[Dict[str, str]] = Field(
+        default=None,
+        description="Generated package.json and requirements.txt, keyed by their path in the project.",
+    )
     project_setup_instructions: Optional[ProjectSetup] = Field(
         default=None,
 
@@ -0,0 +1,209 @@
+"""Fast serialization of `DeveloperState` values for checkpoints and streams.
+
+LangGraph checkpoints each changed state channel separately, and the values
+of this graph are mostly deeply nested Pydantic models (`CodeOrganization`
+-> `Folder` -> `File` -> `Method`). `StateSerializer` writes them with each
+model's precompiled pydantic-core serializer and reads them with a cached
+`TypeAdapter`. Payloads that were already validated are recognized by content
+hash and returned without revalidation. Large payloads are optionally
+zlib-compressed. Any other value falls back to LangGraph's
+`JsonPlusSerializer`.
+
+Loaded models are shared between loads of identical payloads, so treat them
+as immutable, as the nodes already do by returning new values.
+
+Run ``python -m react_agent.serialization`` (or ``make bench_serde``) to
+benchmark it against the default serializer across project sizes.
+"""
+
+import argparse
+import hashlib
+import time
+import zlib
+from collections import OrderedDict
+from functools import cache
+from typing import Any, Callable, Dict, List, Optional, Tuple, Type
+
+import pydantic_core
+from langgraph.checkpoint.serde.base import SerializerProtocol
+from langgraph.checkpoint.serde.jsonplus import JsonPlusSerializer
+from pydantic import BaseModel, TypeAdapter
+
+from react_agent import schemas
+
+PYDANTIC = "pydantic"
+PYDANTIC_ZLIB = "pydantic+zlib"
+
+
+def _registry() -> Dict[str, Type[BaseModel]]:
+    return {
+        name: value
+        for name, value in vars(schemas).items()
+        if isinstance(value, type)
+        and issubclass(value, BaseModel)
+        and value is not BaseModel
+    }
+
+
+@cache
+def adapter(model: Type[BaseModel]) -> TypeAdapter[BaseModel]:
+    """Return the (compiled once) validator for `model`."""
+    return TypeAdapter(model)
+
+
+def to_json_bytes(value: Any) -> bytes:
+    """Serialize a value, including nested Pydantic models, to JSON bytes."""
+    return pydantic_core.to_json(value, fallback=str)
+
+
+class StateSerializer:
+    """Checkpoint serializer for the graph's Pydantic state values."""
+
+    def __init__(
+        self,
+        compress: bool = True,
+        compress_min_bytes: int = 2048,
+        cache_size: int = 1024,
+        fallback: Optional[SerializerProtocol] = None,
+    ) -> None:
+        """Configure compression and the size of the validated-payload cache.
+
+        Args:
+            compress: Whether to zlib-compress payloads.
+            compress_min_bytes: Payloads smaller than this are stored as-is.
+            cache_size: Number of validated payloads kept for reuse.
+            fallback: Serializer for non-model values; `JsonPlusSerializer` by default.
+        """
+        self.compress = compress
+        self.compress_min_bytes = compress_min_bytes
+        self.cache_size = cache_size
+        self.fallback: SerializerProtocol = fallback or JsonPlusSerializer()
+        self.models = _registry()
+        self._cache: OrderedDict[bytes, BaseModel] = OrderedDict()
+
+    def dumps_typed(self, obj: Any) -> Tuple[str, bytes]:
+        """Serialize `obj` to a `(type, bytes)` pair."""
+        if not isinstance(obj, BaseModel) or self.models.get(
+            type(obj).__name__
+        ) is not type(obj):
+            return self.fallback.dumps_typed(obj)
+        payload = (
+            type(obj).__name__.encode()
+            + b"\0"
+            + obj.__pydantic_serializer__.to_json(obj)
+        )
+        if self.compress and len(payload) >= self.compress_min_bytes:
+            return PYDANTIC_ZLIB, zlib.compress(payload, 1)
+        return PYDANTIC, payload
+
+    def loads_typed(self, data: Tuple[str, bytes]) -> Any:
+        """Deserialize a `(type, bytes)` pair written by `dumps_typed`."""
+        kind, payload = data
+        if kind not in (PYDANTIC, PYDANTIC_ZLIB):
+            return self.fallback.loads_typed(data)
+        if kind == PYDANTIC_ZLIB:
+            payload = zlib.decompress(payload)
+        key = hashlib.blake2b(payload, digest_size=16).digest()
+        cached = self._cache.get(key)
+        if cached is not None:
+            self._cache.move_to_end(key)
+            return cached
+        name, _, body = payload.partition(b"\0")
+        value = adapter(self.models[name.decode()]).validate_json(body)
+        self._cache[key] = value
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return value
+
+
+def sample_project(
+    folders: int, files: int = 5, methods: int = 5
+) -> schemas.CodeOrganization:
+    """Build a generated project of the given size for benchmarks."""
+
+    def file(name: str) -> schemas.File:
+        return schemas.File(
+            name=name,
+            description=f"Implements {name}.",
+            methods=[
+                schemas.Method(
+                    name=f"method_{m}",
+                    signature=f"def method_{m}(self, item: dict) -> dict",
+                    return_statement="The updated item.",
+                    description="Validates and stores the item.",
+                )
+                for m in range(methods)
+            ],
+            code="def handler(item):\n    return item\n" * 40,
+        )
+
+    return schemas.CodeOrganization(
+        folders=[
+            schemas.Folder(
+                name=f"folder_{f}",
+                files=[file(f"file_{f}_{i}.py") for i in range(files)],
+                endpoint_file=file("main.py") if f == 0 else None,
+            )
+            for f in range(folders)
+        ]
+    )
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+def benchmark(sizes: List[int], repeat: int = 20) -> List[Dict[str, Any]]:
+    """Time dumps/loads of the default and fast serializers per project size."""
+    serializers: Dict[str, SerializerProtocol] = {
+        "jsonplus": JsonPlusSerializer(),
+        "fast": StateSerializer(compress=False),
+        "fast+zlib": StateSerializer(compress=True),
+    }
+    rows = []
+    for size in sizes:
+        project = sample_project(size)
+        for name, serde in serializers.items():
+            data = serde.dumps_typed(project)
+            cold = (
+                StateSerializer(compress=name == "fast+zlib")
+                if name != "jsonplus"
+                else serde
+            )
+            rows.append(
+                {
+                    "folders": size,
+                    "serializer": name,
+                    "bytes": len(data[1]),
+                    "dumps_ms": _time(lambda: serde.dumps_typed(project), repeat)
+                    * 1000,
+                    "loads_cold_ms": _time(lambda: cold.loads_typed(data), 1) * 1000,
+                    "loads_ms": _time(lambda: serde.loads_typed(data), repeat) * 1000,
+                }
+            )
+    return rows
+
+
+def main() -> None:
+    """Print the serializer benchmark as a table."""
+    parser = argparse.ArgumentParser(description=main.__doc__)
+    parser.add_argument("--sizes", default="1,10,50,200")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    rows = benchmark([int(s) for s in args.sizes.split(",")], args.repeat)
+    print(  # noqa: T201
+        f"{'folders':>8} {'serializer':>10} {'bytes':>10} {'dumps ms':>10} {'loads cold':>11} {'loads ms':>10}"
+    )
+    for row in rows:
+        print(  # noqa: T201
+            f"{row['folders']:>8} {row['serializer']:>10} {row['bytes']:>10} "
+            f"{row['dumps_ms']:>10.3f} {row['loads_cold_ms']:>11.3f} {row['loads_ms']:>10.3f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""Stage boundaries of the graph and memoization of stage results.
+
+The graph runs in three stages, each its own subgraph that can also be
+invoked on a partially filled `DeveloperState`:
+
+- ``requirements``: `process_requirements` and the feedback loop, then
+  `compress_requirements`.
+- ``design``: front-end and back-end drafts (starting from the reuse match
+  when there is one), reconciliation, spec digests and both code
+  organizations.
+- ``codegen``: code generation, the API contract check and fix, and
+  `required_software`.
+
+In the full graph each stage is a single node, with the reuse lookup
+(`find_similar_run`) between requirements and design. `memoized` keys a stage
+run by a hash of the state fields the stage reads plus the settings that
+change its output, and returns the stored update of an earlier run with the
+same key without entering the subgraph. Results are kept per process, and on
+disk under `stage_cache_path` when it is set, so a rerun that only changes a
+downstream stage skips the stages before it.
+
+Per-stage metrics: `stage_cache_hits` and `stage_cache_misses`.
+"""
+
+import dataclasses
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from langchain_core.runnables import RunnableConfig
+
+from react_agent.configuration import Configuration
+from react_agent.metrics import METRICS
+from react_agent.schemas import DeveloperState
+from react_agent.serialization import to_json_bytes
+
+
+@dataclass(frozen=True)
+class Stage:
+    """The state fields a stage reads and the ones it produces."""
+
+    inputs: Tuple[str, ...]
+    outputs: Tuple[str, ...]
+
+
+STAGES = {
+    "requirements": Stage(
+        inputs=("topic", "human_feedback"),
+        outputs=("global_requirements", "requirements_digest", "human_feedback"),
+    ),
+    "design": Stage(
+        inputs=("topic", "global_requirements", "requirements_digest", "reuse"),
+        outputs=(
+            "front_end",
+            "back_end",
+            "spec_digests",
+            "front_end_organization",
+            "back_end_organization",
+        ),
+    ),
+    "codegen": Stage(
+        inputs=(
+            "topic",
+            "front_end",
+            "back_end",
+            "front_end_organization",
+            "back_end_organization",
+        ),
+        outputs=(
+            "generate_frontend_code",
+            "generate_backend_code",
+            "front_end_generation_report",
+            "back_end_generation_report",
+            "contract_report",
+            "contract_fixed_files",
+            "dependency_files",
+            "project_setup_instructions",
+        ),
+    ),
+}
+
+# Settings that change how a result is obtained, not what it is
+_RUNTIME_SETTINGS = {
+    "stage_cache_path",
+    "memoize_stages",
+    "default_node_timeout",
+    "node_timeouts",
+    "hedge_percentile",
+    "hedge_min_samples",
+    "coalesce_requests",
+    "model_call_slots",
+    "interactive_reserved_slots",
+    "priority",
+    "tenant",
+}
+
+
+def stage_key(name: str, state: DeveloperState, configuration: Configuration) -> str:
+    """Return the memoization key of running stage `name` on `state`."""
+    settings = {
+        key: value
+        for key, value in dataclasses.asdict(configuration).items()
+        if key not in _RUNTIME_SETTINGS
+    }
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(name.encode())
+    digest.update(json.dumps(settings, sort_keys=True, default=str).encode())
+    for field in STAGES[name].inputs:
+        digest.update(b"\0" + field.encode() + b"=")
+        digest.update(to_json_bytes(getattr(state, field)))
+    return digest.hexdigest()
+
+
+class StageCache:
+    """Bounded in-process store of stage updates, optionally mirrored on disk."""
+
+    def __init__(self, max_entries: int = 256) -> None:
+        """Keep the `max_entries` most recently used updates in memory."""
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+
+    def get(self, key: str, path: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Return the stored update for `key`, looking on disk under `path` if needed."""
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return self._entries[key]
+        if path is None or not os.path.exists(os.path.join(path, f"{key}.json")):
+            return None
+        with open(os.path.join(path, f"{key}.json")) as f:
+            data = json.load(f)
+        # Validate through the state so nested values come back as models
+        state = DeveloperState.model_validate({"topic": "", **data})
+        update = {field: getattr(state, field) for field in data}
+        self._remember(key, update)
+        return update
+
+    def put(self, key: str, update: Dict[str, Any], path: Optional[str] = None) -> None:
+        """Store `update` under `key`, and on disk under `path` when given."""
+        self._remember(key, update)
+        if path is None:
+            return
+        os.makedirs(path, exist_ok=True)
+        # Write then rename, so concurrent readers never see a partial file
+        temporary = os.path.join(path, f".{key}.{os.getpid()}.{threading.get_ident()}")
+        with open(temporary, "wb") as f:
+            f.write(to_json_bytes(update))
+        os.replace(temporary, os.path.join(path, f"{key}.json"))
+
+    def _remember(self, key: str, update: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = update
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        """Drop every in-memory entry."""
+        with self._lock:
+            self._entries.clear()
+
+
+STAGE_CACHE = StageCache()
+
+
+def memoized(
+    name: str, subgraph: Any, cache: StageCache = STAGE_CACHE
+) -> Callable[..., Dict[str, Any]]:
+    """Return a node that runs `subgraph` as stage `name`, reusing earlier results."""
+    stage = STAGES[name]
+
+    def run(state: DeveloperState, config: RunnableConfig) -> Dict[str, Any]:
+        configuration = Configuration.from_runnable_config(config)
+        key = None
+        if configuration.memoize_stages:
+            key = stage_key(name, state, configuration)
+            update = cache.get(key, configuration.stage_cache_path)
+            if update is not None:
+                METRICS.increment(name, "stage_cache_hits")
+                return update
+            METRICS.increment(name, "stage_cache_misses")
+
+        result = subgraph.invoke(dict(state), config)
+        update = {field: result[field] for field in stage.outputs if field in result}
+        if key is not None:
+            cache.put(key, update, configuration.stage_cache_path)
+        return update
+
+    run.__name__ = name
+    run.__doc__ = (
+        f"Run the {name} stage, or reuse the result of an identical earlier run."
+    )
+    return run
@@ -0,0 +1,190 @@
+"""Offline stand-in for the chat model.
+
+`StubChatModel` answers every structured-output request with a payload
+synthesized from the requested schema, so the graph can be exercised end to
+end (profiling, load tests, unit tests) without network access or API keys.
+Its latency distribution and payload size are configurable to mimic
+production, either directly or through a model spec such as
+``stub/latency=0.8,sigma=0.4,items=3,chars=400`` (see `StubChatModel.from_spec`).
+"""
+
+import asyncio
+import json
+import random
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.callbacks import (
+    AsyncCallbackManagerForLLMRun,
+    CallbackManagerForLLMRun,
+)
+from langchain_core.language_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from pydantic import PrivateAttr
+
+
+def fake_value(
+    schema: Dict[str, Any], name: str = "value", items: int = 1, chars: int = 0
+) -> Any:
+    """Build a value that satisfies a (dereferenced) JSON schema.
+
+    Arrays get `items` entries and strings are padded to at least `chars`
+    characters, which scales the payload size.
+    """
+    if "anyOf" in schema:
+        options = [s for s in schema["anyOf"] if s.get("type") != "null"]
+        return fake_value(options[0], name, items, chars) if options else None
+    kind = schema.get("type")
+    if kind == "object":
+        return {
+            key: fake_value(sub, key, items, chars)
+            for key, sub in schema.get("properties", {}).items()
+        }
+    if kind == "array":
+        return [
+            fake_value(schema.get("items", {}), f"{name} {i}", items, chars)
+            for i in range(items)
+        ]
+    if kind == "integer":
+        return 1
+    if kind == "number":
+        return 1.0
+    if kind == "boolean":
+        return True
+    return f"stub {name}".ljust(chars, ".")
+
+
+def load_latency_samples(path: str) -> List[float]:
+    """Read model latencies (seconds) from a JSON list or a `profiling` Chrome trace."""
+    with open(path) as f:
+        data = json.load(f)
+    if isinstance(data, dict):
+        return [
+            e["dur"] / 1e6 for e in data.get("traceEvents", []) if e.get("cat") == "llm"
+        ]
+    return [float(value) for value in data]
+
+
+class StubChatModel(BaseChatModel):
+    """Chat model that returns schema-shaped tool calls after an optional delay.
+
+    The delay is drawn from `latency_samples` when given, otherwise from a
+    log-normal distribution with median `latency` and shape `sigma` (a fixed
+    delay when `sigma` is 0).
+    """
+
+    model_name: str = "default"
+    latency: float = 0.0
+    sigma: float = 0.0
+    latency_samples: List[float] = []
+    items: int = 1
+    chars: int = 0
+    seed: Optional[int] = None
+    timeout: Optional[float] = None
+
+    _random: random.Random = PrivateAttr(default_factory=random.Random)
+
+    def model_post_init(self, context: Any) -> None:
+        """Seed the latency sampler."""
+        self._random = random.Random(self.seed)
+
+    @classmethod
+    def from_spec(cls, spec: str, timeout: Optional[float] = None) -> "StubChatModel":
+        """Build a stub from the part of a model name after ``stub/``.
+
+        The spec is either a plain name or comma-separated ``key=value``
+        pairs: ``latency``, ``sigma``, ``items``, ``chars``, ``seed`` and
+        ``samples`` (a file for `load_latency_samples`). Like a real client,
+        the stub gives up with `TimeoutError` after `timeout` seconds.
+        """
+        if "=" not in spec:
+            return cls(model_name=spec, timeout=timeout)
+        params: Dict[str, Any] = {"model_name": spec, "timeout": timeout}
+        for pair in spec.split(","):
+            key, _, value = pair.partition("=")
+            key = key.strip()
+            if key == "samples":
+                params["latency_samples"] = load_latency_samples(value)
+            elif key in ("items", "chars", "seed"):
+                params[key] = int(value)
+            elif key in ("latency", "sigma"):
+                params[key] = float(value)
+            else:
+                raise ValueError(f"Unknown stub model parameter: {key}")
+        return cls(**params)
+
+    def sample_latency(self) -> float:
+        """Draw one response delay in seconds."""
+        if self.latency_samples:
+            return self._random.choice(self.latency_samples)
+        if self.latency <= 0:
+            return 0.0
+        if self.sigma <= 0:
+            return self.latency
+        return self._random.lognormvariate(0.0, self.sigma) * self.latency
+
+    @property
+    def _llm_type(self) -> str:
+        return "stub"
+
+    def bind_tools(
+        self,
+        tools: Sequence[Any],
+        *,
+        tool_choice: Optional[str] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """Bind tools so `with_structured_output` works like on real providers."""
+        formatted = [convert_to_openai_tool(tool) for tool in tools]
+        return self.bind(tools=formatted, **kwargs)
+
+    def _respond(self, tools: List[Dict[str, Any]]) -> ChatResult:
+        if not tools:
+            message = AIMessage(content="stub response")
+        else:
+            function = tools[0]["function"]
+            message = AIMessage(
+                content="",
+                tool_calls=[
+                    {
+                        "name": function["name"],
+                        "args": fake_value(
+                            function["parameters"], items=self.items, chars=self.chars
+                        ),
+                        "id": "stub-call",
+                    }
+                ],
+            )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[CallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        delay = self.sample_latency()
+        if self.timeout is not None and delay > self.timeout:
+            time.sleep(self.timeout)
+            raise TimeoutError(f"Stub request timed out after {self.timeout}s.")
+        if delay:
+            time.sleep(delay)
+        return self._respond(kwargs.get("tools") or [])
+
+    async def _agenerate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Optional[AsyncCallbackManagerForLLMRun] = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        delay = self.sample_latency()
+        if self.timeout is not None and delay > self.timeout:
+            await asyncio.sleep(self.timeout)
+            raise TimeoutError(f"Stub request timed out after {self.timeout}s.")
+        if delay:
+            await asyncio.sleep(delay)
+        return self._respond(kwargs.get("tools") or [])
@@ -0,0 +1,89 @@
+"""Length-bounded digests of the approved specs for downstream prompts.
+
+The organization prompts used to embed the raw front-end and back-end
+descriptions and API designs, and every feedback round makes these longer.
+`spec_digests` builds all digests once per approved state. It is local and
+model-free: it keeps whole lines (or sentences, for single-paragraph text)
+in their original order, drops near-duplicates, and stops at a character
+budget. The result records a hash of its inputs, so an unchanged state
+reuses its digests and a changed one gets new ones.
+"""
+
+import hashlib
+import re
+from typing import List, Optional
+
+from react_agent.compress import dedupe
+from react_agent.schemas import DeveloperState, SpecDigests
+
+_SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9`\"'(])")
+
+
+def units(text: str) -> List[str]:
+    """Split `text` into lines, or into sentences when it is a single paragraph."""
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    if len(lines) > 1:
+        return lines
+    return [s for s in _SENTENCE_END.split(" ".join(text.split())) if s]
+
+
+def bounded(text: Optional[str], max_chars: int, threshold: float = 0.7) -> str:
+    """Return `text` cut to at most `max_chars` characters of whole lines or sentences.
+
+    Near-duplicate units are dropped first. Units that do not fit are skipped
+    so that shorter later ones can still be kept; a single oversized unit is
+    cut at a word boundary.
+    """
+    text = (text or "").strip()
+    if len(text) <= max_chars:
+        return text
+    parts = units(text)
+    separator = "\n" if "\n" in text and len(parts) > 1 else " "
+    kept: List[str] = []
+    size = 0
+    for part in dedupe(parts, threshold):
+        cost = len(part) + (len(separator) if kept else 0)
+        if size + cost <= max_chars:
+            kept.append(part)
+            size += cost
+    if not kept:
+        kept = [parts[0][:max_chars].rsplit(" ", 1)[0]]
+    return separator.join(kept)
+
+
+def content_hash(*parts: Optional[str]) -> str:
+    """Return a short hash identifying the digest inputs."""
+    digest = hashlib.blake2b(digest_size=16)
+    for part in parts:
+        digest.update((part or "").encode())
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def source_hash(state: DeveloperState, requirements: str, max_chars: int) -> str:
+    """Hash the state content the digests are built from."""
+    return content_hash(
+        str(max_chars),
+        requirements,
+        state.front_end.requirements.model_dump_json() if state.front_end else None,
+        state.back_end.requirements.model_dump_json() if state.back_end else None,
+    )
+
+
+def spec_digests(
+    state: DeveloperState, requirements: str, max_chars: int
+) -> SpecDigests:
+    """Return the state's digests, rebuilding them only when their inputs changed."""
+    key = source_hash(state, requirements, max_chars)
+    if state.spec_digests is not None and state.spec_digests.source_hash == key:
+        return state.spec_digests
+    front_end = state.front_end.requirements if state.front_end else None
+    back_end = state.back_end.requirements if state.back_end else None
+    return SpecDigests(
+        source_hash=key,
+        requirements=bounded(requirements, max_chars),
+        front_end=bounded(front_end.description if front_end else "", max_chars),
+        front_end_api=bounded(front_end.api_design if front_end else "", max_chars),
+        back_end=bounded(back_end.description if back_end else "", max_chars),
+        back_end_api=bounded(back_end.api_endpoints if back_end else "", max_chars),
+    )
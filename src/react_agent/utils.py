@@ -1,5 +1,7 @@
 """Utility & helper functions."""
 
+from typing import Any
+
 from langchain.chat_models import init_chat_model
 from langchain_core.language_models import BaseChatModel
 from langchain_core.messages import BaseMessage
@@ -17,11 +19,19 @@ def get_message_text(msg: BaseMessage) -> str:
         return "".join(txts).strip()
 
 
-def load_chat_model(fully_specified_name: str) -> BaseChatModel:
+def load_chat_model(fully_specified_name: str, **kwargs: Any) -> BaseChatModel:
     """Load a chat model from a fully specified name.
 
     Args:
         fully_specified_name (str): String in the format 'provider/model'.
+            The 'stub' provider returns the offline `StubChatModel`, configured
+            by `StubChatModel.from_spec`.
+        **kwargs: Extra parameters for the provider's chat model.
     """
     provider, model = fully_specified_name.split("/", maxsplit=1)
-    return init_chat_model(model, model_provider=provider)
+    if provider == "stub":
+        from react_agent.stub import StubChatModel
+
+        return StubChatModel.from_spec(model, timeout=kwargs.get("timeout"))
+    chat_model: BaseChatModel = init_chat_model(model, model_provider=provider, **kwargs)
+    return chat_model
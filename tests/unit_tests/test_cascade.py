@@ -0,0 +1,42 @@
+from langchain_core.exceptions import OutputParserException
+from langchain_core.runnables import RunnableLambda
+
+from react_agent import graph
+from react_agent.cascade import CascadeModel, escalation_rates
+from react_agent.checks import problems
+from react_agent.metrics import METRICS, Metrics
+from react_agent.schemas import CodeOrganization
+
+
+def _raise(_: object) -> str:
+    raise OutputParserException("invalid tool call")
+
+
+def test_cascade_escalates_only_on_failed_checks_or_validation() -> None:
+    metrics = Metrics()
+    strong = RunnableLambda(lambda _: "strong")
+    check = lambda output: ["unusable"] if output == "bad" else []  # noqa: E731
+
+    def cascade(cheap: RunnableLambda) -> CascadeModel:
+        return CascadeModel(cheap, strong, "node", check=check, metrics=metrics)
+
+    assert cascade(RunnableLambda(lambda _: "cheap")).invoke("hi") == "cheap"
+    assert cascade(RunnableLambda(lambda _: "bad")).invoke("hi") == "strong"
+    assert cascade(RunnableLambda(_raise)).invoke("hi") == "strong"
+
+    assert metrics.count("node", "cascade_calls") == 3
+    assert metrics.count("node", "cascade_escalations") == 2
+    assert escalation_rates(metrics) == {"node": 2 / 3}
+
+
+def test_graph_metrics_are_readable_through_the_package() -> None:
+    before = METRICS.count("organize_back_end_code", "cascade_calls")
+    graph.invoke(
+        {"topic": "Cascade metrics app", "human_feedback": "approve"},
+        {"configurable": {"model": "stub/default", "cascade_model": "stub/default"}},
+    )
+    assert METRICS.count("organize_back_end_code", "cascade_calls") == before + 1
+    assert problems(CodeOrganization(folders=[])) == [
+        "The organization has no folders.",
+        "No endpoint file found in the organization.",
+    ]
@@ -0,0 +1,46 @@
+from react_agent import graph
+from react_agent.checks import coverage
+from react_agent.schemas import CodeGeneration, CodeOrganization, File, Folder
+
+
+def _organization() -> CodeOrganization:
+    return CodeOrganization(
+        folders=[
+            Folder(
+                name="api",
+                files=[File(name="tasks.py", description="Task routes.", methods=[])],
+                endpoint_file=File(
+                    name="main.py", description="FastAPI app.", methods=[]
+                ),
+            )
+        ]
+    )
+
+
+def test_coverage_reports_missing_and_extra_files() -> None:
+    report = coverage(
+        _organization(),
+        [
+            CodeGeneration(
+                folder_name="api", file_name="main.py", code="app = FastAPI()"
+            ),
+            CodeGeneration(folder_name="api", file_name="users.py", code=""),
+        ],
+    )
+    assert report.missing_files == ["api/tasks.py"]
+    assert report.extra_files == ["api/users.py"]
+
+
+def test_generation_merges_code_into_the_organization() -> None:
+    result = graph.invoke(
+        {"topic": "Todo app", "human_feedback": "approve"},
+        {"configurable": {"model": "stub/default"}},
+    )
+    # The stub makes up folder and file names, so nothing lines up
+    report = result["back_end_generation_report"]
+    assert report.extra_files == ["stub folder_name/stub file_name"]
+    assert len(report.missing_files) == 2
+    generated = result["generate_backend_code"]
+    assert [f.name for f in generated.folders] == [
+        f.name for f in result["back_end_organization"].folders
+    ]
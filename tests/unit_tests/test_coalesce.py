@@ -0,0 +1,86 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from langchain_core.messages import HumanMessage, SystemMessage
+from langchain_core.runnables import RunnableLambda
+
+from react_agent.coalesce import CoalescedModel, SingleFlight
+from react_agent.metrics import Metrics
+from react_agent.node import structured_model
+from react_agent.schemas import CodeOrganization
+
+
+def test_identical_in_flight_requests_share_one_call() -> None:
+    calls = []
+
+    def upstream(messages):
+        calls.append(messages)
+        time.sleep(0.2)
+        return {"answer": len(calls)}
+
+    metrics = Metrics()
+    model = CoalescedModel(
+        RunnableLambda(upstream), "node", "stub|Schema", SingleFlight(), metrics
+    )
+    same = [SystemMessage(content="Plan a todo app."), HumanMessage(content="Go.")]
+    other = [SystemMessage(content="Plan a chat app."), HumanMessage(content="Go.")]
+
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        results = list(pool.map(model.invoke, [same] * 5 + [other]))
+
+    assert len(calls) == 2
+    assert all(result is results[0] for result in results[:5])
+    assert metrics.count("node", "coalesce_leaders") == 2
+    assert metrics.count("node", "coalesced") == 4
+
+    # Once the call has returned, the next identical request goes upstream again
+    model.invoke(same)
+    assert len(calls) == 3
+
+
+def test_followers_receive_the_leaders_exception() -> None:
+    def upstream(_):
+        time.sleep(0.2)
+        raise TimeoutError("slow model")
+
+    model = CoalescedModel(
+        RunnableLambda(upstream), "node", "stub|Schema", SingleFlight(), Metrics()
+    )
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        futures = [
+            pool.submit(model.invoke, [HumanMessage(content="Go.")]) for _ in range(3)
+        ]
+    for future in futures:
+        with pytest.raises(TimeoutError):
+            future.result()
+
+
+def _prefix(**configurable):
+    model = structured_model(
+        CodeOrganization,
+        {
+            "configurable": {
+                "model": "stub/default",
+                "coalesce_requests": True,
+                **configurable,
+            },
+            "metadata": {"langgraph_node": "organize_back_end_code"},
+        },
+    )
+    return model.prefix
+
+
+def test_requests_only_coalesce_under_the_same_call_settings() -> None:
+    model = structured_model(
+        CodeOrganization, {"configurable": {"model": "stub/default"}}
+    )
+    assert not isinstance(model, CoalescedModel)
+
+    base = _prefix()
+    assert _prefix(tenant="other") == base
+    assert _prefix(default_node_timeout=5) != base
+    assert _prefix(node_timeouts={"organize_back_end_code": 5}) != base
+    assert _prefix(node_timeouts={"generate_back_end_code": 5}) == base
+    assert _prefix(hedge_percentile=95) != base
+    assert _prefix(best_of_n={"organize_back_end_code": 3}) != base
@@ -0,0 +1,28 @@
+from react_agent import graph
+from react_agent.compact import compact_model, expand, schema_tokens, tokens_saved
+from react_agent.schemas import CodeOrganization, FunctionalRequirements
+from react_agent.serialization import sample_project
+
+
+def test_compact_model_round_trips_losslessly() -> None:
+    project = sample_project(2)
+    compact = compact_model(CodeOrganization).model_validate(project.model_dump())
+
+    expanded = expand(compact, CodeOrganization)
+    assert isinstance(expanded, CodeOrganization)
+    assert expanded.model_dump() == project.model_dump()
+
+
+def test_compact_schemas_are_smaller() -> None:
+    for model in (CodeOrganization, FunctionalRequirements):
+        assert schema_tokens(compact_model(model)) < schema_tokens(model)
+        assert tokens_saved(model) > 0
+
+
+def test_graph_runs_with_compact_schemas() -> None:
+    result = graph.invoke(
+        {"topic": "Todo app", "human_feedback": "approve"},
+        {"configurable": {"model": "stub/default", "compact_schemas": True}},
+    )
+    assert result["back_end_organization"].folders
+    assert result["project_setup_instructions"].front_end_setup
@@ -0,0 +1,19 @@
+from react_agent.compress import dedupe, numbered, similarity
+
+
+def test_dedupe_drops_near_duplicates_and_keeps_longer_wording() -> None:
+    texts = [
+        "Users can create tasks with a title.",
+        "Users can tag tasks.",
+        "users can create tasks with a title!",
+        "Users can create new tasks with a title.",
+    ]
+    assert similarity(texts[0], texts[2]) == 1.0
+    assert dedupe(texts) == [
+        "Users can create new tasks with a title.",
+        "Users can tag tasks.",
+    ]
+
+
+def test_numbered_renders_compact_list() -> None:
+    assert numbered(["a", "b"]) == "1. a\n2. b"
@@ -0,0 +1,173 @@
+from langchain_core.runnables import RunnableLambda
+
+from react_agent import node
+from react_agent.contract import backend_routes, check, frontend_calls
+from react_agent.schemas import (
+    CodeGeneration,
+    CodeOrganization,
+    DeveloperState,
+    File,
+    Folder,
+    GeneratedCode,
+)
+
+BACK_END = """
+from fastapi import APIRouter, FastAPI
+from pydantic import BaseModel, Field
+from typing import Optional
+
+app = FastAPI()
+router = APIRouter(prefix="/api")
+
+class TaskBase(BaseModel):
+    title: str
+    due_date: Optional[str] = None
+
+class TaskCreate(TaskBase):
+    priority: int = Field(..., ge=1)
+
+@router.get("/tasks")
+def list_tasks():
+    return []
+
+@router.post("/tasks")
+async def create_task(task: TaskCreate):
+    return task
+
+@router.put("/tasks/{task_id}")
+def update_task(task_id: int, task: TaskBase):
+    return task
+
+app.include_router(router)
+"""
+
+FRONT_END = """
+import axios from 'axios';
+
+const API_URL = process.env.REACT_APP_API_URL || 'http://localhost:8000/api';
+const client = axios.create({ baseURL: API_URL });
+
+export const fetchTasks = () => fetch(`${API_URL}/tasks`).then((r) => r.json());
+export const createTask = (title, dueDate) =>
+  fetch(`${API_URL}/tasks`, {
+    method: 'POST',
+    body: JSON.stringify({ title, due: dueDate }),
+  });
+export const updateTask = (id, task) => client.patch(`/tasks/${id}`, { title: task.title });
+export const fetchStats = () => client.get('/stats');
+export const searchTasks = (q) => client.get(`/task?query=${q}`);
+"""
+
+
+def _organization(folder: str, name: str, code: str) -> CodeOrganization:
+    endpoint = File(name=name, description="API", methods=[], code=code)
+    other = File(name="README.md", description="Notes", methods=[], code="notes")
+    return CodeOrganization(
+        folders=[Folder(name=folder, files=[other], endpoint_file=endpoint)]
+    )
+
+
+def test_parses_routes_and_calls() -> None:
+    routes, errors = backend_routes({"app/main.py": BACK_END})
+    assert errors == []
+    assert {(r.method, r.path) for r in routes} == {
+        ("get", "/api/tasks"),
+        ("post", "/api/tasks"),
+        ("put", "/api/tasks/{task_id}"),
+    }
+    create = next(r for r in routes if r.method == "post")
+    assert create.body_keys == {"title", "due_date", "priority"}
+    assert create.required_keys == {"title", "priority"}
+
+    calls = frontend_calls("src/api.js", FRONT_END)
+    assert [(c.method, c.path, c.line) for c in calls] == [
+        ("get", "/api/tasks", 7),
+        ("post", "/api/tasks", 9),
+        ("patch", "/api/tasks/{}", 13),
+        ("get", "/api/stats", 14),
+        ("get", "/api/task", 15),
+    ]
+    assert calls[1].body_keys == {"title", "due"}
+
+
+def test_check_reports_each_mismatch_against_the_file_to_fix() -> None:
+    report = check(
+        _organization("src", "api.js", FRONT_END),
+        _organization("app", "main.py", BACK_END),
+    )
+    assert [(m.kind, m.file) for m in report] == [
+        ("payload", "src/api.js"),
+        ("method", "src/api.js"),
+        ("missing_route", "app/main.py"),
+        ("path", "src/api.js"),
+    ]
+    assert (
+        "sends due" in report[0].detail
+        and "omits required priority" in report[0].detail
+    )
+    assert "only with PUT" in report[1].detail
+    assert "GET /api/tasks" in report[3].detail
+
+
+def test_fix_contract_rewrites_only_reported_files(monkeypatch) -> None:
+    fixed = FRONT_END.replace("due: dueDate", "due_date: dueDate, priority: 1")
+    fixed = fixed.replace("client.patch", "client.put")
+    fixed = fixed.replace("client.get(`/task?query", "client.get(`/tasks?query")
+    fixed = fixed.replace("export const fetchStats = () => client.get('/stats');\n", "")
+    route = "\n@router.get('/stats')\ndef stats():\n    return {}\n"
+    back_end = BACK_END.replace("app.include_router", route + "app.include_router")
+    generated = GeneratedCode(
+        files=[
+            CodeGeneration(folder_name="src", file_name="api.js", code=fixed),
+            CodeGeneration(folder_name="app", file_name="main.py", code=back_end),
+            CodeGeneration(folder_name="src", file_name="README.md", code="rewritten"),
+        ]
+    )
+    monkeypatch.setattr(
+        node,
+        "structured_model",
+        lambda schema, config: RunnableLambda(lambda _: generated),
+    )
+
+    state = DeveloperState(
+        topic="Todo app",
+        generate_frontend_code=_organization("src", "api.js", FRONT_END),
+        generate_backend_code=_organization("app", "main.py", BACK_END),
+    )
+    state.contract_report = node.check_contract(state, {})["contract_report"]
+    assert node.route_contract(state, {}) == "fix_contract"
+
+    update = node.fix_contract(state, {})
+    assert update["contract_report"] == []
+    assert sorted(update["contract_fixed_files"]) == ["app/main.py", "src/api.js"]
+    assert update["generate_frontend_code"].folders[0].files[0].code == "notes"
+
+
+def test_routers_in_modules_with_the_same_name_keep_their_prefixes() -> None:
+    main = """
+from fastapi import FastAPI
+from routers import tasks
+from models.tasks import router as model_router
+
+app = FastAPI()
+app.include_router(tasks.router, prefix="/api")
+app.include_router(model_router, prefix="/admin")
+"""
+    routes, errors = backend_routes(
+        {
+            "main.py": main,
+            "routers/tasks.py": (
+                "from fastapi import APIRouter\nrouter = APIRouter(prefix='/tasks')\n\n"
+                "@router.get('/')\ndef list_tasks():\n    return []\n"
+            ),
+            "models/tasks.py": (
+                "from fastapi import APIRouter\nrouter = APIRouter(prefix='/models')\n\n"
+                "@router.get('/')\ndef list_models():\n    return []\n"
+            ),
+        }
+    )
+    assert errors == []
+    assert {(r.file, r.path) for r in routes} == {
+        ("routers/tasks.py", "/api/tasks/"),
+        ("models/tasks.py", "/admin/models/"),
+    }
@@ -0,0 +1,129 @@
+import json
+
+from react_agent import graph
+from react_agent.dependencies import (
+    NPM,
+    PYPI,
+    dependency_files,
+    learned,
+    load_packages,
+    resolve,
+    save_packages,
+)
+from react_agent.schemas import RequiredFramework, ResolvedPackage
+
+
+def _framework(name: str, instructions: str = None) -> RequiredFramework:
+    return RequiredFramework(
+        name=name, description=f"Uses {name}.", installation_instructions=instructions
+    )
+
+
+def test_resolves_from_table_and_install_commands() -> None:
+    table = load_packages()
+    packages, unknown = resolve(
+        [
+            _framework("React.js"),
+            _framework("React Router"),
+            _framework("CSS"),
+            _framework("Sortable", "Run `npm install --save-dev sortablejs@1.15.2`"),
+            _framework("Mystery"),
+        ],
+        NPM,
+        table,
+    )
+    assert [(p.name, p.version, p.dev) for p in packages] == [
+        ("react", "^18.3.1", False),
+        ("react-router-dom", "^6.26.0", False),
+        ("sortablejs", "1.15.2", True),
+    ]
+    assert [f.name for f in unknown] == ["Mystery"]
+
+    packages, _ = resolve(
+        [_framework("SQLAlchemy"), _framework("slowapi", "pip install slowapi>=0.1.9")],
+        PYPI,
+        table,
+    )
+    files = dependency_files("Todo app", [], packages)
+    assert files["back_end/requirements.txt"].splitlines() == [
+        "fastapi>=0.110",
+        "uvicorn[standard]>=0.29",
+        "SQLAlchemy>=2.0",
+        "slowapi>=0.1.9",
+    ]
+    assert (
+        json.loads(dependency_files("Todo app", [], [])["front_end/package.json"])[
+            "name"
+        ]
+        == "todo-app"
+    )
+
+
+def test_install_commands_without_a_project_package_are_unresolved() -> None:
+    table = load_packages()
+    packages, unknown = resolve(
+        [
+            _framework("Placeholder", "Run pip install <package> in your venv"),
+            _framework("Requirements", "pip install -r requirements.txt"),
+            _framework("Editable", "pip install -e ."),
+            _framework("Upgrade", "pip install --upgrade pip"),
+            _framework("Limiter", "pip install --upgrade pip && pip install slowapi"),
+        ],
+        PYPI,
+        table,
+    )
+    assert [p.name for p in packages] == ["slowapi"]
+    assert [f.name for f in unknown] == [
+        "Placeholder",
+        "Requirements",
+        "Editable",
+        "Upgrade",
+    ]
+
+    packages, unknown = resolve(
+        [_framework("Scaffolder", "npm install -g create-vite")], NPM, table
+    )
+    assert packages == [] and [f.name for f in unknown] == ["Scaffolder"]
+
+
+def test_learned_packages_are_saved_and_reloaded(tmp_path) -> None:
+    path = str(tmp_path / "packages.json")
+    resolved = learned(
+        [
+            ResolvedPackage(
+                framework="Sortable",
+                ecosystem="npm",
+                package="sortablejs",
+                version="^1.15.2",
+            ),
+            ResolvedPackage(framework="Web Storage", ecosystem="npm", package=None),
+            ResolvedPackage(
+                framework="Bogus", ecosystem="npm", package="not a package"
+            ),
+        ]
+    )
+    save_packages(path, resolved)
+
+    packages, unknown = resolve(
+        [_framework("Sortable"), _framework("Web Storage"), _framework("Bogus")],
+        NPM,
+        load_packages(path),
+    )
+    assert [p.name for p in packages] == ["sortablejs"]
+    assert [f.name for f in unknown] == ["Bogus"]
+
+
+def test_required_software_builds_setup_without_a_full_model_call() -> None:
+    result = graph.invoke(
+        {"topic": "Todo app", "human_feedback": "approve"},
+        {"configurable": {"model": "stub/default"}},
+    )
+    assert set(result["dependency_files"]) == {
+        "front_end/package.json",
+        "back_end/requirements.txt",
+    }
+    assert "npm install" in result["project_setup_instructions"].front_end_setup
+    # The stub's made-up framework names cannot be resolved to real packages
+    assert (
+        "Install these manually" in result["project_setup_instructions"].back_end_setup
+    )
@@ -0,0 +1,66 @@
+import itertools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from react_agent.hedging import HedgedModel, call_with_deadline
+from react_agent.metrics import Metrics
+from react_agent.schemas import Folder
+from react_agent.utils import load_chat_model
+
+
+def test_hedge_wins_when_first_call_stalls() -> None:
+    metrics = Metrics()
+    delays = itertools.chain([1.0], itertools.repeat(0.0))
+
+    def call() -> float:
+        delay = next(delays)
+        time.sleep(delay)
+        return delay
+
+    assert (
+        call_with_deadline(call, "node", timeout=5, hedge_delay=0.05, metrics=metrics)
+        == 0.0
+    )
+    assert metrics.count("node", "hedge_fired") == 1
+    assert metrics.count("node", "hedge_won") == 1
+
+
+def test_timeout_raises_and_is_counted() -> None:
+    metrics = Metrics()
+    with pytest.raises(TimeoutError):
+        call_with_deadline(
+            lambda: time.sleep(0.5), "node", timeout=0.05, metrics=metrics
+        )
+    assert metrics.count("node", "timeouts") == 1
+
+
+def test_stalled_requests_are_aborted_by_the_client() -> None:
+    metrics = Metrics()
+    stalled = HedgedModel(
+        load_chat_model("stub/latency=10", timeout=0.2).with_structured_output(Folder),
+        "node",
+        timeout=0.2,
+        metrics=metrics,
+    )
+    healthy = HedgedModel(
+        load_chat_model("stub/default", timeout=0.2).with_structured_output(Folder),
+        "node",
+        timeout=0.2,
+        metrics=metrics,
+    )
+    threads = threading.active_count()
+
+    start = time.perf_counter()
+    # More stalled calls than any fixed worker pool would hold
+    with ThreadPoolExecutor(max_workers=64) as pool:
+        stalls = [pool.submit(stalled.invoke, "Name a folder.") for _ in range(64)]
+        assert healthy.invoke("Name a folder.").name
+        for future in stalls:
+            with pytest.raises(TimeoutError):
+                future.result()
+    assert time.perf_counter() - start < 2
+    assert metrics.count("node", "timeouts") == 64
+    assert threading.active_count() <= threads
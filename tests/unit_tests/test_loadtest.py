@@ -0,0 +1,39 @@
+import asyncio
+import os
+
+import pytest
+
+from react_agent import graph
+from react_agent.loadtest import compare, rss_bytes, run_level
+
+
+def test_run_level_reports_latency_and_loop_lag() -> None:
+    report = asyncio.run(
+        run_level(graph, concurrency=4, runs=8, model="stub/latency=0.001")
+    )
+    assert report["errors"] == {}
+    assert report["throughput_rps"] > 0
+    assert report["latency_p50"] <= report["latency_p99"]
+    assert "loop_lag_p99" in report
+    assert report["memory_per_run_bytes"] >= 0
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/statm"), reason="needs /proc")
+def test_rss_is_current_not_peak() -> None:
+    before = rss_bytes()
+    block = bytearray(64 * 1024 * 1024)
+    block[::4096] = b"x" * len(block[::4096])  # Touch every page so it is resident
+    assert rss_bytes() - before > 32 * 1024 * 1024
+    del block
+    assert rss_bytes() - before < 32 * 1024 * 1024
+
+
+def test_compare_reports_relative_change() -> None:
+    old = {
+        "levels": [{"concurrency": 50, "runs": 100, "errors": {}, "latency_p99": 2.0}]
+    }
+    new = {
+        "levels": [{"concurrency": 50, "runs": 100, "errors": {}, "latency_p99": 1.0}]
+    }
+    (line,) = compare(old, new)
+    assert "latency_p99" in line and "-50.0%" in line
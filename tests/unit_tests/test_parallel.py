@@ -0,0 +1,108 @@
+from langchain_core.runnables import RunnableLambda
+
+from react_agent import graph, node
+from react_agent.profiling import Tracer
+from react_agent.schemas import (
+    BackEndDependencies,
+    BackEndRequirements,
+    DeveloperState,
+    FrontEndDependencies,
+    FrontEndRequirements,
+)
+
+
+def _span(tracer: Tracer, name: str):
+    return next(span for span in tracer.spans if span["name"] == name)
+
+
+def test_parallel_design_overlaps_front_and_back_end() -> None:
+    tracer = Tracer()
+    result = graph.invoke(
+        {"topic": "Todo app", "human_feedback": "approve"},
+        {
+            "callbacks": [tracer],
+            "configurable": {"model": "stub/latency=0.2", "parallel_design": True},
+        },
+    )
+    front, back = _span(tracer, "front_end_process"), _span(tracer, "back_end_process")
+    assert back["ts"] < front["ts"] + front["dur"]
+    assert _span(tracer, "reconcile_back_end")["ts"] >= back["ts"] + back["dur"]
+    assert result["back_end_organization"] is not None
+
+
+def _state(
+    api_endpoints: str,
+    api_design: str = "GET /api/tasks lists tasks; POST /api/tasks creates one.",
+) -> DeveloperState:
+    return DeveloperState(
+        topic="Todo app",
+        front_end=FrontEndDependencies(
+            requirements=FrontEndRequirements(
+                description="Task list", api_design=api_design
+            ),
+            frameworks=[],
+        ),
+        back_end=BackEndDependencies(
+            requirements=BackEndRequirements(
+                description="FastAPI app", api_endpoints=api_endpoints
+            ),
+            frameworks=[],
+        ),
+    )
+
+
+def test_reconcile_runs_only_when_the_api_disagrees(monkeypatch) -> None:
+    aligned = BackEndRequirements(
+        description="FastAPI app", api_endpoints="GET /api/tasks, POST /api/tasks"
+    )
+    calls = []
+
+    def fake_model(schema, config):
+        return RunnableLambda(lambda messages: calls.append(messages) or aligned)
+
+    monkeypatch.setattr(node, "structured_model", fake_model)
+    config = {"configurable": {"parallel_design": True}}
+
+    assert (
+        node.reconcile_back_end(_state("GET /api/tasks/ and POST /api/tasks"), config)
+        == {}
+    )
+    assert calls == []
+
+    update = node.reconcile_back_end(_state("GET /tasks"), config)
+    assert update["back_end"].requirements == aligned
+    assert "POST /api/tasks" in calls[0][0].content
+
+
+def test_reconcile_runs_when_the_front_end_api_cannot_be_checked(monkeypatch) -> None:
+    calls = []
+    aligned = BackEndRequirements(description="FastAPI app", api_endpoints="GET /items")
+    monkeypatch.setattr(
+        node,
+        "structured_model",
+        lambda schema, config: RunnableLambda(
+            lambda messages: calls.append(messages) or aligned
+        ),
+    )
+    config = {"configurable": {"parallel_design": True}}
+
+    # Prose without a literal `METHOD /path`
+    node.reconcile_back_end(
+        _state("POST /items", "The app loads and saves the user's items."), config
+    )
+    assert "names no `METHOD /path` endpoints" in calls[0][0].content
+
+    # Same endpoint, different fields
+    fields = _state(
+        "GET /api/tasks returns [{id, name}]",
+        "GET /api/tasks returns [{id, title, due_date}]",
+    )
+    node.reconcile_back_end(fields, config)
+    assert "data fields: title, due_date" in calls[1][0].content
+
+    same = _state(
+        "GET /api/tasks returns [{id, title, due_date}]",
+        "GET /api/tasks/ returns [{id, title, due_date}]",
+    )
+    assert node.reconcile_back_end(same, config) == {}
+    assert len(calls) == 2
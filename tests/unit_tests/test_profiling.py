@@ -0,0 +1,22 @@
+import json
+
+from react_agent import graph
+from react_agent.profiling import Tracer
+
+
+def test_tracer_records_node_and_phase_spans(tmp_path) -> None:
+    tracer = Tracer()
+    graph.invoke(
+        {"topic": "Todo app with tags", "human_feedback": "approve"},
+        {"callbacks": [tracer], "configurable": {"model": "stub/default"}},
+    )
+
+    names = {span["name"] for span in tracer.spans}
+    assert {"process_requirements", "required_software"} <= names
+    assert {"format_prompt", "invoke_model", "scheduling"} <= names
+    assert any(span["cat"] == "llm" for span in tracer.spans)
+
+    path = tmp_path / "trace.json"
+    tracer.export(str(path))
+    events = json.loads(path.read_text())["traceEvents"]
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
@@ -0,0 +1,167 @@
+from langchain_core.runnables import RunnableLambda
+from langgraph.checkpoint.memory import MemorySaver
+
+from react_agent import node
+from react_agent.graph import edit_builder
+from react_agent.regenerate import changed_requirements, merge, plan
+from react_agent.schemas import (
+    CodeGeneration,
+    CodeOrganization,
+    DeveloperState,
+    File,
+    Folder,
+    FunctionalRequirements,
+    GeneratedCode,
+    Method,
+    Requirement,
+)
+
+
+def _file(name: str, description: str, methods=(), code: str = "") -> File:
+    return File(
+        name=name,
+        description=description,
+        methods=[
+            Method(name=m, signature=f"{m}()", return_statement="", description="")
+            for m in methods
+        ],
+        code=code,
+    )
+
+
+def _projects():
+    front_end = CodeOrganization(
+        folders=[
+            Folder(
+                name="components",
+                files=[
+                    _file(
+                        "TagPicker.js",
+                        "Lets the user choose tags for a task",
+                        code="fetchTags()",
+                    ),
+                    _file("Header.js", "Shows the application title", code="<h1/>"),
+                ],
+            ),
+            Folder(
+                name="api",
+                endpoint_file=_file(
+                    "api.js", "API calls", ["fetchTags"], code="fetch('/tags')"
+                ),
+            ),
+        ]
+    )
+    back_end = CodeOrganization(
+        folders=[
+            Folder(
+                name="app",
+                files=[
+                    _file("storage.py", "In-memory storage of tasks", code="TASKS = []")
+                ],
+                endpoint_file=_file(
+                    "main.py",
+                    "Endpoints for tasks and tags",
+                    ["list_tags"],
+                    code="@app.get('/tags')",
+                ),
+            ),
+        ]
+    )
+    return front_end, back_end
+
+
+def test_changed_requirements_ignores_rewordings() -> None:
+    old = ["Users can create tasks.", "Users can tag tasks."]
+    new = ["Users can create tasks!", "Users can choose tag colors."]
+    assert changed_requirements(old, new) == [
+        "Users can choose tag colors.",
+        "Users can tag tasks.",
+    ]
+
+
+def test_plan_reaches_only_related_files_and_the_contract() -> None:
+    front_end, back_end = _projects()
+    front, back = plan(front_end, back_end, ["Tags picker should choose tags colors"])
+    assert front == {("components", "TagPicker.js"), ("api", "api.js")}
+    assert back == {("app", "main.py")}
+
+
+def test_merge_keeps_untouched_files_identical() -> None:
+    front_end, _ = _projects()
+    allowed = {("components", "TagPicker.js")}
+    merged, keys = merge(
+        front_end,
+        [
+            CodeGeneration(
+                folder_name="components", file_name="TagPicker.js", code="new"
+            ),
+            CodeGeneration(
+                folder_name="components", file_name="Header.js", code="ignored"
+            ),
+        ],
+        allowed,
+    )
+    assert keys == [("components", "TagPicker.js")]
+    assert merged.folders[0].files[0].code == "new"
+    assert merged.folders[0].files[1].code == "<h1/>"
+    assert front_end.folders[0].files[0].code == "fetchTags()"
+
+
+def test_edits_on_one_thread_diff_against_the_previous_edit(monkeypatch) -> None:
+    front_end, back_end = _projects()
+    prompts = []
+
+    def regenerate(messages):
+        prompts.append(messages[0].content)
+        return GeneratedCode(
+            files=[
+                CodeGeneration(
+                    folder_name="components", file_name="TagPicker.js", code="new"
+                ),
+            ]
+        )
+
+    monkeypatch.setattr(
+        node, "structured_model", lambda schema, config: RunnableLambda(regenerate)
+    )
+    app = edit_builder.compile(checkpointer=MemorySaver())
+    config = {"configurable": {"model": "stub/default", "thread_id": "edits"}}
+    old = ["Users can create tasks.", "The header shows the application title."]
+    first = old + ["Tags picker should choose tags colors"]
+    second = first + ["Tags picker should sort tags by name"]
+
+    result = app.invoke(
+        DeveloperState(
+            topic="Todo app",
+            global_requirements=FunctionalRequirements(
+                requirements=[
+                    Requirement(
+                        description=d, suggestions="", presumptions="", questions=[]
+                    )
+                    for d in old
+                ]
+            ),
+            revised_requirements=first,
+            generate_frontend_code=front_end,
+            generate_backend_code=back_end,
+        ),
+        config,
+    )
+    assert "Tags picker should choose tags colors" in prompts[0]
+    assert result["regenerated_files"] == ["components/TagPicker.js"]
+    assert result["generate_frontend_code"].folders[0].files[1].code == "<h1/>"
+    assert [
+        req.description for req in result["global_requirements"].requirements
+    ] == first
+    assert (
+        result["revised_requirements"] is None
+        and result["changed_requirements"] is None
+    )
+
+    prompts.clear()
+    result = app.invoke({"revised_requirements": second}, config)
+    assert "Tags picker should sort tags by name" in prompts[0]
+    assert "Tags picker should choose tags colors" not in prompts[0]
+    assert [
+        req.description for req in result["global_requirements"].requirements
+    ] == second
@@ -0,0 +1,69 @@
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+from react_agent import graph
+from react_agent.reuse import ReuseIndex
+from react_agent.schemas import DeveloperState
+
+
+def test_similar_run_reuses_design(tmp_path) -> None:
+    config = {
+        "configurable": {
+            "model": "stub/default",
+            "reuse_index_path": str(tmp_path / "runs.jsonl"),
+        }
+    }
+    first = graph.invoke(
+        {"topic": "Todo app with tags", "human_feedback": "approve"}, config
+    )
+    assert first["reuse"] is None
+
+    second = graph.invoke(
+        {"topic": "Todo app with tags", "human_feedback": "approve"}, config
+    )
+    assert second["reuse"].similarity == 1.0
+    assert second["reuse"].skipped_stages == [
+        "front_end_process",
+        "back_end_process",
+        "organize_front_end_code",
+        "organize_back_end_code",
+    ]
+    assert second["front_end_organization"] == first["front_end_organization"]
+    # A design taken as-is is not indexed a second time
+    assert len(ReuseIndex(str(tmp_path / "runs.jsonl")).entries()) == 1
+
+    config["configurable"]["reuse_skip_threshold"] = 1.1
+    third = graph.invoke(
+        {"topic": "Todo app with tags", "human_feedback": "approve"}, config
+    )
+    assert third["reuse"].skipped_stages == []
+    assert len(third["reuse"].revised_stages) == 4
+    assert len(ReuseIndex(str(tmp_path / "runs.jsonl")).entries()) == 2
+
+
+def test_unreadable_lines_are_skipped(tmp_path, caplog) -> None:
+    path = tmp_path / "runs.jsonl"
+    index = ReuseIndex(str(path))
+    index.add(DeveloperState(topic="Todo app", requirements_digest="Tasks."))
+    with open(path, "a") as f:
+        f.write('["not", "an", "entry"]\n{"topic": "Half writ')
+    index.add(DeveloperState(topic="Recipe box", requirements_digest="Recipes."))
+
+    with caplog.at_level(logging.WARNING, logger="react_agent.reuse"):
+        entries = index.entries()
+    assert [entry["topic"] for entry in entries] == ["Todo app", "Recipe box"]
+    assert len(caplog.records) == 2
+    assert index.lookup("Recipe box", "Recipes.", 0.9, 1.0).topic == "Recipe box"
+
+
+def test_concurrent_adds_keep_every_line(tmp_path) -> None:
+    index = ReuseIndex(str(tmp_path / "runs.jsonl"))
+    states = [
+        DeveloperState(topic=f"App {i}", requirements_digest="x" * 100_000)
+        for i in range(20)
+    ]
+    with ThreadPoolExecutor(max_workers=20) as pool:
+        list(pool.map(index.add, states))
+    assert sorted(entry["topic"] for entry in index.entries()) == sorted(
+        state.topic for state in states
+    )
@@ -0,0 +1,68 @@
+import threading
+import time
+from unittest.mock import patch
+
+from react_agent import graph
+from react_agent.runner import JobQueue, run_job, stream_events, worker_main
+
+
+def test_worker_runs_queued_job_and_records_events(tmp_path) -> None:
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"))
+    job_id = queue.submit(
+        {"topic": "Todo app with tags", "human_feedback": "approve"},
+        {"configurable": {"model": "stub/default"}},
+    )
+
+    assert run_job(queue, graph, "test-worker")
+    assert not run_job(queue, graph, "test-worker")
+
+    job = queue.job(job_id)
+    assert job["status"] == "done"
+    assert job["result"]["project_setup_instructions"] is not None
+    nodes = [event["node"] for event in queue.events(job_id)]
+    assert nodes[0] == "process_requirements" and "required_software" in nodes
+
+    frames = list(stream_events(queue, job_id))
+    assert frames[-1].startswith("event: end") and '"done"' in frames[-1]
+    assert len(frames) == len(nodes) + 1
+
+
+def test_abandoned_jobs_are_requeued_then_failed(tmp_path) -> None:
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"), lease=0.05, max_attempts=2)
+    job_id = queue.submit({"topic": "Todo app"})
+
+    assert queue.claim("dead-worker")[0] == job_id
+    assert queue.claim("other-worker") is None
+    time.sleep(0.1)
+    assert queue.claim("new-worker")[0] == job_id
+
+    # The first worker lost the job, so it can neither renew nor finish it
+    assert not queue.renew(job_id, "dead-worker")
+    queue.finish(job_id, result={"stale": True}, worker="dead-worker")
+    assert queue.job(job_id)["status"] == "running"
+
+    time.sleep(0.1)
+    assert queue.claim("third-worker") is None
+    job = queue.job(job_id)
+    assert job["status"] == "failed" and "lease expired" in job["error"]
+    assert list(stream_events(queue, job_id))[-1].startswith("event: end")
+
+
+def test_worker_finishes_its_job_and_stops(tmp_path) -> None:
+    queue = JobQueue(str(tmp_path / "jobs.sqlite"))
+    job_id = queue.submit(
+        {"topic": "Graceful stop app", "human_feedback": "approve"},
+        {"configurable": {"model": "stub/latency=0.05"}},
+    )
+    stop = threading.Event()
+    worker = threading.Thread(
+        target=worker_main, args=(queue.path, None, 0.01, graph, stop)
+    )
+    with patch("react_agent.runner.signal.signal"):
+        worker.start()
+        while queue.job(job_id)["status"] == "queued":
+            time.sleep(0.01)
+        stop.set()
+        worker.join(timeout=30)
+    assert not worker.is_alive()
+    assert queue.job(job_id)["status"] == "done"
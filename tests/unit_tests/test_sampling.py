@@ -0,0 +1,131 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from react_agent import checks, graph
+from react_agent.hedging import HedgedModel
+from react_agent.metrics import Metrics
+from react_agent.sampling import BestOfNModel, NoValidSample
+from react_agent.schemas import CodeOrganization, File, Folder
+
+
+def _organization(*endpoints: str) -> CodeOrganization:
+    return CodeOrganization(
+        folders=[
+            Folder(
+                name=f"folder{i}",
+                files=[],
+                endpoint_file=File(name=name, description="FastAPI app.", methods=[]),
+            )
+            for i, name in enumerate(endpoints)
+        ]
+    )
+
+
+def _sample(output, delay: float, calls: list):
+    def call(_):
+        calls.append(output)
+        time.sleep(delay)
+        return output
+
+    return RunnableLambda(call)
+
+
+def test_first_valid_sample_wins() -> None:
+    calls: list = []
+    invalid = _organization("main.py", "app.py")
+    valid = _organization("main.py")
+    metrics = Metrics()
+    model = BestOfNModel(
+        [
+            _sample(invalid, 0.0, calls),
+            _sample(valid, 0.1, calls),
+            _sample(valid, 0.5, calls),
+        ],
+        "node",
+        metrics=metrics,
+    )
+
+    start = time.perf_counter()
+    assert model.invoke("Organize the code.") is valid
+    assert time.perf_counter() - start < 0.4
+    assert metrics.count("node", "samples_sent") == 3
+    assert metrics.count("node", "samples_rejected") == 1
+    # The slow valid sample was already sent; it runs to completion unused
+    assert metrics.count("node", "samples_dropped") == 1
+    assert metrics.count("node", "samples_not_sent") == 0
+
+
+def test_all_invalid_samples_raise() -> None:
+    invalid = _organization()
+    model = BestOfNModel([_sample(invalid, 0.0, [])] * 2, "node", metrics=Metrics())
+    with pytest.raises(NoValidSample, match="No endpoint file"):
+        model.invoke("Organize the code.")
+
+
+def test_stagger_skips_extra_samples_when_the_first_is_fast() -> None:
+    calls: list = []
+    valid = _organization("main.py")
+    metrics = Metrics()
+    model = BestOfNModel(
+        [_sample(valid, 0.0, calls)] * 3, "node", stagger=0.5, metrics=metrics
+    )
+
+    assert model.invoke("Organize the code.") is valid
+    assert len(calls) == 1
+    assert metrics.count("node", "samples_not_sent") == 2
+    assert metrics.count("node", "samples_dropped") == 0
+
+
+def test_samples_nested_in_hedged_calls_do_not_exhaust_the_pool() -> None:
+    valid = _organization("main.py")
+    sample = _sample(valid, 0.05, [])
+    metrics = Metrics()
+    # Many concurrent calls, each waiting on samples it started itself
+    sampled = BestOfNModel([sample] * 3, "node", metrics=metrics)
+    model = HedgedModel(sampled, "node", timeout=5, metrics=metrics)
+
+    with ThreadPoolExecutor(max_workers=200) as pool:
+        results = list(pool.map(model.invoke, ["Organize the code."] * 200))
+    assert all(result is valid for result in results)
+    assert metrics.count("node", "timeouts") == 0
+
+    start = time.perf_counter()
+    assert model.invoke("Organize the code.") is valid
+    assert time.perf_counter() - start < 1
+
+
+def test_timeout_bounds_the_wait_for_a_valid_sample() -> None:
+    slow = _sample(_organization("main.py"), 1.0, [])
+    model = BestOfNModel([slow] * 2, "node", timeout=0.1, metrics=Metrics())
+    start = time.perf_counter()
+    with pytest.raises(TimeoutError):
+        model.invoke("Organize the code.")
+    assert time.perf_counter() - start < 0.5
+
+
+def test_problems_reports_extra_endpoints_and_duplicate_files() -> None:
+    organization = _organization("main.py", "app.py")
+    organization.folders[0].files = [
+        File(name="tasks.py", description="Task routes.", methods=[]),
+        File(name="tasks.py", description="Task routes again.", methods=[]),
+    ]
+    assert checks.problems(organization) == [
+        "The organization has 2 endpoint files instead of one.",
+        "Duplicate file folder0/tasks.py.",
+    ]
+
+
+def test_graph_runs_with_best_of_n() -> None:
+    result = graph.invoke(
+        {"topic": "Todo app", "human_feedback": "approve"},
+        {
+            "configurable": {
+                "model": "stub/default",
+                "best_of_n": {"organize_back_end_code": 2, "generate_back_end_code": 2},
+            }
+        },
+    )
+    assert result["generate_backend_code"].folders
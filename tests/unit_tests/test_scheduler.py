@@ -0,0 +1,106 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from langchain_core.runnables import RunnableLambda
+
+from react_agent import graph
+from react_agent.metrics import Metrics
+from react_agent.scheduler import BATCH, INTERACTIVE, ScheduledModel, Scheduler
+
+
+def _run_in_order(scheduler: Scheduler, requests):
+    """Queue `requests` behind a held slot, release it and return the grant order."""
+    order = []
+    held = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with scheduler.slot(BATCH, "holder"):
+            held.set()
+            release.wait()
+
+    def request(priority, tenant, label):
+        with scheduler.slot(priority, tenant):
+            order.append(label)
+
+    with ThreadPoolExecutor(max_workers=len(requests) + 1) as pool:
+        pool.submit(hold)
+        held.wait()
+        for queued, (priority, tenant, label) in enumerate(requests, 1):
+            pool.submit(request, priority, tenant, label)
+            # Queue them one at a time so arrival order is deterministic
+            while scheduler.queued() < queued:
+                time.sleep(0.001)
+        release.set()
+    return order
+
+
+def test_interactive_requests_go_before_queued_batch_requests() -> None:
+    metrics = Metrics()
+    order = _run_in_order(
+        Scheduler(1, metrics=metrics),
+        [
+            (BATCH, "eval", "batch1"),
+            (BATCH, "eval", "batch2"),
+            (INTERACTIVE, "alice", "user"),
+        ],
+    )
+    assert order == ["user", "batch1", "batch2"]
+    assert metrics.count("scheduler/batch", "preempted") == 2
+    assert metrics.percentile("scheduler/interactive", "queue_wait", 50) is not None
+
+
+def test_tenants_are_served_fairly_within_a_class() -> None:
+    order = _run_in_order(
+        Scheduler(1, metrics=Metrics()),
+        [
+            (BATCH, "big", "big1"),
+            (BATCH, "big", "big2"),
+            (BATCH, "big", "big3"),
+            (BATCH, "small", "small1"),
+        ],
+    )
+    assert order.index("small1") < order.index("big3")
+
+
+def test_reserved_slots_are_kept_for_interactive_requests() -> None:
+    scheduler = Scheduler(2, reserved=1, metrics=Metrics())
+    running = []
+
+    def call(label):
+        running.append(label)
+        time.sleep(0.2)
+        return label
+
+    batch = ScheduledModel(RunnableLambda(call), scheduler, BATCH, "eval")
+    interactive = ScheduledModel(RunnableLambda(call), scheduler, INTERACTIVE, "alice")
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        pool.submit(batch.invoke, "batch1")
+        pool.submit(batch.invoke, "batch2")
+        time.sleep(0.05)
+        start = time.perf_counter()
+        assert interactive.invoke("user") == "user"
+        assert time.perf_counter() - start < 0.3
+    assert running.index("user") < running.index("batch2")
+
+
+def test_unknown_priority_is_rejected() -> None:
+    with pytest.raises(ValueError, match="Unknown priority"):
+        with Scheduler(1, metrics=Metrics()).slot("urgent"):
+            pass
+
+
+def test_graph_runs_with_scheduling() -> None:
+    result = graph.invoke(
+        {"topic": "Todo app", "human_feedback": "approve"},
+        {
+            "configurable": {
+                "model": "stub/default",
+                "model_call_slots": 2,
+                "priority": BATCH,
+            }
+        },
+    )
+    assert result["generate_backend_code"].folders
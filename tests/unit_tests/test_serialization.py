@@ -0,0 +1,20 @@
+from react_agent.serialization import StateSerializer, sample_project
+
+
+def test_round_trip_compresses_and_reuses_validated_payloads() -> None:
+    serde = StateSerializer(compress_min_bytes=0)
+    project = sample_project(3)
+
+    kind, payload = serde.dumps_typed(project)
+    assert kind == "pydantic+zlib"
+
+    loaded = serde.loads_typed((kind, payload))
+    assert loaded.model_dump() == project.model_dump()
+    assert serde.loads_typed((kind, payload)) is loaded
+
+
+def test_non_model_values_use_the_fallback() -> None:
+    serde = StateSerializer()
+    data = serde.dumps_typed({"topic": "todo"})
+    assert data[0] != "pydantic"
+    assert serde.loads_typed(data) == {"topic": "todo"}
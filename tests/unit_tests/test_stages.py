@@ -0,0 +1,150 @@
+from langgraph.checkpoint.memory import MemorySaver
+
+from react_agent import graph
+from react_agent.configuration import Configuration
+from react_agent.graph import (
+    build_graph,
+    codegen_graph,
+    edit_graph,
+    interactive_requirements_graph,
+)
+from react_agent.schemas import CodeOrganization, DeveloperState, File, Folder
+from react_agent.stages import STAGE_CACHE, stage_key
+
+OUTPUT_FIELDS = (
+    "front_end_organization",
+    "generate_backend_code",
+    "project_setup_instructions",
+)
+
+
+def _run(topic: str, configurable: dict):
+    """Run the full graph; return the final state and the subgraph nodes that ran."""
+    state, ran = None, []
+    for namespace, mode, chunk in graph.stream(
+        {"topic": topic, "human_feedback": "approve"},
+        {"configurable": {"model": "stub/default", **configurable}},
+        stream_mode=["updates", "values"],
+        subgraphs=True,
+    ):
+        if mode == "values" and not namespace:
+            state = chunk
+        elif mode == "updates" and namespace:
+            ran += list(chunk)
+    return state, ran
+
+
+def test_codegen_runs_on_a_stored_design() -> None:
+    design = graph.invoke(
+        {"topic": "Recipe box", "human_feedback": "approve"},
+        {"configurable": {"model": "stub/default"}},
+    )
+    result = codegen_graph.invoke(
+        {
+            "topic": "Recipe box",
+            "front_end": design["front_end"],
+            "back_end": design["back_end"],
+            "front_end_organization": design["front_end_organization"],
+            "back_end_organization": design["back_end_organization"],
+        },
+        {"configurable": {"model": "stub/default"}},
+    )
+    assert result["generate_backend_code"].folders
+    assert result["project_setup_instructions"] is not None
+    assert result.get("global_requirements") is None
+
+
+def _organization(endpoint: str, code: str) -> CodeOrganization:
+    return CodeOrganization(
+        folders=[
+            Folder(
+                name="app",
+                files=[],
+                endpoint_file=File(
+                    name=endpoint, description="Endpoints.", methods=[], code=code
+                ),
+            )
+        ]
+    )
+
+
+def test_stages_accept_states_built_from_the_package_schemas() -> None:
+    config = {"configurable": {"model": "stub/default"}}
+    front_end = _organization("api.js", "fetch('/tasks')")
+    back_end = _organization("main.py", "@app.get('/tasks')\ndef tasks(): ...")
+
+    result = codegen_graph.invoke(
+        DeveloperState(
+            topic="Task list",
+            front_end_organization=front_end,
+            back_end_organization=back_end,
+        ),
+        config,
+    )
+    assert result["generate_frontend_code"].folders
+
+    edited = edit_graph.invoke(
+        {
+            "topic": "Task list",
+            "changed_requirements": [],
+            "generate_frontend_code": front_end,
+            "generate_backend_code": back_end,
+        },
+        config,
+    )
+    assert edited["regenerated_files"] == []
+
+
+def test_memoized_stages_are_skipped_on_rerun(tmp_path) -> None:
+    configurable = {"memoize_stages": True, "stage_cache_path": str(tmp_path)}
+    first, ran = _run("Stage cache demo app", configurable)
+    assert "process_requirements" in ran and "required_software" in ran
+
+    second, ran = _run("Stage cache demo app", configurable)
+    assert ran == []
+    for field in OUTPUT_FIELDS:
+        assert second[field] == first[field]
+
+    # A new process only has the results stored on disk
+    STAGE_CACHE.clear()
+    third, ran = _run("Stage cache demo app", configurable)
+    assert ran == []
+    for field in OUTPUT_FIELDS:
+        assert third[field] == first[field]
+
+
+def test_interactive_graph_pauses_for_requirements_feedback() -> None:
+    app = build_graph(interactive_requirements_graph).compile(
+        checkpointer=MemorySaver()
+    )
+    assert "requirements:human_feedback_requirements" in app.get_graph(xray=True).nodes
+    config = {"configurable": {"model": "stub/default", "thread_id": "review"}}
+
+    app.invoke({"topic": "Todo app"}, config)
+    paused = app.get_state(config, subgraphs=True)
+    assert paused.next == ("requirements",)
+    requirements = paused.tasks[0].state
+    assert requirements.next == ("human_feedback_requirements",)
+    assert requirements.values["global_requirements"] is not None
+
+    app.update_state(requirements.config, {"human_feedback": "approve"})
+    result = app.invoke(None, config)
+    assert result["human_feedback"] == "approve"
+    assert result["generate_backend_code"].folders
+
+
+def test_stage_key_tracks_inputs_and_output_settings() -> None:
+    state = DeveloperState(topic="Todo app", human_feedback="approve")
+    base = stage_key("requirements", state, Configuration(model="stub/default"))
+
+    assert (
+        stage_key(
+            "requirements", state, Configuration(model="stub/default", tenant="a")
+        )
+        == base
+    )
+    assert stage_key("requirements", state, Configuration(model="other/model")) != base
+    changed = DeveloperState(topic="Todo app with tags", human_feedback="approve")
+    assert (
+        stage_key("requirements", changed, Configuration(model="stub/default")) != base
+    )
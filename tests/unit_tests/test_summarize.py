@@ -0,0 +1,74 @@
+from react_agent import graph
+from react_agent.schemas import (
+    BackEndDependencies,
+    BackEndRequirements,
+    DeveloperState,
+    FrontEndDependencies,
+    FrontEndRequirements,
+)
+from react_agent.summarize import bounded, spec_digests
+
+
+def test_bounded_keeps_whole_lines_in_order() -> None:
+    text = "\n".join(
+        [
+            "GET /tasks returns all tasks.",
+            "GET /tasks returns all the tasks.",
+            "POST /tasks creates a task from a title and due date, validating both fields carefully.",
+            "DELETE /tasks/{id} removes a task.",
+        ]
+    )
+    digest = bounded(text, 80)
+    assert len(digest) <= 80
+    assert digest.splitlines() == [
+        "GET /tasks returns all the tasks.",
+        "DELETE /tasks/{id} removes a task.",
+    ]
+    assert bounded("Short spec.", 80) == "Short spec."
+
+
+def _state(api_design: str) -> DeveloperState:
+    return DeveloperState(
+        topic="Todo app",
+        requirements_digest="1. Users can create tasks.",
+        front_end=FrontEndDependencies(
+            requirements=FrontEndRequirements(
+                description="A task list page. " * 50, api_design=api_design
+            ),
+            frameworks=[],
+        ),
+        back_end=BackEndDependencies(
+            requirements=BackEndRequirements(
+                description="FastAPI app.", api_endpoints="GET /tasks"
+            ),
+            frameworks=[],
+        ),
+    )
+
+
+def test_spec_digests_are_memoized_by_content_hash() -> None:
+    state = _state("Calls GET /tasks.")
+    digests = spec_digests(state, state.requirements_digest, 200)
+    assert len(digests.front_end) <= 200
+    assert digests.back_end_api == "GET /tasks"
+
+    state.spec_digests = digests
+    assert spec_digests(state, state.requirements_digest, 200) is digests
+
+    changed = _state("Calls GET /tasks and POST /tasks.")
+    changed.spec_digests = digests
+    rebuilt = spec_digests(changed, changed.requirements_digest, 200)
+    assert rebuilt.source_hash != digests.source_hash
+    assert rebuilt.front_end_api == "Calls GET /tasks and POST /tasks."
+
+
+def test_graph_builds_spec_digests() -> None:
+    result = graph.invoke(
+        {"topic": "Todo app", "human_feedback": "approve"},
+        {"configurable": {"model": "stub/default"}},
+    )
+    assert result["spec_digests"].requirements == result["requirements_digest"]
+    assert (
+        result["spec_digests"].back_end_api
+        == result["back_end"].requirements.api_endpoints
+    )